@@ -1,10 +1,18 @@
 """Common gRPC functions"""
+from itertools import chain
+
 import numpy as np
 
 # chunk sizes for streaming and file streaming
 DEFAULT_CHUNKSIZE = 256*1024  # 256 kB
 DEFAULT_FILE_CHUNK_SIZE = 1024*1024  # 1MB
 
+# bounds of automatically tuned chunk sizes.  gRPC messages must be
+# less than 4MB
+MIN_CHUNK_SIZE = 64*1024  # 64 kB
+MAX_CHUNK_SIZE = 3584*1024  # 3.5 MB
+CHUNK_TRANSFER_TIME = 0.1  # target time in seconds to transfer one chunk
+
 
 ANSYS_VALUE_TYPE = {0: None,           # UNKNOWN
                     1: np.int32,       # INTEGER
@@ -117,9 +125,15 @@ def check_vget_input(entity, item, itnum):
     return '%s, , %s, %s' % (entity, item, itnum)
 
 
-def parse_chunks(chunks, dtype=None):
+def parse_chunks(chunks, dtype=None, out=None):
     """Deserialize gRPC chunks into a numpy array
 
+    When ``out`` is given, or when the first chunk advertises the size
+    of the entire record, each payload is copied directly into place
+    rather than concatenating the chunks at the end.  MAPDL sets the
+    size of each chunk to the length of its payload, in which case
+    the chunks are concatenated.
+
     Parameters
     ----------
     chunks : generator
@@ -128,10 +142,17 @@ def parse_chunks(chunks, dtype=None):
     dtype : np.dtype
         Numpy data type to interpert chunks as.
 
+    out : np.ndarray, optional
+        C contiguous array to write the record into, for example a
+        ``np.memmap``.  Must be large enough to contain the entire
+        record.  Defaults to the data type of this array when
+        ``dtype`` is not given.
+
     Returns
     -------
     array : np.ndarray
-        Deserialized numpy array.
+        Deserialized numpy array.  When ``out`` is given, this is a
+        flat view of ``out`` containing only the received values.
 
     """
     if not chunks.is_active():
@@ -142,18 +163,58 @@ def parse_chunks(chunks, dtype=None):
     except:
         return np.empty(0)
 
+    if dtype is None and out is not None:
+        dtype = out.dtype
+
     if not chunk.value_type and dtype is None:
         raise ValueError('Must specify a data type for this record')
 
     if dtype is None:
         dtype = ANSYS_VALUE_TYPE[chunk.value_type]
-
-    array = np.frombuffer(chunk.payload, dtype)
-    if chunks.done():
-        return array
-
-    arrays = [array]
-    for chunk in chunks:
-        arrays.append(np.frombuffer(chunk.payload, dtype))
-
-    return np.hstack(arrays)
+    dtype = np.dtype(dtype)
+
+    if out is None:
+        if chunks.done():
+            return np.frombuffer(chunk.payload, dtype)
+
+        # the first chunk may advertise the size of the entire record
+        # rather than the size of its payload
+        nbytes = getattr(chunk, 'size', 0)
+        if nbytes <= len(chunk.payload):
+            return _concatenate(chunk.payload, (chunk.payload for chunk in chunks),
+                                dtype)
+
+        allocated = True
+        out = np.empty(nbytes // dtype.itemsize, dtype)
+
+    else:
+        if out.dtype != dtype:
+            raise ValueError(f'Output array must be of type {dtype}')
+        if not out.flags.c_contiguous:
+            raise ValueError('Output array must be C contiguous')
+        allocated = False
+
+    out = out.reshape(-1)
+    view = memoryview(out).cast('B')
+    offset = 0
+    payloads = chain([chunk.payload], (chunk.payload for chunk in chunks))
+    for payload in payloads:
+        end = offset + len(payload)
+        if end > view.nbytes:
+            if allocated:  # the advertised size was not the record size
+                received = bytes(view[:offset]) + payload
+                return _concatenate(received, payloads, dtype)
+            raise ValueError('Output array is too small for this record')
+        view[offset:end] = payload
+        offset = end
+
+    return out[:offset // dtype.itemsize]
+
+
+def _concatenate(received, payloads, dtype):
+    """Array of the bytes already received followed by the remaining
+    payloads"""
+    buffer = bytearray(received)
+    for payload in payloads:
+        buffer += payload
+    return np.frombuffer(buffer, dtype)
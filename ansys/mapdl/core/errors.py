@@ -64,6 +64,11 @@ class MapdlExitedError(RuntimeError):
         RuntimeError.__init__(self, msg)
 
 
+class ReplayError(RuntimeError):
+    """Raised when a request cannot be answered from a recording"""
+    pass
+
+
 class LockFileException(RuntimeError):
     """Error message when the lockfile has not been removed"""
     def __init__(self, msg=LOCKFILE_MSG):
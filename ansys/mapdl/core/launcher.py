@@ -719,6 +719,17 @@ def launch_mapdl(exec_file=None, run_location=None, jobname='file',
     remove_temp_files : bool, optional
         Removes temporary files on exit.  Default ``False``.
 
+    compression : str, optional
+        Compress the gRPC requests sent to MAPDL with either
+        ``'gzip'`` or ``'deflate'``.  Responses are not compressed by
+        this option.  Only applicable to the ``'grpc'`` mode.  Default
+        ``None``.
+
+    n_channels : int, optional
+        Number of gRPC channels used for concurrent ``*GET``
+        requests.  Only applicable to the ``'grpc'`` mode.  Default
+        ``1``.
+
     verbose_mapdl : bool, optional
         Enable printing of all output when launching and running
         MAPDL.  This should be used for debugging only as output can
@@ -837,6 +848,8 @@ def launch_mapdl(exec_file=None, run_location=None, jobname='file',
     """
     # These parameters are partially used for unit testing
     set_no_abort = kwargs.get('set_no_abort', True)
+    compression = kwargs.pop('compression', None)
+    n_channels = kwargs.pop('n_channels', 1)
     ip = os.environ.get('PYMAPDL_IP', ip)
     if 'PYMAPDL_PORT' in os.environ:
         port = int(os.environ.get('PYMAPDL_PORT'))
@@ -846,7 +859,8 @@ def launch_mapdl(exec_file=None, run_location=None, jobname='file',
     # connect to an existing instance if enabled
     if not get_start_instance(start_instance):
         mapdl = MapdlGrpc(ip=ip, port=port, cleanup_on_exit=False,
-                          loglevel=loglevel, set_no_abort=set_no_abort)
+                          loglevel=loglevel, set_no_abort=set_no_abort,
+                          compression=compression, n_channels=n_channels)
         if clear_on_connect:
             mapdl.clear()
         return mapdl
@@ -926,7 +940,9 @@ def launch_mapdl(exec_file=None, run_location=None, jobname='file',
                           cleanup_on_exit=cleanup_on_exit,
                           loglevel=loglevel, set_no_abort=set_no_abort,
                           remove_temp_files=kwargs.pop('remove_temp_files', False),
-                          log_apdl=log_apdl, **start_parm)
+                          compression=compression, n_channels=n_channels,
+                          log_apdl=log_apdl,
+                          **start_parm)
         if run_location is None:
             mapdl._path = actual_run_location
     else:
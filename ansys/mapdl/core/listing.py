@@ -0,0 +1,418 @@
+"""Parsing of MAPDL tabular listings such as ``NLIST`` or ``PRNSOL``"""
+import re
+
+import numpy as np
+
+NEWLINE = ord('\n')
+
+# largest number of digits of a fixed-width number converted exactly
+MAX_DIGITS = 15
+
+# powers of ten represented exactly as floats
+MAX_EXACT_POWER = 22
+POWERS_OF_TEN = 10.0**np.arange(MAX_EXACT_POWER + 1)
+
+# number of rows of a fixed-width table converted at once
+CHUNK_ROWS = 1 << 15
+
+# kinds of characters, combined as bit flags over each line
+SPACE, DIGIT, NUMERIC, TEXT = 0, 1, 2, 4
+CHAR_KINDS = bytes(SPACE if char in b' \t\r\n' else
+                   DIGIT if char in b'0123456789' else
+                   NUMERIC if char in b'+-.eE' else TEXT for char in range(256))
+
+
+def _scan_lines(raw):
+    """Classify the lines of a listing in vectorized passes.
+
+    Parameters
+    ----------
+    raw : bytes
+        Listing ending with a newline.
+
+    Returns
+    -------
+    starts : np.ndarray
+        Offset of the first character of each line.
+
+    is_data : np.ndarray
+        ``True`` for each line holding only numbers.
+
+    is_text : np.ndarray
+        ``True`` for each other line that is not blank.
+    """
+    buf = np.frombuffer(raw, np.uint8)
+    newlines = np.flatnonzero(buf == NEWLINE)
+    starts = np.empty(newlines.size, np.int64)
+    starts[0] = 0
+    starts[1:] = newlines[:-1] + 1
+
+    kinds = np.frombuffer(raw.translate(CHAR_KINDS), np.uint8)
+    line_kinds = np.bitwise_or.reduceat(kinds, starts)
+    is_data = (line_kinds & (TEXT | DIGIT)) == DIGIT
+    is_text = ~is_data & (line_kinds != SPACE)
+    return starts, is_data, is_text
+
+
+def _column_names(header, n_columns):
+    """Column names of a table from its header line.
+
+    Column names containing single spaces, such as ``LOAD STEP``, are
+    kept together when the header has more words than the table has
+    columns.  When there are fewer names than columns, the last name
+    applies to all remaining columns, such as the ``NODES`` of
+    ``ELIST``.
+    """
+    names = header.split()
+    if len(names) > n_columns:
+        names = re.split(r'\s{2,}', header.strip())
+    if not names or len(names) > n_columns or \
+       not all(re.search('[A-Za-z]', name) for name in names):
+        return [f'COL{i + 1}' for i in range(n_columns)]
+
+    unique = []
+    for name in names:
+        name = name.upper()
+        count = 1
+        while (name if count == 1 else f'{name}_{count}') in unique:
+            count += 1
+        unique.append(name if count == 1 else f'{name}_{count}')
+    return unique
+
+
+def _rows(buf, starts, length):
+    """``(n_rows, length)`` array of the lines of equal length at
+    ``starts``, without copying consecutive lines"""
+    breaks = np.flatnonzero(np.diff(starts) != length) + 1
+    runs = [buf[run[0]:run[0] + run.size*length].reshape(-1, length)
+            for run in np.split(starts, breaks)]
+    return runs[0] if len(runs) == 1 else np.concatenate(runs)
+
+
+def _digits(part):
+    """Integer value of the digits of a fixed-width field written as
+    ``[sign]digits[.digits]`` in every row.
+
+    Parameters
+    ----------
+    part : np.ndarray
+        ``(width, n_rows)`` array of the characters of the field.
+
+    Returns
+    -------
+    value : np.ndarray
+        Signed integer value of the digits as floats, ignoring the
+        decimal point.
+
+    power : int
+        Power of ten of the last digit.
+
+    ``None`` when the rows do not follow the layout, the decimal point
+    is not in the same column of every row or numbers without a
+    decimal point are not right aligned.
+    """
+    width = part.shape[0]
+    digits = part - ord('0')
+    is_digit = digits < 10
+    filled = part > ord(' ')
+    if not is_digit.any(axis=0).all():
+        return None
+
+    # only a sign and a decimal point besides the digits
+    others = part[filled & ~is_digit]
+    if ((others != ord('-')) & (others != ord('+')) & (others != ord('.'))).any():
+        return None
+
+    points = np.flatnonzero((part == ord('.')).any(axis=1))
+    if points.size > 1 or (points.size and not (part[points[0]] == ord('.')).all()):
+        return None
+    if not points.size and not is_digit[-1].all():
+        return None
+    if width - points.size > MAX_DIGITS:
+        return None
+
+    # a single number per row without spaces and with its sign in front
+    if (((filled[1:] > filled[:-1]).sum(axis=0, dtype=np.uint8) + filled[0]) != 1).any():
+        return None
+    if (~is_digit[1:] & filled[1:] & filled[:-1] & (part[1:] != ord('.'))).any():
+        return None
+
+    point = points[0] if points.size else width
+    columns = np.delete(np.arange(width), points)
+    powers = point - columns - (columns < point)
+    digits = digits[columns]
+    digits *= is_digit[columns]
+    value = 10.0**(powers - powers[-1]) @ digits.astype(np.float64)
+    value[(part == ord('-')).any(axis=0)] *= -1
+    return value, powers[-1]
+
+
+def _aligned(part):
+    """Convert a fixed-width column of numbers with the decimal point
+    and exponent at the same position in every row, ``None`` otherwise.
+
+    The digits are weighted by their position in a single matrix
+    product and scaled by an exact power of ten, which matches
+    ``float`` for numbers of up to ``MAX_DIGITS`` digits.
+
+    Parameters
+    ----------
+    part : np.ndarray
+        ``(width, n_rows)`` array of the characters of the column.
+    """
+    exponents = np.flatnonzero(((part | 32) == ord('e')).any(axis=1))
+    if exponents.size > 1:
+        return None
+
+    split = exponents[0] if exponents.size else part.shape[0]
+    mantissa = _digits(part[:split])
+    if mantissa is None:
+        return None
+    value, power = mantissa
+    if exponents.size:
+        if not ((part[split] | 32) == ord('e')).all():
+            return None
+        exponent = _digits(part[split + 1:])
+        if exponent is None or exponent[1]:
+            return None
+        power = exponent[0].astype(np.int64) + power
+    else:
+        power = np.full(value.size, power)
+
+    exact = np.abs(power) <= MAX_EXACT_POWER
+    scale = POWERS_OF_TEN[np.where(exact, np.abs(power), 0)]
+    value = np.where(power < 0, value/scale, value*scale)
+    if not exact.all():
+        inexact = np.ascontiguousarray(part[:, ~exact].T)
+        value[~exact] = inexact.view(f'S{part.shape[0]}').ravel().astype(np.float64)
+    return value
+
+
+def _fixed_width(buf, starts, length):
+    """Convert lines of equal length with the numbers of each column
+    at the same position in every line.
+
+    Columns are separated by the positions that are blank in every
+    line.  Columns with the decimal point and exponent aligned are
+    converted arithmetically and any others as strings, in chunks of
+    ``CHUNK_ROWS`` rows.  ``None`` when the columns do not hold a
+    single number in every line.
+    """
+    rows = _rows(buf, starts, length)[:, :-1]
+    filled = (rows > ord(' ')).any(axis=0)
+    edges = np.flatnonzero(np.diff(np.r_[False, filled, False].view(np.int8)))
+    edges = edges.reshape(-1, 2)
+
+    table = np.empty((starts.size, edges.shape[0]))
+    for first in range(0, starts.size, CHUNK_ROWS):
+        chunk = slice(first, first + CHUNK_ROWS)
+        part = np.ascontiguousarray(rows[chunk].T)
+        for i, (start, stop) in enumerate(edges):
+            values = _aligned(part[start:stop])
+            if values is None:
+                column = np.ascontiguousarray(rows[chunk, start:stop])
+                try:
+                    values = column.view(f'S{stop - start}').ravel().astype(np.float64)
+                except ValueError:  # blank or more than one number
+                    return None
+            table[chunk, i] = values
+    return table
+
+
+def _whitespace_separated(buf, starts, lengths):
+    """Convert the whitespace separated numbers of the given lines.
+
+    Returns
+    -------
+    values : np.ndarray
+        Numbers of all lines.
+
+    n_fields : np.ndarray
+        Number of numbers of each line.
+    """
+    offsets = np.zeros(starts.size, np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    breaks = np.flatnonzero(starts[1:] != starts[:-1] + lengths[:-1]) + 1
+    ends = np.r_[starts[breaks - 1] + lengths[breaks - 1], starts[-1] + lengths[-1]]
+    text = np.concatenate([buf[start:end] for start, end
+                           in zip(starts[np.r_[0, breaks]], ends)])
+
+    filled = text > ord(' ')
+    field_start = filled.copy()
+    field_start[1:] &= ~filled[:-1]
+    n_fields = np.add.reduceat(field_start, offsets, dtype=np.int64)
+
+    values = np.fromstring(text.tobytes(), sep=' ')
+    if values.size != n_fields.sum():
+        raise ValueError('Unable to parse the numbers of the listing')
+    return values, n_fields
+
+
+def _records(values, n_fields, is_start):
+    """Arrange the values of a table in a ``(n_records, width)`` array,
+    padding records shorter than the widest record with zeros."""
+    record = np.cumsum(is_start) - 1
+    widths = np.bincount(record, weights=n_fields).astype(np.int64)
+    width = widths.max()
+    if (widths == width).all():
+        return values.reshape(-1, width)
+
+    value_record = np.repeat(record, n_fields)
+    offsets = np.zeros(widths.size, np.int64)
+    np.cumsum(widths[:-1], out=offsets[1:])
+    position = np.arange(values.size) - offsets[value_record]
+    table = np.zeros((widths.size, width))
+    table[value_record, position] = values
+    return table
+
+
+def _is_integer(field):
+    """``True`` when a field is written as an integer"""
+    return not any(char in field for char in '.eE')
+
+
+def _structured(table, names, first_record):
+    """Structured array of a table with integer columns for fields
+    written as integers in the first record and holding only integers."""
+    n_columns = table.shape[1]
+    n_last = n_columns - len(names) + 1
+    spans = [(i, i + 1) for i in range(len(names) - 1)]
+    spans.append((len(names) - 1, n_columns))
+    dtype = []
+    for name, (start, stop) in zip(names, spans):
+        fields = first_record[start:stop]
+        kind = np.float64
+        if fields and all(map(_is_integer, fields)):
+            values = table[:, start:stop]
+            if (np.abs(values) < 2**53).all() and (values == np.trunc(values)).all():
+                kind = np.int64
+        dtype.append((name, kind) if stop - start == 1 else (name, kind, (n_last,)))
+
+    array = np.empty(table.shape[0], dtype)
+    for name, (start, stop) in zip(names, spans):
+        array[name] = table[:, start] if stop - start == 1 else table[:, start:stop]
+    return array
+
+
+def _continues(table, other):
+    """``True`` when ``other`` lists further columns of the rows of
+    ``table``"""
+    key = table.dtype.names[0]
+    return other.dtype.names[0] == key and other.size == table.size and \
+        (other[key] == table[key]).all()
+
+
+def _join(table, other):
+    """Add the columns of ``other`` missing from ``table``"""
+    new = [descr for descr in other.dtype.descr if descr[0] not in table.dtype.names]
+    joined = np.empty(table.size, table.dtype.descr + new)
+    for name in table.dtype.names:
+        joined[name] = table[name]
+    for descr in new:
+        joined[descr[0]] = other[descr[0]]
+    return joined
+
+
+def parse_listing(text):
+    """Parse a MAPDL tabular listing into a NumPy structured array.
+
+    Recognizes the paged layout of listings such as ``NLIST``,
+    ``ELIST``, ``PRNSOL``, ``PRESOL``, ``PRETAB`` or ``SET,LIST``:
+
+    - Lines holding only numbers are rows and the nearest preceding
+      line of text is their header.  Titles, blank lines and summaries
+      such as ``MAXIMUM ABSOLUTE VALUES`` are skipped.
+    - Rows following a repeated header, such as after a page break or
+      for each element of ``PRESOL``, continue the same table.
+    - Rows wrapped over several lines, such as the nodes of higher
+      order elements in ``ELIST``, are joined.
+    - Tables listing further columns for the same rows, such as
+      ``PRETAB`` with many items, are joined into a single table.
+
+    Lines are classified over the whole listing at once and each
+    fixed-width column is converted with a few array operations, so
+    large listings are parsed at the speed of NumPy rather than line
+    by line.
+
+    Parameters
+    ----------
+    text : str or bytes
+        Listing from MAPDL.
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with a field for each column named after the
+        column header.  Columns written as integers are integer
+        fields.  When a header has fewer names than the table has
+        columns, the last field is a subarray of the remaining columns.
+        Only the first table of the listing is returned.
+
+    Raises
+    ------
+    ValueError
+        When the listing contains no table.
+
+    Examples
+    --------
+    >>> from ansys.mapdl.core.listing import parse_listing
+    >>> nodes = parse_listing(mapdl.nlist())
+    >>> nodes['NODE']
+    array([  1,   2,   3, ..., 319, 320, 321])
+    >>> nodes['X']
+    array([0.  , 1.  , 0.25, ..., 0.75, 0.5 , 0.5 ])
+    """
+    raw = (text.encode() if isinstance(text, str) else bytes(text)) + b'\n'
+    buf = np.frombuffer(raw, np.uint8)
+    starts, is_data, is_text = _scan_lines(raw)
+    if not is_data.any():
+        raise ValueError('No table found in the listing')
+    lengths = np.diff(np.r_[starts, buf.size])
+
+    def line(i):
+        return raw[starts[i]:starts[i] + lengths[i] - 1].decode()
+
+    # nearest line of text preceding each block of rows
+    last_text = np.where(is_text, np.arange(starts.size), -1)
+    np.maximum.accumulate(last_text, out=last_text)
+    block_starts = np.flatnonzero(is_data & ~np.r_[False, is_data[:-1]])
+    headers = np.r_[-1, last_text][block_starts]
+
+    # assign each block of rows to the table of its header
+    table_keys, table_headers = [], []
+    block_tables = np.empty(block_starts.size, np.int64)
+    for i, header_line in enumerate(headers):
+        header = line(header_line) if header_line >= 0 else ''
+        key = ' '.join(header.split())
+        if not key and table_keys:
+            block_tables[i] = block_tables[i - 1]
+            continue
+        if key not in table_keys:
+            table_keys.append(key)
+            table_headers.append(header)
+        block_tables[i] = table_keys.index(key)
+
+    data_lines = np.flatnonzero(is_data)
+    line_tables = block_tables[np.searchsorted(block_starts, data_lines, 'right') - 1]
+
+    result = None
+    for t, header in enumerate(table_headers):
+        lines = data_lines[line_tables == t]
+        table, n_first = None, 1
+        if (lengths[lines] == lengths[lines[0]]).all():
+            table = _fixed_width(buf, starts[lines], lengths[lines[0]])
+        if table is None:
+            values, n_fields = _whitespace_separated(buf, starts[lines], lengths[lines])
+            is_start = n_fields >= n_fields[0]
+            table = _records(values, n_fields, is_start)
+            n_first = np.argmax(np.r_[is_start[1:], True]) + 1
+
+        first_record = ' '.join(line(i) for i in lines[:n_first]).split()
+        array = _structured(table, _column_names(header, table.shape[1]),
+                            first_record)
+        if result is None:
+            result = array
+        elif _continues(result, array):
+            result = _join(result, array)
+
+    return result
@@ -0,0 +1,409 @@
+"""Compile python functions into APDL macros"""
+from functools import update_wrapper
+import inspect
+import itertools
+from numbers import Number
+
+import numpy as np
+
+# precedence of APDL operators, atoms bind the strongest
+_ATOM = 4
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, '**': 3}
+
+# maximum number of scalar arguments of *USE
+MAX_MACRO_ARGS = 19
+
+_macro_counter = itertools.count(1)
+
+
+def _expr(value):
+    """APDL expression and precedence of a value"""
+    if isinstance(value, Symbol):
+        return value._expr, value._precedence
+    if isinstance(value, (bool, np.bool_)) or not isinstance(value, Number):
+        raise TypeError(f'Unsupported value {value!r} in an APDL expression')
+    if isinstance(value, (int, np.integer)):
+        expr = str(int(value))
+    else:
+        expr = repr(float(value))
+    if value < 0:
+        return expr, 0
+    return expr, _ATOM
+
+
+def _operand(value, precedence, strict=False):
+    """Expression of an operand, enclosed in parentheses when it binds
+    weaker than the operator"""
+    expr, value_precedence = _expr(value)
+    if value_precedence < precedence or (strict and value_precedence == precedence):
+        return f'({expr})'
+    return expr
+
+
+def _arg_name(index):
+    """Name of the ``index`` scalar argument of a macro.  For example
+    ``'ARG1'`` or ``'AR10'``."""
+    if index < 10:
+        return f'ARG{index}'
+    return f'AR{index}'
+
+
+class Symbol():
+    """APDL expression standing for a value while tracing a macro.
+
+    Supports arithmetic with numbers and other symbols and is
+    formatted as its expression within commands.  Symbols cannot be
+    used in python conditions as their value is only known within
+    MAPDL.
+    """
+
+    def __init__(self, expr, precedence=_ATOM):
+        self._expr = expr
+        self._precedence = precedence
+
+    def _binary(self, operator, left, right):
+        precedence = _PRECEDENCE[operator]
+        if operator == '**':
+            expr = f'{_operand(left, _ATOM)}**{_operand(right, _ATOM)}'
+        else:
+            expr = (f'{_operand(left, precedence)}{operator}'
+                    f'{_operand(right, precedence, operator in "-/")}')
+        return Symbol(expr, precedence)
+
+    def __add__(self, other):
+        return self._binary('+', self, other)
+
+    def __radd__(self, other):
+        return self._binary('+', other, self)
+
+    def __sub__(self, other):
+        return self._binary('-', self, other)
+
+    def __rsub__(self, other):
+        return self._binary('-', other, self)
+
+    def __mul__(self, other):
+        return self._binary('*', self, other)
+
+    def __rmul__(self, other):
+        return self._binary('*', other, self)
+
+    def __truediv__(self, other):
+        return self._binary('/', self, other)
+
+    def __rtruediv__(self, other):
+        return self._binary('/', other, self)
+
+    def __pow__(self, other):
+        return self._binary('**', self, other)
+
+    def __rpow__(self, other):
+        return self._binary('**', other, self)
+
+    def __neg__(self):
+        return Symbol(f'-{_operand(self, _ATOM)}', 0)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Symbol(f'ABS({self._expr})')
+
+    def __bool__(self):
+        raise TypeError('The value of a macro argument is only known within '
+                        'MAPDL and cannot be used in a python condition')
+
+    def __index__(self):
+        raise TypeError('The value of a macro argument is only known within '
+                        'MAPDL and cannot be converted to a python number')
+
+    __float__ = __int__ = __index__
+
+    def __str__(self):
+        return self._expr
+
+    def __format__(self, format_spec):
+        return self._expr
+
+    def __repr__(self):
+        return f'Symbol({self._expr!r})'
+
+
+class LoopIndex(Symbol):
+    """Zero based index of a loop over a symbolic array"""
+
+    def __init__(self, var):
+        super().__init__(f'{var}-1', _PRECEDENCE['-'])
+        self._var = var
+
+    def __add__(self, other):
+        if isinstance(other, (int, np.integer)) and not isinstance(other, bool):
+            if other == 1:
+                return Symbol(self._var)
+            return Symbol(f'{self._var}{int(other) - 1:+d}', _PRECEDENCE['+'])
+        return super().__add__(other)
+
+    __radd__ = __add__
+
+    def _one_based(self):
+        return self._var
+
+
+def _one_based(index):
+    """One based APDL expression of a zero based index"""
+    if isinstance(index, LoopIndex):
+        return index._one_based()
+    if isinstance(index, Symbol):
+        return (index + 1)._expr
+    if index < 0:
+        raise IndexError('Negative indices are not supported by macro arguments')
+    return str(int(index) + 1)
+
+
+class _Element(Symbol):
+    """Item of a one dimensional symbolic array within a loop"""
+
+    def __init__(self, expr, index):
+        super().__init__(expr)
+        self.index = index
+
+
+class _Row():
+    """Row of a two dimensional symbolic array within a loop"""
+
+    def __init__(self, name, index):
+        self._name = name
+        self.index = index
+
+    def __getitem__(self, key):
+        return Symbol(f'{self._name}({self.index._one_based()},{_one_based(key)})')
+
+
+class SymbolicArray():
+    """Array parameter standing for an array argument while tracing a
+    macro.
+
+    Iterating over the array emits a ``*DO`` loop over its first
+    dimension.  Arrays iterated together with ``zip`` share a single
+    loop.  Items are indexed from zero as in python.
+    """
+
+    def __init__(self, tracer, name, ndim):
+        self._tracer = tracer
+        self._name = name
+        self.ndim = ndim
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) != self.ndim:
+            raise IndexError(f'Array has {self.ndim} dimension(s) but '
+                             f'{len(key)} were indexed')
+        return Symbol(f'{self._name}({",".join(_one_based(i) for i in key)})')
+
+    def __iter__(self):
+        return _ArrayIterator(self)
+
+    def __len__(self):
+        raise TypeError('The length of a macro argument is only known within MAPDL')
+
+    def _item(self, var):
+        """Item of the array at the loop variable ``var``"""
+        index = LoopIndex(var)
+        if self.ndim == 1:
+            return _Element(f'{self._name}({var})', index)
+        return _Row(self._name, index)
+
+    def __repr__(self):
+        return f'SymbolicArray({self._name!r}, ndim={self.ndim})'
+
+
+class _ArrayIterator():
+    """Iterator emitting a ``*DO`` loop on its first item and the
+    ``*ENDDO`` once the loop body has been traced."""
+
+    def __init__(self, array):
+        self._array = array
+        self._depth = len(array._tracer.loops)  # loops open when created
+        self._loop = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tracer = self._array._tracer
+        if self._loop is None:
+            self._loop = tracer.open_loop(self._array, self._depth)
+            return self._array._item(self._loop['var'])
+        tracer.close_loop(self._loop)
+        raise StopIteration
+
+
+class _Tracer():
+    """Records the commands run by a function with symbolic arguments"""
+
+    def __init__(self, mapdl):
+        self._mapdl = mapdl
+        self._n_loops = 0
+        self.loops = []  # open loops
+        self.zipped = []  # names of the arrays sharing each loop
+
+    def emit(self, command):
+        self._mapdl._stored_commands.append(command)
+
+    def open_loop(self, array, depth):
+        """Loop over ``array`` or join the innermost loop when iterated
+        together with its array"""
+        position = len(self._mapdl._stored_commands)
+        if self.loops and depth < len(self.loops) and \
+           self.loops[-1]['start'] == position:
+            loop = self.loops[-1]
+            loop['arrays'].append(array._name)
+            return loop
+
+        self._n_loops += 1
+        var, size = f'_PYI{self._n_loops}', f'_PYN{self._n_loops}'
+        self.emit(f'*GET,{size},PARM,{array._name},DIM,X')
+        self.emit(f'*DO,{var},1,{size}')
+        loop = {'var': var, 'start': position + 2, 'arrays': [array._name]}
+        self.loops.append(loop)
+        self.zipped.append(loop['arrays'])
+        return loop
+
+    def close_loop(self, loop):
+        if not self.loops or self.loops[-1] is not loop:
+            raise RuntimeError('Loops over macro arguments must be nested')
+        self.emit('*ENDDO')
+        self.loops.pop()
+
+    def trace(self, func, args, kwargs):
+        """Commands run by ``func`` called with the symbolic arguments"""
+        mapdl = self._mapdl
+        stored, store = mapdl._stored_commands, mapdl._store_commands
+        mapdl._stored_commands, mapdl._store_commands = [], True
+        try:
+            func(*args, **kwargs)
+            commands = mapdl._stored_commands
+        finally:
+            mapdl._stored_commands, mapdl._store_commands = stored, store
+
+        if self.loops:
+            raise RuntimeError('Loops over macro arguments cannot be exited early')
+        return commands
+
+
+class Macro():
+    """Python function run within MAPDL as an APDL macro.
+
+    The function is traced once for each combination of argument
+    types by calling it with symbolic arguments.  The commands it runs
+    are written to a macro with ``*CREATE`` and the macro is run with
+    ``*USE`` on each call.  NumPy arrays and lists are sent as array
+    parameters, numbers as macro arguments and any other argument is
+    used as is while tracing.
+
+    Loops over array arguments become ``*DO`` loops within MAPDL, so
+    a loop over ``n`` items costs a single request rather than ``n``.
+    The function may not use the value of its array or number
+    arguments in python conditions as these are only known within
+    MAPDL.
+
+    Examples
+    --------
+    >>> @mapdl.macro
+    ... def keypoints(x, y):
+    ...     for xi, yi in zip(x, y):
+    ...         mapdl.k(xi.index + 1, xi, yi, 0)
+
+    >>> keypoints(np.linspace(0, 1, 1000), np.zeros(1000))
+    """
+
+    def __init__(self, mapdl, func):
+        self._mapdl = mapdl
+        self._func = func
+        self._signature = inspect.signature(func)
+        self._traced = {}  # traced macros keyed by the argument types
+        update_wrapper(self, func)
+
+    def _classify(self, arguments):
+        """Kind of each argument and the key of the traced macro"""
+        kinds = {}
+        key = []
+        for name, value in arguments.items():
+            if isinstance(value, (np.ndarray, list)):
+                value = np.asarray(value)
+                if value.ndim not in (1, 2) or not value.size:
+                    raise ValueError(f'Array argument ``{name}`` must be a '
+                                     'non-empty array with 1 or 2 dimensions')
+                kinds[name] = ('array', value)
+                key.append(('array', value.ndim))
+            elif isinstance(value, (Number, np.number)) and \
+                 not isinstance(value, (bool, np.bool_)):
+                kinds[name] = ('scalar', value)
+                key.append(('scalar',))
+            else:
+                kinds[name] = ('literal', value)
+                key.append(('literal', value))
+        return kinds, tuple(key)
+
+    def _compile(self, kinds):
+        """Trace the function and create its macro within MAPDL"""
+        name = f'pymacro{next(_macro_counter)}'
+        tracer = _Tracer(self._mapdl)
+        symbols = {}
+        arrays = {}
+        scalars = []
+        for arg, (kind, value) in kinds.items():
+            if kind == 'array':
+                arrays[arg] = f'_{name}_{len(arrays)}'.upper()
+                symbols[arg] = SymbolicArray(tracer, arrays[arg], value.ndim)
+            elif kind == 'scalar':
+                scalars.append(arg)
+                symbols[arg] = Symbol(_arg_name(len(scalars)))
+            else:
+                symbols[arg] = value
+
+        if len(scalars) > MAX_MACRO_ARGS:
+            raise ValueError(f'Macros accept at most {MAX_MACRO_ARGS} '
+                             'number arguments')
+
+        bound = inspect.BoundArguments(self._signature, symbols)
+        commands = tracer.trace(self._func, bound.args, bound.kwargs)
+
+        with self._mapdl.non_interactive:
+            self._mapdl.run(f'*CREATE,{name},mac')
+            for command in commands:
+                self._mapdl.run(command)
+            self._mapdl.run('*END')
+
+        return {'name': name, 'arrays': arrays, 'scalars': scalars,
+                'zipped': tracer.zipped, 'commands': commands}
+
+    def __call__(self, *args, **kwargs):
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        kinds, key = self._classify(bound.arguments)
+
+        macro = self._traced.get(key)
+        if macro is None:
+            macro = self._compile(kinds)
+            self._traced[key] = macro
+
+        # arrays iterated together must have the same length
+        lengths = {parm: kinds[arg][1].shape[0]
+                   for arg, parm in macro['arrays'].items()}
+        for names in macro['zipped']:
+            if len({lengths[parm] for parm in names}) > 1:
+                raise ValueError('Arrays iterated together must have the '
+                                 'same length')
+
+        for arg, parm in macro['arrays'].items():
+            self._mapdl.parameters._set_parameter_array(parm, kinds[arg][1])
+
+        values = [_expr(kinds[arg][1])[0] for arg in macro['scalars']]
+        return self._mapdl.run(','.join([f'*USE,{macro["name"]}.mac'] + values))
+
+    @property
+    def commands(self):
+        """Commands of each traced macro"""
+        return [macro['commands'] for macro in self._traced.values()]
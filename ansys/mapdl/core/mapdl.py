@@ -9,6 +9,7 @@ from shutil import rmtree, copyfile
 import weakref
 import warnings
 import pathlib
+from contextlib import contextmanager
 
 import numpy as np
 
@@ -19,6 +20,9 @@ from ansys.mapdl.core.errors import MapdlRuntimeError, MapdlInvalidRoutineError
 from ansys.mapdl.core.plotting import general_plotter
 from ansys.mapdl.core.post import PostProcessing
 from ansys.mapdl.core.commands import Commands
+from ansys.mapdl.core.profiler import Profiler, profiled
+from ansys.mapdl.core.state import SessionState
+from ansys.mapdl.core.macro import Macro
 
 
 _PERMITTED_ERRORS = [
@@ -51,6 +55,82 @@ INVAL_COMMANDS = {'*VWR': VWRITE_REPLACEMENT,
 PLOT_COMMANDS = ['NPLO', 'EPLO', 'KPLO', 'LPLO', 'APLO', 'VPLO', 'PLNS', 'PLES']
 MAX_COMMAND_LENGTH = 600  # actual is 640, but seems to fail above 620
 
+# Mesh data that may be modified by a command.  Used to only
+# invalidate the affected parts of the local mesh cache.
+NO_MESH_EFFECT = frozenset()
+NODE_EFFECT = frozenset(['nodes'])
+ELEM_EFFECT = frozenset(['elements'])
+ETYPE_EFFECT = frozenset(['etypes'])
+ALL_MESH_EFFECT = frozenset(['nodes', 'elements', 'etypes'])
+
+# commands that never modify nodes, elements, element types or their selection
+READ_ONLY_COMMANDS = {
+    # comments, output, and graphics
+    '/COM', '/TIT', '/STI', '/OUT', '/NOP', '/GOP', '/NER', 'NERR', '/PNU',
+    '/NUM', '/VIE', '/ANG', '/DIS', '/FOC', '/DSC', '/REP', '/SHO', '/GRA',
+    '/PLO', '/TYP', '/EDG', '/ESH', '/SYS', '/UIS', '/PAG', '/FOR', '/HEA',
+    # listing, printing, and plotting
+    'NLIS', 'ELIS', 'KLIS', 'LLIS', 'ALIS', 'VLIS', 'ETLI', '*LIS', 'PRNS',
+    'PRES', 'PRRS', 'PRNL', 'PRRF', 'PRIT', 'PRVA', 'PLNS', 'PLES', 'NPLO',
+    'EPLO', 'KPLO', 'LPLO', 'APLO', 'VPLO', 'GPLO', 'PLVA', 'STAT', '*STA',
+    # parameters and APDL math
+    '*GET', '*VGE', '*DIM', '*SET', '/INQ', '*VFU', '*VOP', '*VSC', '*VCU',
+    '*MOP', '*VFI', '*VRE', '*VMA', '*MFU', '*VFA', '*DEL',
+    # processors and solution
+    '/PRE', '/SOL', '/POS', '/AUX', 'FINI', 'SOLV', 'SET', 'ANTY', 'TIME',
+    'NSUB', 'DELT', 'AUTO', 'OUTR', 'OUTP', 'KBC', 'NLGE', 'EQSL', 'LSWR',
+    'LSSO', 'SAVE', 'CDWR', 'NWRI', 'EWRI', 'ETAB', 'SABS', 'SADD', 'SMUL',
+    'RSYS', 'AVPR', 'ESOL', 'NSOL', 'RFOR', 'ANSO', 'STOR',
+    # loads and materials
+    'D', 'DDEL', 'F', 'FDEL', 'SF', 'SFE', 'SFA', 'SFL', 'SFDE', 'BF', 'BFE',
+    'BFDE', 'DK', 'DL', 'DA', 'FK', 'IC', 'ACEL', 'OMEG', 'MP', 'MPDA', 'MPTE',
+    'MPDE', 'TB', 'TBDA', 'TBTE', 'TBPT', 'R', 'RMOR', 'SECT', 'SECD', 'SECO',
+    'TREF', 'UIMP',
+    # element attribute pointers and meshing controls
+    'TYPE', 'MAT', 'REAL', 'SECN', 'ESYS', 'ESIZ', 'SMRT', 'MSHA', 'MSHK',
+    'MOPT', 'LESI', 'KESI', 'AESI', 'SHPP', 'EXTO', 'KATT', 'LATT', 'AATT',
+    'VATT',
+    # solid modeling and working plane
+    'K', 'KBET', 'KCEN', 'L', 'LSTR', 'LARC', 'LCOM', 'LFIL', 'A', 'AL', 'V',
+    'VA', 'BLOC', 'BLC4', 'BLC5', 'CYL4', 'CYL5', 'CYLI', 'SPHE', 'SPH4',
+    'SPH5', 'CONE', 'CON4', 'TORU', 'RECT', 'PCIR', 'CIRC', 'KSEL', 'LSEL',
+    'ASEL', 'VSEL', 'CM', 'CMDE', 'CSYS', 'LOCA', 'CLOC', 'WPOF', 'WPRO',
+    'WPLA', 'WPCS', 'WPST',
+}
+
+# commands known to modify part of the mesh
+MESH_COMMANDS = {
+    'N': NODE_EFFECT, 'NGEN': NODE_EFFECT, 'FILL': NODE_EFFECT,
+    'NDEL': NODE_EFFECT, 'NMOD': NODE_EFFECT, 'NROT': NODE_EFFECT,
+    'NRRA': NODE_EFFECT, 'NSYM': NODE_EFFECT, 'NSCA': NODE_EFFECT,
+    'NKPT': NODE_EFFECT, 'NANG': NODE_EFFECT, 'NREA': NODE_EFFECT,
+    'MOVE': NODE_EFFECT, 'QUAD': NODE_EFFECT, 'NSEL': NODE_EFFECT,
+    'NSLA': NODE_EFFECT, 'NSLE': NODE_EFFECT, 'NSLK': NODE_EFFECT,
+    'NSLL': NODE_EFFECT, 'NSLV': NODE_EFFECT,
+    'E': ELEM_EFFECT, 'EN': ELEM_EFFECT, 'EGEN': ELEM_EFFECT,
+    'EDEL': ELEM_EFFECT, 'EMOD': ELEM_EFFECT, 'ENGE': ELEM_EFFECT,
+    'ENSY': ELEM_EFFECT, 'ESYM': ELEM_EFFECT, 'ESUR': ELEM_EFFECT,
+    'EINT': ELEM_EFFECT, 'MPCH': ELEM_EFFECT, 'ESEL': ELEM_EFFECT,
+    'ESLA': ELEM_EFFECT, 'ESLL': ELEM_EFFECT, 'ESLN': ELEM_EFFECT,
+    'ESLV': ELEM_EFFECT,
+    'ET': ETYPE_EFFECT, 'ETDE': ETYPE_EFFECT, 'KEYO': ETYPE_EFFECT,
+    'ETCH': ETYPE_EFFECT, 'ETCO': ETYPE_EFFECT,
+}
+for _cmd in ['ALLS', 'CMSE', 'NUMM', 'NUMC', 'NUMO', 'KMES', 'LMES', 'AMES',
+             'VMES', 'AMAP', 'VSWE', 'KCLE', 'LCLE', 'ACLE', 'VCLE', 'NREF',
+             'EREF', 'KREF', 'LREF', 'AREF', 'VREF', 'EMID']:
+    MESH_COMMANDS[_cmd] = NODE_EFFECT | ELEM_EFFECT
+for _cmd in ['/CLE', 'RESU', 'CDRE', '/INP']:
+    MESH_COMMANDS[_cmd] = ALL_MESH_EFFECT
+
+# commands that only change the selection or add new nodes and
+# elements without modifying existing ones
+DELTA_COMMANDS = {
+    'NSEL', 'NSLA', 'NSLE', 'NSLK', 'NSLL', 'NSLV', 'ESEL', 'ESLA', 'ESLL',
+    'ESLN', 'ESLV', 'ALLS', 'CMSE', 'E', 'ESUR', 'KMES', 'LMES', 'AMES',
+    'VMES', 'AMAP', 'VSWE',
+}
+
 
 def parse_to_short_cmd(command):
     """Takes any MAPDL command and returns the first 4 characters of
@@ -71,6 +151,38 @@ def parse_to_short_cmd(command):
         return
 
 
+def mesh_effects(command):
+    """Return the mesh data that may be modified by a MAPDL command.
+
+    Parameters
+    ----------
+    command : str
+        MAPDL command.
+
+    Returns
+    -------
+    frozenset or None
+        Set containing any of ``'nodes'``, ``'elements'`` and
+        ``'etypes'``.  ``None`` when the effect of the command is
+        unknown.
+
+    Examples
+    --------
+    >>> mesh_effects('/COM, hello')
+    frozenset()
+
+    >>> mesh_effects('NSEL, S, LOC, X, 0')
+    frozenset({'nodes'})
+    """
+    if '=' in command.split(',')[0]:  # parameter assignment
+        return NO_MESH_EFFECT
+
+    short_cmd = parse_to_short_cmd(command)
+    if short_cmd in READ_ONLY_COMMANDS:
+        return NO_MESH_EFFECT
+    return MESH_COMMANDS.get(short_cmd)
+
+
 def setup_logger(loglevel='INFO'):
     """Setup logger"""
 
@@ -128,6 +240,8 @@ class _MapdlCore(Commands):
         self._start_parm = start_parm
         self._path = start_parm.get('run_location', None)
         self._ignore_errors = False
+        self._profiler = None
+        self._optimizer = None  # skips redundant commands
 
         self._log = setup_logger(loglevel.upper())
         self._log.debug('Logging set to %s', loglevel)
@@ -135,6 +249,7 @@ class _MapdlCore(Commands):
 
         from ansys.mapdl.core.parameters import Parameters
         self._parameters = Parameters(self)
+        self._session = SessionState(self)
 
         from ansys.mapdl.core.solution import Solution
         self._solution = Solution(self)
@@ -207,6 +322,56 @@ class _MapdlCore(Commands):
         """
         return self._chain_commands(self)
 
+    def macro(self, func):
+        """Run a python function within MAPDL as an APDL macro.
+
+        Use as a decorator.  The function is traced with symbolic
+        arguments and the MAPDL commands it runs are written to a
+        macro with ``*CREATE``.  Each call sends the array arguments
+        as array parameters and runs the macro with ``*USE``.  Loops
+        over array arguments become ``*DO`` loops within MAPDL, so
+        the number of requests does not depend on the number of
+        items.
+
+        The function may not use the value of its array or number
+        arguments in python conditions or as python numbers since
+        these are only known within MAPDL.  Commands run by the
+        function return ``None`` while tracing.
+
+        Parameters
+        ----------
+        func : callable
+            Function running MAPDL commands.  NumPy arrays and lists
+            with 1 or 2 dimensions and numbers may be passed as
+            arguments.  Other arguments are used as is while tracing.
+
+        Returns
+        -------
+        ansys.mapdl.core.macro.Macro
+            Callable running the macro.
+
+        Examples
+        --------
+        Create 1000 keypoints with a single loop within MAPDL.
+
+        >>> @mapdl.macro
+        ... def keypoints(x, y):
+        ...     for xi, yi in zip(x, y):
+        ...         mapdl.k(xi.index + 1, xi, yi, 0)
+
+        >>> keypoints(np.linspace(0, 1, 1000), np.zeros(1000))
+
+        Scale the rows of a two dimensional array.
+
+        >>> @mapdl.macro
+        ... def nodes(xyz, scale):
+        ...     for row in xyz:
+        ...         mapdl.n(row.index + 1, row[0]*scale, row[1]*scale, row[2]*scale)
+
+        >>> nodes(np.random.random((100, 3)), 2.0)
+        """
+        return Macro(self, func)
+
     def _chain_stored(self):
         """Send a series of commands to MAPDL"""
         # there's to be an limit to 640 characters per command, so
@@ -220,7 +385,7 @@ class _MapdlCore(Commands):
             if len_command + c > MAX_COMMAND_LENGTH:
                 chained_commands.append('$'.join(chunk))
                 chunk = [command]
-                c = 0
+                c = len_command
             else:
                 chunk.append(command)
                 c += len_command
@@ -517,9 +682,70 @@ class _MapdlCore(Commands):
 
         return self._archive_cache
 
-    def _reset_cache(self):
-        """Reset cached items"""
-        self._archive_cache = None
+    def _reset_cache(self, command=None):
+        """Reset cached items.
+
+        When ``command`` is given, only items that may be modified by
+        this command are reset.
+        """
+        if command is None or mesh_effects(command) != NO_MESH_EFFECT:
+            self._archive_cache = None
+
+        if command is None:
+            self._parameters._reset_cache()
+            self._session._reset_cache()
+        else:
+            self._parameters._invalidate(command)
+            self._session._invalidate(command)
+
+        if self._optimizer is not None:
+            if command is None:
+                self._optimizer._reset_cache()
+            else:
+                self._optimizer._invalidate(command)
+
+    def _update_state(self, command):
+        """Track the state set by a command that completed without an
+        error"""
+        self._parameters._update(command)
+        self._session._update(command)
+        if self._optimizer is not None:
+            self._optimizer._update(command)
+
+    @property
+    def skip_redundant(self):
+        """Skip commands that would not change anything in MAPDL.
+
+        When enabled, commands such as ``/PREP7``, ``FINISH``,
+        ``ALLSEL``, ``TYPE``, ``MAT`` or ``ESIZE`` are not sent when
+        MAPDL is known to already be in that state, and ``CM`` and
+        ``CMSEL`` are not sent when the component already matches the
+        current selection.  Skipped commands return an empty string.
+        The state is tracked from the commands run through ``run``,
+        and any command with an unknown effect discards it.
+
+        Consecutive attribute settings within ``chain_commands`` or
+        ``lazy_batching`` are coalesced so that only the last setting
+        of each attribute is sent.
+
+        Disabled by default.
+
+        Examples
+        --------
+        >>> mapdl.skip_redundant = True
+        >>> mapdl.prep7()
+        >>> mapdl.prep7()  # not sent
+        ''
+        """
+        return self._optimizer is not None
+
+    @skip_redundant.setter
+    def skip_redundant(self, value):
+        if value and self._optimizer is None:
+            from ansys.mapdl.core.optimizer import CommandOptimizer
+            self._optimizer = CommandOptimizer(self._session)
+        elif not value:
+            self._optimizer = None
 
     @property
     def allow_ignore(self):
@@ -1229,14 +1455,14 @@ class _MapdlCore(Commands):
     def _result_file(self):
         """Path of the non-distributed result file"""
         try:
-            filename = self.inquire('RSTFILE')
+            filename = self._session.inquire('RSTFILE')
             if not filename:
                 filename = self.jobname
         except Exception:
             filename = self.jobname
 
         try:
-            ext = self.inquire('RSTEXT')
+            ext = self._session.inquire('RSTEXT')
         except Exception:  # check if rth file exists
             ext = ''
 
@@ -1329,6 +1555,44 @@ class _MapdlCore(Commands):
         self._log.removeHandler(self._log_filehandler)
         self._log.info('Removed file handler')
 
+    @contextmanager
+    def profile(self, filename=None):
+        """Record a timeline of this session.
+
+        Records each command, cache update, gRPC request and the
+        client side processing of meshes and results.  The timeline
+        is written as a Chrome trace, which can be opened with
+        ``chrome://tracing`` or https://ui.perfetto.dev.
+
+        gRPC requests are traced independently of ``mapdl.stats``,
+        which is neither enabled nor updated by profiling.
+
+        Parameters
+        ----------
+        filename : str, optional
+            Write the trace to this JSON file when the block exits.
+
+        Yields
+        ------
+        ansys.mapdl.core.profiler.Profiler
+            Profiler containing the recorded events.
+
+        Examples
+        --------
+        >>> with mapdl.profile('run.json'):
+        ...     mapdl.prep7()
+        ...     mapdl.mesh.grid
+        """
+        profiler = Profiler()
+        self._profiler = profiler
+        try:
+            yield profiler
+        finally:
+            self._profiler = None
+            if filename is not None:
+                profiler.save(filename)
+
+    @profiled('command')
     def _flush_stored(self):
         """Writes stored commands to an input file and runs the input
         file.  Used with non_interactive.
@@ -1527,10 +1791,11 @@ class _MapdlCore(Commands):
     def jobname(self):
         """MAPDL job name.
 
-        This is requested from the active mapdl instance.
+        This is requested from the active mapdl instance when it may
+        have changed since the last request.
         """
         try:
-            self._jobname = self.inquire('JOBNAME')
+            self._jobname = self._session.inquire('JOBNAME')
         except Exception:
             pass
         return self._jobname
@@ -1765,6 +2030,7 @@ class _MapdlCore(Commands):
         self._flush_stored()
         return self._response
 
+    @profiled('command', record_arg=True)
     def run(self, command, write_to_log=True, **kwargs):
         """Run single APDL command.
 
@@ -1809,34 +2075,20 @@ class _MapdlCore(Commands):
 
         >>> mapdl.run_multiline(cmd)
         """
-        command = command.strip()
-        # check if multiline
-        if '\n' in command or '\r' in command:
-            raise ValueError('Use ``run_multiline`` for multi-line commands')
-
-        # always reset the cache
-        self._reset_cache()
-
-        # address MAPDL /INPUT level issue
-        if command[:4].upper() == '/CLE':
-            # Address gRPC issue
-            # https://github.com/pyansys/pymapdl/issues/380
-            command = '/CLE,NOSTART'
+        command = self._prepare_command(command)
+        if command is None:
+            return ''
 
         if self._store_commands:
-            self._stored_commands.append(command)
+            if self._optimizer is not None:
+                # stored commands may be run conditionally
+                self._optimizer._reset_cache()
+                self._optimizer.coalesce(self._stored_commands, command)
+            else:
+                self._stored_commands.append(command)
             return
-        elif command[:3].upper() in INVAL_COMMANDS:
-            exception = RuntimeError('Invalid pymapdl command "%s"\n\n%s' %
-                                     (command, INVAL_COMMANDS[command[:3]]))
-            raise exception
-        elif command[:4].upper() in INVAL_COMMANDS:
-            exception = RuntimeError('Invalid pymapdl command "%s"\n\n%s' %
-                                     (command, INVAL_COMMANDS[command[:4]]))
-            raise exception
-        elif write_to_log and self._apdl_log is not None:
-            if not self._apdl_log.closed:
-                self._apdl_log.write('%s\n' % command)
+
+        self._log_command(command, write_to_log)
 
         if command[:4].upper() == '/LIS':
             # simply return the contents of the file
@@ -1849,36 +2101,135 @@ class _MapdlCore(Commands):
             self._log.info(self._response)
         else:
             self._response = ''
+            self._update_state(command)
             return self._response
 
-        if 'is not a recognized' in text:
+        self._check_response(self._response)
+        self._update_state(command)
+
+        # special returns for certain geometry commands
+        short_cmd = parse_to_short_cmd(command)
+
+        if short_cmd in PLOT_COMMANDS:
+            return self._display_plot(self._response)
+
+        return self._response
+
+    def run_iter(self, command):
+        """Run a MAPDL command and iterate over the lines of its
+        response.
+
+        Intended for commands with very long responses, such as
+        ``NLIST`` or ``PRNSOL`` over a large model.  Where supported,
+        the response is streamed from MAPDL and errors are raised as
+        soon as they are received, so the entire response is never
+        held in memory.  The response is neither logged nor stored
+        in ``last_response``.
+
+        Parameters
+        ----------
+        command : str
+            Any valid single line MAPDL command.
+
+        Yields
+        ------
+        str
+            Lines of the response.
+
+        Examples
+        --------
+        >>> for line in mapdl.run_iter('NLIST'):
+        ...     print(line)
+        """
+        response = self.run(command)
+        if response:
+            yield from response.splitlines()
+
+    def _prepare_command(self, command):
+        """Prepare a single line command to be run or stored.
+
+        Resets any cache modified by the command.
+
+        Returns
+        -------
+        str or None
+            Command to run, or ``None`` when ``skip_redundant`` is
+            enabled and the command would not change anything.
+        """
+        command = command.strip()
+        # check if multiline
+        if '\n' in command or '\r' in command:
+            raise ValueError('Use ``run_multiline`` for multi-line commands')
+
+        if self._optimizer is not None and not self._store_commands:
+            if self._optimizer.is_redundant(command):
+                self._log.debug('Skipping redundant command %s', command)
+                return None
+
+        # reset any cache modified by this command
+        self._reset_cache(command)
+
+        # address MAPDL /INPUT level issue
+        if command[:4].upper() == '/CLE':
+            # Address gRPC issue
+            # https://github.com/pyansys/pymapdl/issues/380
+            command = '/CLE,NOSTART'
+        return command
+
+    def _log_command(self, command, write_to_log=True):
+        """Check that a command can be run interactively and write it
+        to the APDL log."""
+        self._check_valid_command(command)
+        if write_to_log and self._apdl_log is not None:
+            if not self._apdl_log.closed:
+                self._apdl_log.write('%s\n' % command)
+
+    def _check_valid_command(self, command):
+        """Raise a ``RuntimeError`` for commands that cannot be run
+        interactively."""
+        for short_cmd in (command[:3].upper(), command[:4].upper()):
+            if short_cmd in INVAL_COMMANDS:
+                raise RuntimeError('Invalid pymapdl command "%s"\n\n%s' %
+                                   (command, INVAL_COMMANDS[short_cmd]))
+
+    def _check_response(self, response):
+        """Raise an exception when a MAPDL response contains an error.
+
+        Parameters
+        ----------
+        response : str
+            Response from MAPDL.
+
+        Raises
+        ------
+        MapdlInvalidRoutineError
+            When the command is not recognized in the current routine
+            and ``allow_ignore`` is ``False``.
+
+        MapdlRuntimeError
+            When MAPDL returns an error that is not permitted and
+            ``ignore_errors`` is ``False``.
+        """
+        if 'is not a recognized' in response:
             if not self.allow_ignore:
-                text = text.replace('This command will be ignored.', '')
-                text += '\n\nIgnore these messages by setting allow_ignore=True'
-                raise MapdlInvalidRoutineError(text)
+                response = response.replace('This command will be ignored.', '')
+                response += '\n\nIgnore these messages by setting allow_ignore=True'
+                raise MapdlInvalidRoutineError(response)
 
         # flag errors
-        if '*** ERROR ***' in self._response and not self._ignore_errors:
+        if '*** ERROR ***' in response and not self._ignore_errors:
             # remove permitted errors and allow MAPDL to continue
-            response = self._response
+            stripped = response
             for err_str in _PERMITTED_ERRORS:
-                response = re.sub(err_str, '', response)
+                stripped = re.sub(err_str, '', stripped)
 
-            if '*** ERROR ***' in response:
-                self._log.error(self._response)
-                raise MapdlRuntimeError(self._response)
+            if '*** ERROR ***' in stripped:
+                self._log.error(response)
+                raise MapdlRuntimeError(response)
             else:
                 warnings.warn('MAPDL returned non-abort errors.  Please '
                               'check the logs.')
 
-        # special returns for certain geometry commands
-        short_cmd = parse_to_short_cmd(command)
-
-        if short_cmd in PLOT_COMMANDS:
-            return self._display_plot(self._response)
-
-        return self._response
-
     @property
     def ignore_errors(self):
         """Flag to ignore MAPDL errors.
@@ -2004,7 +2355,7 @@ class _MapdlCore(Commands):
         """
         # always attempt to cache the path
         try:
-            self._path = self.inquire('DIRECTORY')
+            self._path = self._session.inquire('DIRECTORY')
         except Exception:
             pass
 
@@ -2114,6 +2465,22 @@ class _MapdlCore(Commands):
                 raise RuntimeError('Unable to get array for %s' % entity)
         return arr
 
+    def _get_arrays(self, requests):
+        """Get several arrays using the VGET command.
+
+        Parameters
+        ----------
+        requests : list
+            List of ``(entity, entnum, item1, it1num, item2, it2num,
+            kloop)`` tuples.  Trailing fields may be omitted.
+
+        Returns
+        -------
+        list
+            Numpy 1D array for each request.
+        """
+        return [self.get_array(*request) for request in requests]
+
     def _get_array(self, entity='', entnum='', item1='', it1num='', item2='',
                    it2num='', kloop='', dtype=None, **kwargs):
         """Uses the VGET command to get an array from ANSYS"""
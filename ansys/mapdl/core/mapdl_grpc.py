@@ -12,6 +12,11 @@ import socket
 from functools import wraps
 import tempfile
 import subprocess
+import hashlib
+import queue
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 import grpc
 import numpy as np
@@ -21,15 +26,21 @@ from ansys.grpc.mapdl import mapdl_pb2 as pb_types
 from ansys.grpc.mapdl import mapdl_pb2_grpc as mapdl_grpc
 from ansys.grpc.mapdl import ansys_kernel_pb2 as anskernel
 
-from ansys.mapdl.core.mapdl import _MapdlCore
+from ansys.mapdl.core.mapdl import (_MapdlCore, parse_to_short_cmd,
+                                   PLOT_COMMANDS, MAX_COMMAND_LENGTH)
 from ansys.mapdl.core.errors import MapdlExitedError, protect_grpc, MapdlRuntimeError
 from ansys.mapdl.core.misc import (supress_logging, run_as_prep7, last_created,
                                    random_string)
 from ansys.mapdl.core.post import PostProcessing
+from ansys.mapdl.core.stats import Stats
+from ansys.mapdl.core.profiler import profiled
 from ansys.mapdl.core.common_grpc import (parse_chunks,
                                           ANSYS_VALUE_TYPE,
                                           DEFAULT_CHUNKSIZE,
-                                          DEFAULT_FILE_CHUNK_SIZE)
+                                          DEFAULT_FILE_CHUNK_SIZE,
+                                          MIN_CHUNK_SIZE,
+                                          MAX_CHUNK_SIZE,
+                                          CHUNK_TRANSFER_TIME)
 from ansys.mapdl.core import __version__, _LOCAL_PORTS
 from ansys.mapdl.core import check_version
 
@@ -37,6 +48,115 @@ logger = logging.getLogger(__name__)
 
 VOID_REQUEST = anskernel.EmptyRequest()
 
+# maximum number of commands submitted with ``submit`` awaiting a
+# response, including those waiting to be sent
+MAX_IN_FLIGHT = 256
+
+# comment separating the responses of chained submitted commands
+SUBMIT_MARKER = '__PYMAPDL_SUBMITTED__'
+SUBMIT_SEPARATOR = f'$/COM,{SUBMIT_MARKER}$'
+
+# maximum number of lines of an error message checked by ``run_iter``
+MAX_ERROR_LINES = 50
+
+# channel level compression algorithms.  These apply only to the
+# messages sent by the client; the server decides whether its
+# responses are compressed.
+COMPRESSION = {None: grpc.Compression.NoCompression,
+               'gzip': grpc.Compression.Gzip,
+               'deflate': grpc.Compression.Deflate}
+
+# status codes of interrupted downloads that may be retried
+RETRY_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED,
+               grpc.StatusCode.ABORTED)
+
+# commands whose output is parsed or otherwise needed by the caller
+# and therefore never buffered when ``lazy_batching`` is enabled
+RESPONSE_COMMANDS = {
+    '*STA', '/INQ', '/STA', 'STAT', 'SOLV', 'AMES', 'N', 'K', 'KBET', 'KCEN',
+    'KDIS', 'KL', 'KNOD', 'E', 'ET', 'L', 'L2AN', 'L2TA', 'LANG', 'LARC', 'LARE', 'LCOM',
+    'LEXT', 'LFIL', 'LSTR', 'LTAN', 'BSPL', 'SPLI', 'CIRC', 'A', 'AL', 'ASBA',
+    'V', 'VA', 'BLC4', 'BLC5', 'BLOC', 'CON4', 'CONE', 'CYL4', 'CYL5', 'CYLI',
+    'PCIR', 'RECT', 'SPH4', 'SPH5', 'SPHE', 'TORU', 'ETLI', 'PRNS', 'PRES',
+    'PRRS', 'PRNL', 'PRRF', 'PRIT', 'PRVA', 'PRSE', 'PRPA', 'PRER', 'PRCI',
+}
+
+
+def _needs_response(command):
+    """Return ``True`` when the output of a command is needed."""
+    short_cmd = parse_to_short_cmd(command)
+    return (short_cmd in RESPONSE_COMMANDS or short_cmd in PLOT_COMMANDS
+            or short_cmd[1:].startswith('LIS'))  # NLIST, *LIST, etc.
+
+
+def _next_submitted(pending):
+    """Remove the submitted commands to chain into the next request.
+
+    Commands with the same output option are chained up to the maximum
+    command length.  Star commands (``*IF``, ``*DO``, etc.) cannot be
+    chained and are sent alone.
+
+    Returns
+    -------
+    str
+        Output option of the commands.
+
+    list
+        Command and future of each command.
+    """
+    command, opt, future = pending.popleft()
+    batch = [(command, future)]
+    if command.startswith('*'):
+        return opt, batch
+
+    length = len(command)
+    while pending:
+        command, next_opt, future = pending[0]
+        length += len(command) + len(SUBMIT_SEPARATOR)
+        if next_opt != opt or command.startswith('*') or length > MAX_COMMAND_LENGTH:
+            break
+        pending.popleft()
+        batch.append((command, future))
+    return opt, batch
+
+
+def _split_submitted(response, n_commands):
+    """Split the response of chained submitted commands at the
+    ``/COM`` markers separating them.
+
+    Returns ``None`` when the markers are missing, for example when
+    the output was muted or suppressed with ``/NOPR``.
+    """
+    if n_commands == 1:
+        return [response]
+
+    responses = [[]]
+    for line in response.splitlines():
+        if SUBMIT_MARKER in line.upper():
+            responses.append([])
+        else:
+            responses[-1].append(line)
+
+    if len(responses) != n_commands:
+        return None
+    return ['\n'.join(lines).strip() for lines in responses]
+
+
+def _stream_lines(stream):
+    """Yield the lines of a streamed command response.
+
+    Lines split across chunks of the stream are joined, so only a
+    single chunk and a partial line are held in memory.
+    """
+    partial = ''
+    for item in stream:
+        lines = (partial + '\n'.join(item.cmdout)).split('\n')
+        partial = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+
+    if partial:
+        yield partial.rstrip('\r')
 
 
 def chunk_raw(raw, save_as):
@@ -51,7 +171,8 @@ def chunk_raw(raw, save_as):
                                                                    size=length))
 
 
-def get_file_chunks(filename, progress_bar=False):
+def get_file_chunks(filename, progress_bar=False,
+                    chunk_size=DEFAULT_FILE_CHUNK_SIZE):
     """Serializes a file into chunks"""
     pbar = None
     if progress_bar:
@@ -63,7 +184,7 @@ def get_file_chunks(filename, progress_bar=False):
 
     with open(filename, 'rb') as f:
         while True:
-            piece = f.read(DEFAULT_FILE_CHUNK_SIZE)
+            piece = f.read(chunk_size)
             length = len(piece)
             if length == 0:
                 if pbar is not None:
@@ -108,6 +229,15 @@ def save_chunks_to_file(chunks, filename, progress_bar=True,
     return file_size
 
 
+def md5sum(filename):
+    """Return the MD5 checksum of a local file"""
+    md5 = hashlib.md5()
+    with open(filename, 'rb') as f:
+        for piece in iter(lambda: f.read(DEFAULT_FILE_CHUNK_SIZE), b''):
+            md5.update(piece)
+    return md5.hexdigest()
+
+
 class RepeatingTimer(threading.Timer):
     """Run a function repeately"""
     def run(self):
@@ -156,6 +286,21 @@ class MapdlGrpc(_MapdlCore):
         Removes temporary files on exit if MAPDL is local.  Default
         ``False``.
 
+    compression : str, optional
+        Compress the requests sent to MAPDL over the channel.  Either
+        ``'gzip'`` or ``'deflate'``.  Responses from MAPDL, including
+        downloaded files and arrays, are compressed only if the server
+        is configured to do so.  Useful for remote instances on slow
+        networks when uploading large files or input decks.  Default
+        ``None``.
+
+    n_channels : int, optional
+        Number of gRPC channels used for ``*GET`` requests.  Additional
+        channels allow ``*GET`` requests from several threads to be
+        sent concurrently rather than one at a time.  Experimental, as
+        MAPDL is not known to support concurrent requests.  Default
+        ``1``.
+
     Examples
     --------
     Connect to an instance of MAPDL already running on locally on the
@@ -171,22 +316,52 @@ class MapdlGrpc(_MapdlCore):
     Connect to an instance of MAPDL running on the LAN on a non-default port
 
     >>> mapdl = pymapdl.Mapdl('192.168.1.101', port=60001)
+
+    Connect to a remote instance compressing requests with gzip.
+
+    >>> mapdl = pymapdl.Mapdl('192.168.1.101', compression='gzip')
+
+    Query MAPDL from several threads over four channels (experimental).
+
+    >>> mapdl = pymapdl.Mapdl(n_channels=4)
     """
 
     def __init__(self, ip='127.0.0.1', port=None, timeout=15, loglevel='WARNING',
                  cleanup_on_exit=False, log_apdl=False, set_no_abort=True,
-                 remove_temp_files=False, **kwargs):
+                 remove_temp_files=False, compression=None, n_channels=1,
+                 **kwargs):
         """Initialize connection to the mapdl server"""
         super().__init__(loglevel, **kwargs)
 
         check_valid_ip(ip)
-
-        # gRPC request specific locks as these gRPC request are not thread safe
-        self._vget_lock = False
-        self._get_lock = False
+        if compression not in COMPRESSION:
+            raise ValueError(f'Invalid compression "{compression}".  Use one '
+                             'of:\n%s' % str(list(COMPRESSION)))
+        self._compression = compression
+        self._stats = Stats()
+        self._trace_stats = None  # traces requests within ``profile``
+        self._recorder = None  # records requests within ``record``
+        if n_channels < 1:
+            raise ValueError('``n_channels`` must be at least 1')
+        self._n_channels = n_channels
+
+        # VGET requests are not thread safe as they use a constant
+        # temporary parameter within MAPDL
+        self._vget_lock = threading.Lock()
+        self._get_stubs = None  # idle stubs for *GET requests
+        self._get_channels = []
 
         self._prioritize_thermal = False
         self._locked = False  # being used within MapdlPool
+        self._submitted = deque()  # futures from ``submit``
+        self._sync_lock = threading.RLock()
+        self._pending = deque()  # submitted requests not yet sent
+        self._sending = False  # a submitted request awaits its response
+        self._submit_lock = threading.Lock()
+        self._max_in_flight = MAX_IN_FLIGHT
+        self._lazy_batching = False
+        self._lazy_commands = []
+        self._transfer_rate = None  # bytes per second of the last download
         self._stub = None
         self._cleanup = cleanup_on_exit
         self._remove_tmp = remove_temp_files
@@ -298,22 +473,8 @@ class MapdlGrpc(_MapdlCore):
         timeout : float
             Time in seconds to wait until the connection has been established
         """
-        self._server = {'ip': self._ip, 'port': port}
-        self._channel_str = '%s:%d' % (self._ip, port)
-        self._log.debug('Opening insecure channel at %s', self._channel_str)
-
-        self._channel = grpc.insecure_channel(self._channel_str)
-        self._state = grpc.channel_ready_future(self._channel)
-        self._stub = mapdl_grpc.MapdlServiceStub(self._channel)
-
-        # verify connection
-        tstart = time.time()
-        while ((time.time() - tstart) < timeout) and not self._state._matured:
-            time.sleep(0.01)
-
-        if not self._state._matured:  # pragma: no cover
+        if not self._open_channel(port, timeout):
             return False
-        self._log.debug('Established connection to MAPDL gRPC')
 
         # keeps mapdl session alive
         self._timer = None
@@ -349,6 +510,44 @@ class MapdlGrpc(_MapdlCore):
 
         return True
 
+    def _open_channel(self, port, timeout):
+        """Open the gRPC channels to MAPDL and wait until connected.
+
+        Parameters
+        ----------
+        timeout : float
+            Time in seconds to wait until the connection has been established
+        """
+        self._server = {'ip': self._ip, 'port': port}
+        self._channel_str = '%s:%d' % (self._ip, port)
+        self._log.debug('Opening insecure channel at %s', self._channel_str)
+
+        self._channel = grpc.insecure_channel(self._channel_str,
+                                              compression=COMPRESSION[self._compression])
+        self._state = grpc.channel_ready_future(self._channel)
+        self._stub = mapdl_grpc.MapdlServiceStub(self._channel)
+
+        # each additional channel uses its own connection
+        self._get_stubs = queue.Queue()
+        self._get_stubs.put(self._grpc_stub)
+        self._get_channels = []
+        for _ in range(self._n_channels - 1):
+            channel = grpc.insecure_channel(self._channel_str,
+                                            options=[('grpc.use_local_subchannel_pool', 1)],
+                                            compression=COMPRESSION[self._compression])
+            self._get_channels.append(channel)
+            self._get_stubs.put(mapdl_grpc.MapdlServiceStub(channel))
+
+        # verify connection
+        tstart = time.time()
+        while ((time.time() - tstart) < timeout) and not self._state._matured:
+            time.sleep(0.01)
+
+        if not self._state._matured:  # pragma: no cover
+            return False
+        self._log.debug('Established connection to MAPDL gRPC')
+        return True
+
     @property
     def _server_version(self):
         """Return the server version.
@@ -475,10 +674,24 @@ class MapdlGrpc(_MapdlCore):
         """Do not abort MAPDL"""
         self.nerr(abort=-1, mute=True)
 
-    def _reset_cache(self):
-        """Reset cached items"""
-        self._mesh_rep._reset_cache()
-        self._geometry._reset_cache()
+    def _reset_cache(self, command=None):
+        """Reset cached items, including the mesh.
+
+        When ``command`` is given, only items that may be modified by
+        this command are reset.
+        """
+        if command is None:
+            self._mesh_rep._reset_cache()
+        else:
+            self._mesh_rep._invalidate(command)
+        super()._reset_cache(command)
+
+    def _update_state(self, command):
+        """Track the state set by a command that completed without an
+        error.  Commands buffered by ``lazy_batching`` have not been
+        run yet and are not tracked."""
+        if not self._lazy_commands:
+            super()._update_state(command)
 
     @property
     def _mesh(self):
@@ -515,18 +728,20 @@ class MapdlGrpc(_MapdlCore):
         >>> mapdl.run('/PREP7', verbose=True)
 
         """
-        if mute is None:
-            mute = self._mute
-
-        if self._exited:
-            raise MapdlExitedError
+        self._check_sendable(cmd)
 
-        # don't allow empty commands
-        if not cmd.strip():
-            raise ValueError('Empty commands not allowed')
+        # commands not explicitly requesting output are buffered
+        if self._lazy_batching:
+            if not verbose and mute is not False and not _needs_response(cmd):
+                if self._optimizer is not None:
+                    self._optimizer.coalesce(self._lazy_commands, cmd)
+                else:
+                    self._lazy_commands.append(cmd)
+                return ''
+            self._flush_lazy()
 
-        if len(cmd) > 639:  # CMD_MAX_LENGTH
-            raise ValueError('Maximum command length must be less than 640 characters')
+        if mute is None:
+            mute = self._mute
 
         self._busy = True
         if verbose:
@@ -539,7 +754,412 @@ class MapdlGrpc(_MapdlCore):
     @property
     def busy(self):
         """True when MAPDL gRPC server is executing a command"""
-        return self._busy
+        return self._busy or any(not future.done() for future in self._submitted)
+
+    @property
+    def lazy_batching(self):
+        """Buffer commands whose output is not needed.
+
+        When enabled, commands run without ``mute=False`` are stored
+        locally rather than sent to MAPDL and return an empty string.
+        Buffered commands are sent together as soon as anything needs
+        a result from MAPDL, such as ``get_value``, ``mesh.nodes``,
+        ``parameters``, ``solve``, or a command whose output is parsed
+        (``k``, ``nlist``, etc.).  Short buffers are sent as a single
+        chained command and longer ones as one input file.
+
+        Errors from buffered commands are raised when the buffer is
+        sent rather than by the command that caused them.  Disabling
+        lazy batching sends any buffered commands.
+
+        Examples
+        --------
+        >>> mapdl.lazy_batching = True
+        >>> mapdl.nsel('NONE')
+        >>> for i in range(1, 1001, 2):
+        ...     mapdl.nsel('A', 'NODE', '', i)
+        >>> mapdl.mesh.n_node
+        500
+        """
+        return self._lazy_batching
+
+    @lazy_batching.setter
+    def lazy_batching(self, value):
+        self._lazy_batching = bool(value)
+        if not self._lazy_batching:
+            self._flush_lazy()
+
+    @profiled('command')
+    def _flush_lazy(self):
+        """Send the commands buffered with ``lazy_batching``."""
+        if not self._lazy_commands:
+            return
+        commands, self._lazy_commands = self._lazy_commands, []
+        self._log.debug('Sending %d batched commands', len(commands))
+
+        # star commands (*IF, *DO, etc.) cannot be chained
+        chained = '$'.join(commands)
+        if len(chained) <= MAX_COMMAND_LENGTH and not chained.startswith('*') \
+           and '$*' not in chained:
+            response = self._send_command(chained)
+        else:
+            response = self._input_commands('\n'.join(commands))
+        self._check_response(response)
+
+    @property
+    def _stub(self):
+        """gRPC stub.
+
+        Commands pending from ``submit`` or ``lazy_batching`` are
+        completed before the stub is returned so that every other
+        request sees their effects.
+        """
+        if self._submitted or self._lazy_commands:
+            self._synchronize()
+        return self._rpc_stub
+
+    @_stub.setter
+    def _stub(self, stub):
+        self._grpc_stub = stub
+        self._instrumented_stub = None if stub is None else self._stats.wrap(stub)
+
+    @property
+    def _rpc_stub(self):
+        """gRPC stub, recording requests when ``stats`` is enabled or
+        within ``profile`` or ``record``"""
+        stub = self._instrumented_stub if self._stats.enabled else self._grpc_stub
+        return self._wrap_stub(stub)
+
+    def _wrap_stub(self, stub):
+        """Wrap a stub to trace its requests in the active profiler and
+        recording.
+
+        The profiler uses statistics of its own so that ``stats`` is
+        unaffected by profiling.
+        """
+        profiler = self._profiler
+        if profiler is not None:
+            trace_stats = self._trace_stats
+            if trace_stats is None or trace_stats._tracer is not profiler:
+                trace_stats = Stats(enabled=True)
+                trace_stats._tracer = profiler
+                self._trace_stats = trace_stats
+            stub = trace_stats.wrap(stub)
+        if self._recorder is not None:
+            stub = self._recorder.wrap(stub)
+        return stub
+
+    @property
+    def stats(self):
+        """Client side statistics of all gRPC requests.
+
+        Collects the number of requests, bytes transferred and latency
+        histograms by RPC and by APDL command.  Disabled by default.
+
+        Examples
+        --------
+        >>> mapdl.stats.enable()
+        >>> mapdl.prep7()
+        >>> mapdl.mesh.nodes
+        >>> mapdl.stats
+        RPC                          Count    Total (s)     Sent (B)   Received (B)
+        Nodes                            1     0.002313            4          24045
+        SendCommand                      2     0.001873           48            112
+        ...
+
+        Bytes received by the ``Nodes`` RPC
+
+        >>> mapdl.stats.rpcs['Nodes'].bytes_received
+        24045
+
+        Clear the statistics and stop collecting
+
+        >>> mapdl.stats.reset()
+        >>> mapdl.stats.disable()
+        """
+        return self._stats
+
+    @contextmanager
+    def record(self, filename):
+        """Record every gRPC request and its response to a file.
+
+        The recording can be replayed without MAPDL with
+        ``ansys.mapdl.core.replay.ReplayMapdl``, for example to profile
+        the client or to reproduce a performance regression.
+
+        Parameters
+        ----------
+        filename : str
+            Write the recording to this file.
+
+        Yields
+        ------
+        ansys.mapdl.core.replay.Recorder
+            Recorder writing the requests.
+
+        Examples
+        --------
+        >>> with mapdl.record('session.rec'):
+        ...     mapdl.prep7()
+        ...     nodes = mapdl.mesh.nodes
+
+        >>> from ansys.mapdl.core.replay import ReplayMapdl
+        >>> replay = ReplayMapdl('session.rec')
+        >>> replay.prep7()
+        """
+        from ansys.mapdl.core.replay import Recorder
+
+        if self._submitted or self._lazy_commands:
+            self._synchronize()
+
+        metadata = {'local': self._local, 'jobname': self._jobname,
+                    'client': __version__}
+        ignore = [self._timer] if self._timer is not None else []
+        recorder = Recorder(filename, metadata, ignore)
+        self._recorder = recorder
+        try:
+            yield recorder
+        finally:
+            try:
+                if self._submitted or self._lazy_commands:
+                    self._synchronize()
+            finally:
+                self._recorder = None
+                recorder.close()
+
+    def _synchronize(self):
+        """Send any batched commands and wait until MAPDL has
+        responded to all submitted commands.
+
+        Serialized, as it may be called from several threads sending
+        ``*GET`` requests.
+        """
+        with self._sync_lock:
+            self._flush_lazy()
+            while self._submitted:
+                wait(list(self._submitted))
+                while self._submitted and self._submitted[0].done():
+                    self._submitted.popleft()
+
+    def submit(self, command, mute=None):
+        """Submit a command to MAPDL without waiting for its response.
+
+        Commands are sent in the order they are submitted while Python
+        continues without waiting for the responses.  One request is
+        sent at a time and the commands submitted while MAPDL is busy
+        with it are chained into the next request, so a series of
+        commands costs a few round trips rather than one per command.
+        Any other request to MAPDL (``run``, ``get``, mesh or parameter
+        access, etc.) first waits for all submitted commands to
+        complete.
+
+        At most 256 submitted commands may be waiting to be sent or
+        awaiting a response; once this limit is reached, ``submit``
+        blocks until the oldest command completes.
+
+        Parameters
+        ----------
+        command : str
+            Any valid single line MAPDL command.
+
+        mute : bool, optional
+            Request that no output be sent from the gRPC server.
+            Defaults to the global setting as specified with
+            ``mapdl.mute = <bool>``.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future whose result is the response from MAPDL.  The
+            future raises ``MapdlRuntimeError`` or
+            ``MapdlInvalidRoutineError`` when MAPDL returns an error.
+            The responses of chained muted commands cannot be told
+            apart, so an error raised by any of them is raised by
+            all of them.
+
+        Examples
+        --------
+        Create a row of keypoints without waiting on each command.
+
+        >>> futures = [mapdl.submit(f'K, {i}, {i}, 0, 0') for i in range(1, 101)]
+        >>> futures[-1].result()
+        'KEYPOINT    100   X,Y,Z=   100.000       0.00000       0.00000'
+
+        Wait on all submitted commands at once.
+
+        >>> from concurrent.futures import wait
+        >>> done, _ = wait(futures)
+        """
+        future = Future()
+        if self._store_commands:
+            future.set_result(self.run(command, mute=mute))
+            return future
+
+        command = self._prepare_command(command)
+        if command is None:  # redundant
+            future.set_result('')
+            return future
+        self._check_sendable(command)
+        self._log_command(command)
+        self._flush_lazy()
+
+        # bound the number of requests awaiting a response
+        while len(self._submitted) >= self._max_in_flight:
+            wait([self._submitted[0]])
+            self._submitted.popleft()
+
+        if mute is None:
+            mute = self._mute
+        opt = 'MUTE' if mute else ''
+
+        future.set_running_or_notify_cancel()
+        self._submitted.append(future)
+        with self._submit_lock:
+            self._pending.append((command, opt, future))
+        self._send_next()
+        return future
+
+    def _send_next(self):
+        """Send the submitted commands waiting to be sent once MAPDL
+        has responded to the previous request.
+
+        Separate unary requests are not ordered by gRPC, so only one
+        request is sent at a time and the commands submitted meanwhile
+        are chained into the next one.  Unless muted, the commands are
+        separated by a ``/COM`` marker so that the response can be
+        split between them.
+        """
+        with self._submit_lock:
+            if self._sending or not self._pending:
+                return
+            self._sending = True
+            opt, batch = _next_submitted(self._pending)
+
+        commands = [command for command, _ in batch]
+        if opt:
+            chained = '$'.join(commands)
+        else:
+            chained = SUBMIT_SEPARATOR.join(commands)
+        request = pb_types.CmdRequest(command=chained, opt=opt)
+        futures = [future for _, future in batch]
+
+        def resolve(grpc_future):
+            with self._submit_lock:
+                self._sending = False
+            self._send_next()
+            self._resolve_submitted(grpc_future, futures)
+
+        self._rpc_stub.SendCommand.future(request).add_done_callback(resolve)
+
+    def _resolve_submitted(self, grpc_future, futures):
+        """Set the results of chained submitted commands from their
+        response"""
+        try:
+            response = grpc_future.result().response
+        except grpc.RpcError:
+            for future in futures:
+                future.set_exception(MapdlExitedError('MAPDL server connection terminated'))
+            return
+
+        if response:
+            response = response.replace('\\r\\n', '\n').replace('\\n', '\n').strip()
+            self._log.info(response)
+        else:
+            response = ''
+
+        responses = _split_submitted(response, len(futures))
+        if responses is None:
+            # the response cannot be attributed to each command
+            try:
+                self._check_response(response)
+            except Exception as err:
+                for future in futures:
+                    future.set_exception(err)
+                return
+            responses = ['']*(len(futures) - 1) + [response]
+
+        for future, response in zip(futures, responses):
+            try:
+                self._check_response(response)
+            except Exception as err:
+                future.set_exception(err)
+            else:
+                future.set_result(response)
+
+    def run_iter(self, command):
+        """Run a MAPDL command and iterate over the lines of its
+        response as they are streamed from MAPDL.
+
+        Intended for commands with very long responses, such as
+        ``NLIST`` or ``PRNSOL`` over a large model.  Only the line
+        being yielded and at most a few lines of an error message are
+        held in memory.  Errors are raised as soon as their message has
+        been received, after the lines preceding them have been
+        yielded.  The response is neither logged nor stored in
+        ``last_response``.
+
+        Parameters
+        ----------
+        command : str
+            Any valid single line MAPDL command.
+
+        Yields
+        ------
+        str
+            Lines of the response.
+
+        Examples
+        --------
+        Write the nodes of a large model to a file.
+
+        >>> with open('nodes.txt', 'w') as fid:
+        ...     for line in mapdl.run_iter('NLIST,ALL,,,XYZ'):
+        ...         fid.write(line + '\n')
+        """
+        if self._store_commands or command.strip()[:4].upper() == '/LIS':
+            yield from super().run_iter(command)
+            return
+
+        command = self._prepare_command(command)
+        if command is None:
+            return
+        self._check_sendable(command)
+        self._log_command(command)
+
+        self._response = ''
+        request = pb_types.CmdRequest(command=command)
+        stream = self._stub.SendCommandS(request)
+        error = None  # lines of an error message being received
+        try:
+            for line in _stream_lines(stream):
+                if error is not None:
+                    error.append(line)
+                    if not line.strip() or len(error) >= MAX_ERROR_LINES:
+                        self._check_response('\n'.join(error))
+                        error = None
+                elif '*** ERROR ***' in line or 'is not a recognized' in line:
+                    error = [line]
+                yield line
+        except grpc.RpcError:
+            raise MapdlExitedError('MAPDL server connection terminated') from None
+        finally:
+            stream.cancel()  # no effect once the stream completed
+
+        if error is not None:
+            self._check_response('\n'.join(error))
+        self._update_state(command)
+
+    def _check_sendable(self, cmd):
+        """Raise when a command cannot be sent to MAPDL"""
+        if self._exited:
+            raise MapdlExitedError
+
+        # don't allow empty commands
+        if not cmd.strip():
+            raise ValueError('Empty commands not allowed')
+
+        if len(cmd) > 639:  # CMD_MAX_LENGTH
+            raise ValueError('Maximum command length must be less than 640 characters')
 
     @protect_grpc
     def _send_command(self, cmd, mute=False):
@@ -627,6 +1247,8 @@ class MapdlGrpc(_MapdlCore):
         """Call exit(0) on the server."""
         self._ctrl('EXIT')
         self._exited = True
+        for channel in self._get_channels:
+            channel.close()
 
     def _close_process(self):
        """Close all MAPDL processes"""
@@ -796,11 +1418,6 @@ class MapdlGrpc(_MapdlCore):
 
         """
 
-        def _download(targets):
-            for target in targets:
-                save_name = os.path.join(path, target)
-                self.download(target, save_name, progress_bar=progress_bar)
-
         if preference:
             if preference not in ['rst', 'rth']:
                 raise ValueError("``preference`` must be either 'rst' or 'rth'")
@@ -866,7 +1483,7 @@ class MapdlGrpc(_MapdlCore):
                 raise FileNotFoundError('Unable to locate any result file from the '
                                         'following remote result files:\n\n'
                                         + remote_files_str)
-        _download(targets)
+        self.download_files(targets, path, progress_bar=progress_bar)
         return os.path.join(path, jobname + '0.' + preference)
 
     @protect_grpc
@@ -974,6 +1591,16 @@ class MapdlGrpc(_MapdlCore):
         >>> output = mapdl.input('ds.dat', verbose=True)
 
         """
+        # input files may modify anything
+        self._reset_cache()
+        return self._input(fname, verbose, progress_bar, time_step_stream,
+                           chunk_size)
+
+    @protect_grpc
+    def _input(self, fname, verbose=False, progress_bar=False,
+               time_step_stream=None, chunk_size=512):
+        """Run an input file without resetting any cache.  See
+        ``input``."""
         # always check if file is present as the grpc and MAPDL errors
         # are unclear
         if self._local:
@@ -1049,6 +1676,7 @@ class MapdlGrpc(_MapdlCore):
         # otherwise, read remote file
         return self._download_as_raw(tmp_out).decode('latin-1')
 
+    @profiled('command')
     def _flush_stored(self):
         """Writes stored commands to an input file and runs the input
         file.  Used with non_interactive.
@@ -1059,6 +1687,21 @@ class MapdlGrpc(_MapdlCore):
         if self._apdl_log:
             self._apdl_log.write(commands + '\n')
 
+        self._store_commands = False
+        self._stored_commands = []
+
+        # run the stored commands
+        out = self._input_commands(commands)
+        # skip the first line as it simply states that it's reading an input file
+        self._response = out[out.find('LINE=       0') + 13:]
+        self._log.info(self._response)
+
+    def _input_commands(self, commands):
+        """Write commands to a temporary input file and run it.
+
+        The cache is not reset, as the commands have been invalidated
+        individually by ``run``.  Returns the output from MAPDL.
+        """
         self._log.debug('Writing the following commands to a temporary '
                         'apdl input file:\n%s', commands)
 
@@ -1075,40 +1718,46 @@ class MapdlGrpc(_MapdlCore):
         with open(tmp_filename, 'w') as fid:
             fid.writelines(commands)
 
-        self._store_commands = False
-        self._stored_commands = []
-
-        # run the stored commands
-        out = self.input(tmp_filename, write_to_log=False, verbose=False,
-                         chunk_size=DEFAULT_CHUNKSIZE, progress_bar=False)
-        # skip the first line as it simply states that it's reading an input file
-        self._response = out[out.find('LINE=       0') + 13:]
-        self._log.info(self._response)
+        out = self._input(tmp_filename, verbose=False, progress_bar=False,
+                          chunk_size=DEFAULT_CHUNKSIZE)
 
         # try/except here because MAPDL might have not closed the temp file
         try:
             os.remove(tmp_filename)
         except:
             self._log.warning('Unable to remove temporary file %s', tmp_filename)
+        return out
+
+    @contextmanager
+    def _get_stub(self):
+        """Borrow an idle stub for a *GET request.
+
+        Blocks until a stub is available, limiting the number of
+        concurrent requests to the number of channels.  Pending
+        commands are completed first so that the request sees their
+        effects.
+        """
+        if self._submitted or self._lazy_commands:
+            self._synchronize()
+        stub = self._get_stubs.get()
+        try:
+            wrapped = self._stats.wrap(stub) if self._stats.enabled else stub
+            yield self._wrap_stub(wrapped)
+        finally:
+            self._get_stubs.put(stub)
 
     @protect_grpc
     def _get(self, entity, entnum, item1, it1num, item2, it2num):
         """Sends gRPC *Get request.
 
-        WARNING: Not thread SAFE.  Uses _get_lock to ensure multiple
-        request aren't evaluated simultaneously.
+        WARNING: Not thread SAFE on the MAPDL side.  Requests from
+        several threads are sent one at a time unless ``n_channels``
+        is greater than one, in which case up to ``n_channels``
+        requests are sent simultaneously.  This is experimental.
         """
         cmd = f'{entity},{entnum},{item1},{it1num},{item2},{it2num}'
-
-        # not threadsafe; don't allow multiple get commands
-        while self._get_lock:
-            time.sleep(0.001)
-
-        self._get_lock = True
-        try:
-            getresponse = self._stub.Get(pb_types.GetRequest(getcmd=cmd))
-        finally:
-            self._get_lock = False
+        with self._get_stub() as stub:
+            getresponse = stub.Get(pb_types.GetRequest(getcmd=cmd))
 
         if getresponse.type == 0:
             raise ValueError('This is either an invalid get request, or MAPDL is set'
@@ -1122,10 +1771,14 @@ class MapdlGrpc(_MapdlCore):
         raise RuntimeError(f'Unsupported type {getresponse.type} response from MAPDL')
 
     @protect_grpc
-    def download(self, target_name, out_file_name=None,
-                 chunk_size=DEFAULT_CHUNKSIZE, progress_bar=True):
+    def download(self, target_name, out_file_name=None, chunk_size=None,
+                 progress_bar=True, verify=False, max_retries=3):
         """Download a file from the gRPC instance
 
+        The file is first written to ``<out_file_name>.part``.  When
+        the connection drops during the download, the download is
+        restarted.
+
         Parameters
         ----------
         target_name : str
@@ -1138,12 +1791,21 @@ class MapdlGrpc(_MapdlCore):
             ``target_name``.
 
         chunk_size : int, optional
-            Chunk size in bytes.  Must be less than 4MB.  Defaults to 256 kB.
+            Chunk size in bytes.  Must be less than 4MB.  Defaults to
+            a size tuned to the transfer rate of the last download.
 
         progress_bar : bool, optional Display a progress bar using
             ``tqdm`` when ``True``.  Helpful for showing download
             progress.
 
+        verify : bool, optional
+            Compare the MD5 checksum of the downloaded file with the
+            checksum of the remote file.
+
+        max_retries : int, optional
+            Number of times to retry a download after the connection
+            drops.
+
         Examples
         --------
         Download the remote result file "file.rst" as "my_result.rst"
@@ -1152,16 +1814,153 @@ class MapdlGrpc(_MapdlCore):
         """
         if out_file_name is None:
             out_file_name = target_name
+        if chunk_size is None:
+            chunk_size = self._auto_chunk_size()
+
+        self._synchronize()
+        self._download_file(target_name, out_file_name, chunk_size,
+                            progress_bar, max_retries)
+        if verify:
+            self._verify_download(target_name, out_file_name)
+
+    def _download_file(self, target_name, out_file_name, chunk_size,
+                       progress_bar=False, max_retries=3):
+        """Download a file, restarting the download when the connection
+        drops.
+
+        Only streams the file and never runs a command, so several
+        files may be downloaded from separate threads.
+        """
+        part_file = out_file_name + '.part'
+        for attempt in range(max_retries + 1):
+            try:
+                file_size = self._download_chunks(target_name, part_file,
+                                                  chunk_size, progress_bar)
+                break
+            except grpc.RpcError as err:
+                if attempt == max_retries or err.code() not in RETRY_CODES:
+                    if os.path.isfile(part_file):
+                        os.remove(part_file)
+                    raise
+                self._log.warning('Download of %s interrupted. Retrying.',
+                                  target_name)
+                time.sleep(0.5*2**attempt)
+
+        if not file_size:
+            if os.path.isfile(part_file):
+                os.remove(part_file)
+            raise FileNotFoundError(f'File "{target_name}" is empty or does not exist')
+        os.replace(part_file, out_file_name)
 
+    def _download_chunks(self, target_name, filename, chunk_size,
+                         progress_bar=False):
+        """Stream a remote file to a local file and return the number
+        of bytes written."""
         request = pb_types.DownloadFileRequest(name=target_name)
         metadata = [('time_step_stream', '200'), ('chunk_size', str(chunk_size))]
-        chunks = self._stub.DownloadFile(request, metadata=metadata)
-        file_size = save_chunks_to_file(chunks, out_file_name,
+        tstart = time.time()
+        chunks = self._rpc_stub.DownloadFile(request, metadata=metadata)
+        file_size = save_chunks_to_file(chunks, filename,
                                         progress_bar=progress_bar,
                                         target_name=target_name)
 
-        if not file_size:
-            raise FileNotFoundError(f'File "{target_name}" is empty or does not exist')
+        # small transfers are dominated by latency rather than bandwidth
+        elapsed = time.time() - tstart
+        if file_size >= chunk_size and elapsed:
+            self._transfer_rate = file_size/elapsed
+        return file_size
+
+    def _auto_chunk_size(self):
+        """Chunk size taking about ``CHUNK_TRANSFER_TIME`` seconds to
+        transfer at the last measured transfer rate."""
+        if not self._transfer_rate:
+            return DEFAULT_CHUNKSIZE
+        chunk_size = int(self._transfer_rate*CHUNK_TRANSFER_TIME)
+        return min(max(chunk_size, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+    @property
+    def _remote_posix(self):
+        """``True`` when MAPDL is running on a POSIX system"""
+        directory = self.directory
+        return directory is not None and directory.startswith('/')
+
+    def _remote_md5(self, target_name):
+        """MD5 checksum of a remote file or ``None`` when unavailable"""
+        if self._remote_posix:
+            output = self.sys(f"md5sum '{target_name}'").split()
+            checksum = output[0] if output else ''
+        else:
+            lines = self.sys(f'certutil -hashfile "{target_name}" MD5').splitlines()
+            checksum = lines[1].replace(' ', '') if len(lines) > 1 else ''
+
+        checksum = checksum.lower()
+        if re.fullmatch('[0-9a-f]{32}', checksum):
+            return checksum
+
+    def _verify_download(self, target_name, filename):
+        """Raise an ``IOError`` when a downloaded file does not match
+        the remote file."""
+        remote_checksum = self._remote_md5(target_name)
+        if remote_checksum is None:
+            warn(f'Unable to compute the checksum of remote file "{target_name}"')
+        elif remote_checksum != md5sum(filename):
+            raise IOError(f'Checksum of "{filename}" does not match the '
+                          f'remote file "{target_name}"')
+
+    def download_files(self, targets, path=None, max_workers=4,
+                       progress_bar=False, verify=False):
+        """Download several files from the gRPC instance concurrently.
+
+        Parameters
+        ----------
+        targets : list
+            Target files on the server.
+
+        path : str, optional
+            Local directory to save the files to.  Defaults to the
+            current working directory.
+
+        max_workers : int, optional
+            Maximum number of simultaneous downloads.
+
+        progress_bar : bool, optional
+            Display a progress bar for each file using ``tqdm``.
+
+        verify : bool, optional
+            Compare the MD5 checksum of each downloaded file with the
+            checksum of the remote file.
+
+        Returns
+        -------
+        list
+            Paths of the downloaded files.
+
+        Examples
+        --------
+        Download all the distributed result files.
+
+        >>> targets = [f'file{i}.rst' for i in range(4)]
+        >>> mapdl.download_files(targets, '/tmp/results')
+        """
+        if path is None:
+            path = os.getcwd()
+
+        # commands are not thread safe, so everything requiring one is
+        # done before and after the concurrent downloads
+        filenames = [os.path.join(path, target) for target in targets]
+        chunk_size = self._auto_chunk_size()
+        self._synchronize()
+
+        def download(target, filename):
+            self._download_file(target, filename, chunk_size, progress_bar)
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            list(executor.map(download, targets, filenames))
+
+        if verify:
+            for target, filename in zip(targets, filenames):
+                self._verify_download(target, filename)
+        return filenames
 
     @protect_grpc
     def upload(self, file_name, progress_bar=True):
@@ -1189,13 +1988,45 @@ class MapdlGrpc(_MapdlCore):
         if not os.path.isfile(file_name):
             raise FileNotFoundError(f'Unable to locate filename {file_name}')
 
-        chunks_generator = get_file_chunks(file_name, progress_bar=progress_bar)
+        chunk_size = max(self._auto_chunk_size(), DEFAULT_FILE_CHUNK_SIZE)
+        chunks_generator = get_file_chunks(file_name, progress_bar=progress_bar,
+                                           chunk_size=chunk_size)
         response = self._stub.UploadFile(chunks_generator)
 
-        if not response.length:
+        if not response.length or response.length != os.path.getsize(file_name):
             raise IOError('File failed to upload')
         return os.path.basename(file_name)
 
+    def upload_files(self, file_names, max_workers=4, progress_bar=False):
+        """Upload several files to the gRPC instance concurrently.
+
+        Parameters
+        ----------
+        file_names : list
+            Local files to upload.
+
+        max_workers : int, optional
+            Maximum number of simultaneous uploads.
+
+        progress_bar : bool, optional
+            Display a progress bar for each file using ``tqdm``.
+
+        Returns
+        -------
+        list
+            Base names of the uploaded files.
+
+        Examples
+        --------
+        >>> mapdl.upload_files(['model.cdb', 'loads.inp'])
+        ['model.cdb', 'loads.inp']
+        """
+        def upload(file_name):
+            return self.upload(file_name, progress_bar=progress_bar)
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(upload, file_names))
+
     @protect_grpc
     def _get_array(self, entity='', entnum='', item1='', it1num='', item2='',
                    it2num='', kloop='', **kwargs):
@@ -1204,9 +2035,8 @@ class MapdlGrpc(_MapdlCore):
         Send a vget request, receive a bytes stream, and return it as
         a numpy array.
 
-        Not thread safe as it uses a constant internal temporary
-        parameter name.  This method uses _vget_lock to ensure
-        multiple simultaneous request fail.
+        Uses a constant internal temporary parameter name, so
+        simultaneous requests are serialized with ``_vget_lock``.
 
         Returns
         -------
@@ -1216,17 +2046,41 @@ class MapdlGrpc(_MapdlCore):
         if 'parm' in kwargs:
             raise ValueError('Parameter name `parm` not supported with gRPC')
 
-        while self._vget_lock:
-            time.sleep(0.001)
-        self._vget_lock = True
-
         cmd = f'{entity},{entnum},{item1},{it1num},{item2},{it2num},{kloop}'
-        try:
+        with self._vget_lock:
             chunks = self._stub.VGet2(pb_types.GetRequest(getcmd=cmd))
-            values = parse_chunks(chunks)
-        finally:
-            self._vget_lock = False
-        return values
+            return parse_chunks(chunks)
+
+    @protect_grpc
+    def _get_arrays(self, requests):
+        """Several gRPC VGET requests.
+
+        MAPDL stores every VGET in the same temporary parameter, so
+        each response is read entirely before the next request is
+        sent and simultaneous requests are serialized with
+        ``_vget_lock``.
+
+        Parameters
+        ----------
+        requests : list
+            List of ``(entity, entnum, item1, it1num, item2, it2num,
+            kloop)`` tuples.  Trailing fields may be omitted.
+
+        Returns
+        -------
+        list
+            Numpy 1D array for each request.
+        """
+        with self._vget_lock:
+            stub = self._stub
+            arrays = []
+            for request in requests:
+                fields = [str(field) for field in request]
+                fields += [''] * (7 - len(fields))
+                cmd = ','.join(fields)
+                chunks = stub.VGet2(pb_types.GetRequest(getcmd=cmd))
+                arrays.append(parse_chunks(chunks))
+            return arrays
 
     def _screenshot_path(self):
         """Returns the local path of the MAPDL generated screenshot.
@@ -1303,6 +2157,23 @@ class MapdlGrpc(_MapdlCore):
         if presponse.val:
             return float(presponse.val[0])
 
+    @protect_grpc
+    def _scalar_params(self, pnames):
+        """Return several scalar parameters as floats.
+
+        All requests are sent before the first response is read.
+        Parameters that do not exist or are not numeric are ``None``.
+        """
+        stub = self._stub
+        futures = [stub.GetParameter.future(pb_types.ParameterRequest(name=pname,
+                                                                      array=False))
+                   for pname in pnames]
+        values = []
+        for future in futures:
+            presponse = future.result()
+            values.append(float(presponse.val[0]) if presponse.val else None)
+        return values
+
     @protect_grpc
     def _upload_raw(self, raw, save_as):  # consider private
         """Upload a binary string as a file"""
@@ -1473,14 +2344,14 @@ class MapdlGrpc(_MapdlCore):
     def _result_file(self):
         """Path of the non-distributed result file"""
         try:
-            filename = self.inquire('RSTFILE')
+            filename = self._session.inquire('RSTFILE')
             if not filename:
                 filename = self.jobname
         except:
             filename = self.jobname
 
         try:
-            ext = self.inquire('RSTEXT')
+            ext = self._session.inquire('RSTEXT')
         except:  # check if rth file exists
             ext = ''
 
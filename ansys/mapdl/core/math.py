@@ -1140,7 +1140,7 @@ class ApdlMathObj:
     def _data_info(self):
         """Return the data type of a parameter"""
         request = pb_types.ParameterRequest(name=self.id)
-        return self._stub.GetDataInfo(request)
+        return self._mapdl._stub.GetDataInfo(request)
 
 
 class AnsVec(ApdlMathObj):
@@ -2,14 +2,84 @@
 import time
 import weakref
 import os
+import tempfile
+import threading
+
 import numpy as np
 
 from ansys.grpc.mapdl import ansys_kernel_pb2 as anskernel
 from ansys.mapdl.reader.mesh import Mesh
+from ansys.mapdl.reader.archive import write_nblock
 
-from ansys.mapdl.core.misc import threaded, supress_logging
+from ansys.mapdl.core.misc import (threaded, supress_logging, run_as_prep7,
+                                   random_string)
+from ansys.mapdl.core.mapdl import (mesh_effects, parse_to_short_cmd,
+                                   ALL_MESH_EFFECT, DELTA_COMMANDS)
 from ansys.mapdl.core.mapdl_grpc import MapdlGrpc
 from ansys.mapdl.core.common_grpc import parse_chunks, DEFAULT_CHUNKSIZE
+from ansys.mapdl.core.profiler import profiled
+
+# number of element records to format at once when writing an EBLOCK
+EBLOCK_BUFFER = 10000
+
+
+def _lookup(store_num, num):
+    """Return the indices of ``num`` within the sorted array
+    ``store_num`` and a mask of the numbers found."""
+    if not store_num.size:
+        return np.zeros(num.size, np.intp), np.zeros(num.size, bool)
+    ind = np.searchsorted(store_num, num)
+    ind[ind == store_num.size] = 0
+    return ind, store_num[ind] == num
+
+
+def _take_elements(elem, offset, ind):
+    """Gather elements ``ind`` from a contiguous element array.
+
+    Returns the gathered element array and its offset array.
+    """
+    start = offset[:-1][ind]
+    lengths = offset[1:][ind] - start
+    new_offset = np.zeros(len(ind) + 1, np.int32)
+    np.cumsum(lengths, out=new_offset[1:])
+    gather = np.repeat(start - new_offset[:-1], lengths) + np.arange(new_offset[-1])
+    return elem[gather], new_offset
+
+
+def _cat_elements(elem_a, offset_a, elem_b, offset_b):
+    """Concatenate two contiguous element arrays"""
+    offset = np.hstack((offset_a[:-1], offset_b + offset_a[-1])).astype(np.int32)
+    return np.hstack((elem_a, elem_b)), offset
+
+
+def _write_eblock(fid, enum, etype, mat, real, secnum, connectivity):
+    """Write a solid EBLOCK to an open file.
+
+    Each record contains the 11 element fields followed by the element
+    nodes, with at most 8 nodes on the first line and the remaining
+    nodes on a continuation line.
+    """
+    n_elem, n_node = connectivity.shape
+    fid.write(f'EBLOCK,19,SOLID,{enum.max()},{n_elem}\n')
+    fid.write('(19i10)\n')
+
+    elem = np.zeros((n_elem, 11 + n_node), np.int64)
+    elem[:, 0] = mat
+    elem[:, 1] = etype
+    elem[:, 2] = real
+    elem[:, 3] = secnum
+    elem[:, 8] = n_node
+    elem[:, 10] = enum
+    elem[:, 11:] = connectivity
+
+    fmt = '%10d'*min(19, elem.shape[1]) + '\n'
+    if n_node > 8:
+        fmt += '%10d'*(n_node - 8) + '\n'
+
+    for i in range(0, n_elem, EBLOCK_BUFFER):
+        block = elem[i:i + EBLOCK_BUFFER]
+        fid.write((fmt*block.shape[0]) % tuple(block.ravel()))
+    fid.write('%10d\n' % -1)
 
 
 class MeshGrpc(Mesh):
@@ -34,6 +104,14 @@ class MeshGrpc(Mesh):
         self._log = self._mapdl._log
         self._ignore_cache_reset = False
 
+        # every node and element loaded since the mesh was last
+        # modified, sorted by number.  Used to only load entities
+        # missing from the cache after selection changes and additions
+        self._node_store = None  # (nnum, nodes)
+        self._elem_store = None  # (enum, elem, elem_off)
+        self._nnum_lock = threading.Lock()
+        self._command_lock = threading.Lock()
+
     @property
     def _mapdl(self):
         """Return the weakly referenced instance of mapdl"""
@@ -43,30 +121,63 @@ class MeshGrpc(Mesh):
         """Wraps set_log_level"""
         self._mapdl._set_log_level(level)
 
-    def _reset_cache(self):
-        """Reset entire mesh cache"""
-        if not self._ignore_cache_reset:
-            self._cache_nnum = None
-            self._cache_elem = None
-            self._cache_elem_off = None
-            self._cache_element_desc = None
-            self._grid_cache = None
-            self._surf_cache = None
+    def _reset_cache(self, items=ALL_MESH_EFFECT, keep_store=False):
+        """Reset the mesh cache.
+
+        Parameters
+        ----------
+        items : frozenset, optional
+            Cached mesh data to reset.  Any of ``'nodes'``,
+            ``'elements'`` and ``'etypes'``.  Defaults to the entire
+            cache.
+
+        keep_store : bool, optional
+            Keep previously loaded nodes and elements so that only
+            missing entities are loaded.  Only valid when existing
+            nodes and elements have not been modified.
+        """
+        if self._ignore_cache_reset:
+            return
 
+        if 'nodes' in items:
+            self._cache_nnum = None
             self._node_coord = None
-            self._enum = None
-            self._nnum = None
-            self._elem = None
-            self._elem_off = None
-            self._grid = None
             self._node_angles = None
+            if not keep_store:
+                self._node_store = None
+
+        if 'elements' in items:
+            if not keep_store:
+                self._elem_store = None
+            self._cache_elem = None
+            self._cache_elem_off = None
             self._enum = None
             self._rcon = None
             self._mtype = None
             self._etype_cache = None
-            self._etype = None
+
+        if 'etypes' in items:
+            self._cache_element_desc = None
             self._keyopt = None
 
+        # depend on all mesh data
+        self._etype = None
+        self._grid_cache = None
+        self._surf_cache = None
+
+    def _invalidate(self, command):
+        """Reset the cached mesh data a command may modify.
+
+        Commands with an unknown effect reset the entire cache.
+        """
+        effects = mesh_effects(command)
+        if effects is None:
+            self._reset_cache()
+        elif effects:
+            keep_store = parse_to_short_cmd(command) in DELTA_COMMANDS
+            self._reset_cache(effects, keep_store)
+
+    @profiled('cache')
     def _update_cache(self):
         """Threaded local cache update.
 
@@ -78,6 +189,11 @@ class MeshGrpc(Mesh):
             self._mapdl.cm('__NODE__', 'NODE')
             self._mapdl.nsle('S')
 
+        # loading new entities changes the selection and must finish
+        # before the workers stream the selected entities
+        self._load_new_elements()
+        self._load_new_nodes()
+
         threads = [self._update_cache_elem(),
                    self._update_cache_element_desc(),
                    self._update_cache_nnum(),
@@ -177,13 +293,15 @@ class MeshGrpc(Mesh):
         return self._enum
 
     @threaded
+    @profiled('cache')
     def _update_cache_nnum(self):
-        if self._cache_nnum is None:
-            nnum = self._mapdl.get_array('NODE', item1='NLIST')
-            self._cache_nnum = nnum.astype(np.int32)
-        if self._cache_nnum.size == 1:
-            if self._cache_nnum[0] == 0:
-                self._cache_nnum = np.empty(0, np.int32)
+        with self._nnum_lock:
+            if self._cache_nnum is None:
+                nnum = self._mapdl.get_array('NODE', item1='NLIST')
+                self._cache_nnum = nnum.astype(np.int32)
+            if self._cache_nnum.size == 1:
+                if self._cache_nnum[0] == 0:
+                    self._cache_nnum = np.empty(0, np.int32)
 
     @property
     def _nnum(self):
@@ -196,6 +314,7 @@ class MeshGrpc(Mesh):
         self._cache_nnum = value
 
     @threaded
+    @profiled('cache')
     def _update_cache_element_desc(self):
         if self._cache_element_desc is None:
             self._cache_element_desc = self._load_element_types()
@@ -234,9 +353,84 @@ class MeshGrpc(Mesh):
         self._cache_element_desc = value
 
     @threaded
+    @profiled('cache')
     def _update_node_coord(self):
         if self._node_coord is None:
-            self._node_coord = self._load_nodes()
+            self._update_cache_nnum().join()
+            self._node_coord = self._sync_nodes(self._cache_nnum)
+
+    def _load_new_nodes(self):
+        """Add the selected nodes numbered above the node store to it.
+
+        Only these nodes are selected while loading them, so this must
+        run on the calling thread before the cache workers start.
+        """
+        if self._node_coord is not None or self._node_store is None:
+            return
+
+        nnum = self._nnum
+        store_nnum, store_nodes = self._node_store
+        _, found = _lookup(store_nnum, nnum)
+        missing = nnum[~found]
+        if not missing.size or not store_nnum.size or \
+           missing.min() <= store_nnum[-1]:
+            return
+
+        new_nodes = self._load_nodes_range(missing.min(), missing.max())
+        if new_nodes.shape[0] == missing.size:
+            self._log.debug('Loaded %d new nodes', missing.size)
+            self._node_store = (np.hstack((store_nnum, missing)),
+                                np.vstack((store_nodes, new_nodes)))
+
+    def _sync_nodes(self, nnum):
+        """Return the coordinates of nodes ``nnum``.
+
+        Nodes already in the node store are not loaded again.  New
+        nodes are added to the store by ``_load_new_nodes``.
+        """
+        if self._node_store is not None:
+            store_nnum, store_nodes = self._node_store
+            ind, found = _lookup(store_nnum, nnum)
+            if found.all():
+                return store_nodes[ind]
+
+        nodes = self._load_nodes()
+        if nodes.shape[0] != nnum.size:  # pragma: no cover
+            self._node_store = None
+            return nodes
+
+        # merge with the store, replacing existing nodes
+        if self._node_store is None:
+            self._node_store = (nnum, nodes)
+        else:
+            store_nnum, store_nodes = self._node_store
+            _, found = _lookup(nnum, store_nnum)
+            all_nnum = np.hstack((nnum, store_nnum[~found]))
+            order = np.argsort(all_nnum)
+            self._node_store = (all_nnum[order],
+                                np.vstack((nodes, store_nodes[~found]))[order])
+        return nodes
+
+    def _load_nodes_range(self, start, stop):
+        """Load the selected nodes numbered from ``start`` to ``stop``"""
+        with self._command_lock:
+            self._ignore_cache_reset = True
+            try:
+                self._run_internal('CM,__DELTA_NODE__,NODE')
+                try:
+                    self._run_internal(f'NSEL,R,NODE,,{start},{stop}')
+                    nodes = self._load_nodes()
+                finally:
+                    self._run_internal('CMSEL,S,__DELTA_NODE__,NODE')
+                    self._run_internal('CMDELE,__DELTA_NODE__')
+            finally:
+                self._ignore_cache_reset = False
+        return nodes
+
+    def _run_internal(self, command):
+        """Run a command used only to load the mesh, without writing
+        it to the APDL log"""
+        self._mapdl.run(command, write_to_log=False, mute=True)
 
     @property
     def nodes(self) -> np.ndarray:
@@ -253,12 +447,14 @@ class MeshGrpc(Mesh):
                [0.75 0.5  4.  ]
                [0.75 0.5  4.5 ]]
         """
+        self._load_new_nodes()
         self._update_node_coord().join()
         if self._node_coord is None:
             return np.empty(0)
         return self._node_coord
 
-    def _load_nodes(self, chunk_size=DEFAULT_CHUNKSIZE):
+    @profiled('transfer')
+    def _load_nodes(self, chunk_size=DEFAULT_CHUNKSIZE, out=None):
         """Loads nodes from server.
 
         Parameters
@@ -267,6 +463,11 @@ class MeshGrpc(Mesh):
             Size of the chunks to request from the server.  Default
             256 kB
 
+        out : np.ndarray, optional
+            Contiguous double array (for example a ``np.memmap``) to
+            write the nodes into.  Must contain at least three values
+            per selected node.
+
         Returns
         -------
         nodes : np.ndarray
@@ -277,14 +478,96 @@ class MeshGrpc(Mesh):
 
         request = anskernel.StreamRequest(chunk_size=chunk_size)
         chunks = self._mapdl._stub.Nodes(request)
-        nodes = parse_chunks(chunks, np.double).reshape(-1, 3)
+        nodes = parse_chunks(chunks, np.double, out=out).reshape(-1, 3)
         return nodes
 
     @threaded
+    @profiled('cache')
     def _update_cache_elem(self):
         """Update the element and element offset cache"""
         if self._cache_elem is None:
-            self._cache_elem, self._cache_elem_off = self._load_elements_offset()
+            self._cache_elem, self._cache_elem_off = self._sync_elements()
+
+    def _selected_enum(self):
+        """Element numbers of the selected elements, empty when no
+        elements are selected"""
+        enum = self.enum
+        if enum.size == 1 and enum[0] == 0:
+            return np.empty(0, np.int32)
+        return enum
+
+    def _load_new_elements(self):
+        """Add the selected elements numbered above the element store
+        to it.
+
+        Only these elements are selected while loading them, so this
+        must run on the calling thread before the cache workers start.
+        """
+        if self._cache_elem is not None or self._elem_store is None:
+            return
+
+        enum = self._selected_enum()
+        store_enum, store_elem, store_off = self._elem_store
+        _, found = _lookup(store_enum, enum)
+        missing = enum[~found]
+        if not missing.size or not store_enum.size or \
+           missing.min() <= store_enum[-1]:
+            return
+
+        elem, elem_off = self._load_elements_range(missing.min(), missing.max())
+        if elem_off.size - 1 == missing.size:
+            self._log.debug('Loaded %d new elements', missing.size)
+            self._elem_store = (np.hstack((store_enum, missing)),
+                                *_cat_elements(store_elem, store_off,
+                                               elem, elem_off))
+
+    def _sync_elements(self):
+        """Return the element and element offset arrays of the
+        selected elements.
+
+        Elements already in the element store are not loaded again.
+        New elements are added to the store by ``_load_new_elements``.
+        """
+        if self._elem_store is not None:
+            store_enum, store_elem, store_off = self._elem_store
+            ind, found = _lookup(store_enum, self._selected_enum())
+            if found.all():
+                return _take_elements(store_elem, store_off, ind)
+
+        elem, elem_off = self._load_elements_offset()
+        enum = elem[elem_off[:-1] + 8]
+
+        # merge with the store, replacing existing elements
+        if self._elem_store is None:
+            order = np.argsort(enum)
+            self._elem_store = (enum[order],
+                                *_take_elements(elem, elem_off, order))
+        else:
+            store_enum, store_elem, store_off = self._elem_store
+            _, found = _lookup(enum, store_enum)
+            kept = _take_elements(store_elem, store_off, np.nonzero(~found)[0])
+            all_enum = np.hstack((enum, store_enum[~found]))
+            all_elem, all_off = _cat_elements(elem, elem_off, *kept)
+            order = np.argsort(all_enum)
+            self._elem_store = (all_enum[order],
+                                *_take_elements(all_elem, all_off, order))
+        return elem, elem_off
+
+    def _load_elements_range(self, start, stop):
+        """Load the selected elements numbered from ``start`` to ``stop``"""
+        with self._command_lock:
+            self._ignore_cache_reset = True
+            try:
+                self._run_internal('CM,__DELTA_ELEM__,ELEM')
+                try:
+                    self._run_internal(f'ESEL,R,ELEM,,{start},{stop}')
+                    elem = self._load_elements_offset()
+                finally:
+                    self._run_internal('CMSEL,S,__DELTA_ELEM__,ELEM')
+                    self._run_internal('CMDELE,__DELTA_ELEM__')
+            finally:
+                self._ignore_cache_reset = False
+        return elem
 
     @property
     def _elem(self):
@@ -294,6 +577,7 @@ class MeshGrpc(Mesh):
         in offset.  Each element contains 10 items plus the nodes
         belonging to the element.
         """
+        self._load_new_elements()
         self._update_cache_elem().join()
         return self._cache_elem
 
@@ -304,6 +588,7 @@ class MeshGrpc(Mesh):
     @property
     def _elem_off(self):
         """Element offset array"""
+        self._load_new_elements()
         self._update_cache_elem().join()
         return self._cache_elem_off
 
@@ -311,6 +596,7 @@ class MeshGrpc(Mesh):
     def _elem_off(self, value):
         self._cache_elem_off = value
 
+    @profiled('transfer')
     def _load_elements_offset(self, chunk_size=DEFAULT_CHUNKSIZE):
         """Loads elements from server
 
@@ -360,6 +646,7 @@ class MeshGrpc(Mesh):
         offset = np.hstack((elem_off_raw - n_elem, lst_value))
         return elem_raw[n_elem:], offset
 
+    @profiled('transfer')
     def _load_element_types(self, chunk_size=DEFAULT_CHUNKSIZE):
         """Loads element types from the MAPDL server.
 
@@ -382,6 +669,135 @@ class MeshGrpc(Mesh):
         split_ind = split_ind[split_ind != 0]
         return np.split(data, split_ind)[1:]
 
+    def _input_block(self, write_func):
+        """Write a block to a temporary input file and read it into MAPDL."""
+        filename = os.path.join(tempfile.gettempdir(),
+                                f'tmp_{random_string()}.cdb')
+        try:
+            write_func(filename)
+            response = self._mapdl.input(filename, write_to_log=False,
+                                         progress_bar=False)
+        finally:
+            try:
+                os.remove(filename)
+            except OSError:
+                self._log.warning('Unable to remove temporary file %s', filename)
+
+        self._mapdl._reset_cache()
+        self._mapdl._check_response(response)
+        return response
+
+    @run_as_prep7
+    def add_nodes(self, nnum, xyz):
+        """Add many nodes to MAPDL in a single transfer.
+
+        Nodes are written to an ``NBLOCK`` which is read by MAPDL in
+        one request rather than sending an ``N`` command for each
+        node.  Existing nodes with the same numbers are redefined.
+
+        Parameters
+        ----------
+        nnum : np.ndarray
+            Node numbers.
+
+        xyz : np.ndarray
+            ``(n, 3)`` array of node coordinates.
+
+        Examples
+        --------
+        Add a line of 1000 nodes.
+
+        >>> import numpy as np
+        >>> nnum = np.arange(1, 1001)
+        >>> xyz = np.zeros((1000, 3))
+        >>> xyz[:, 0] = np.linspace(0, 1, 1000)
+        >>> mapdl.mesh.add_nodes(nnum, xyz)
+        """
+        nnum = np.asarray(nnum)
+        xyz = np.asarray(xyz, np.double)
+        if xyz.ndim != 2 or xyz.shape[1] != 3:
+            raise ValueError('``xyz`` must be a (n, 3) array of node coordinates')
+        if nnum.ndim != 1 or nnum.size != xyz.shape[0]:
+            raise ValueError('``nnum`` must contain one node number for each node')
+        if not nnum.size:
+            return
+        if nnum.min() < 1:
+            raise ValueError('Node numbers must be greater than 0')
+
+        self._input_block(lambda filename: write_nblock(filename, nnum, xyz))
+
+    @run_as_prep7
+    def add_elements(self, etype, connectivity, enum=None, mat=1, real=1,
+                     secnum=1):
+        """Add many elements to MAPDL in a single transfer.
+
+        Elements are written to an ``EBLOCK`` which is read by MAPDL
+        in one request rather than sending an ``E`` command for each
+        element.  Nodes must exist prior to adding elements.
+
+        Parameters
+        ----------
+        etype : int
+            Element type reference number as defined with ``ET``.
+
+        connectivity : np.ndarray
+            ``(n_elem, n_node)`` array of node numbers for each
+            element following the node ordering of the element type.
+            Use 0 for omitted midside nodes.
+
+        enum : np.ndarray, optional
+            Element numbers.  Defaults to numbering the elements
+            after the highest element number currently defined.
+
+        mat : int or np.ndarray, optional
+            Material reference number for all or each element.
+
+        real : int or np.ndarray, optional
+            Real constant reference number for all or each element.
+
+        secnum : int or np.ndarray, optional
+            Section number for all or each element.
+
+        Returns
+        -------
+        np.ndarray
+            Element numbers of the added elements.
+
+        Examples
+        --------
+        Add two ``SOLID185`` hexahedral elements.
+
+        >>> mapdl.et(1, 'SOLID185')
+        >>> conn = [[1, 2, 3, 4, 5, 6, 7, 8],
+        ...         [5, 6, 7, 8, 9, 10, 11, 12]]
+        >>> mapdl.mesh.add_elements(1, conn)
+        array([1, 2])
+        """
+        connectivity = np.asarray(connectivity)
+        if connectivity.ndim != 2:
+            raise ValueError('``connectivity`` must be a (n_elem, n_node) array')
+        n_elem, n_node = connectivity.shape
+        if not 1 <= n_node <= 20:
+            raise ValueError('Elements must contain between 1 and 20 nodes')
+
+        if enum is None:
+            max_enum = int(self._mapdl.get_value('ELEM', 0, 'NUM', 'MAXD'))
+            enum = np.arange(max_enum + 1, max_enum + 1 + n_elem)
+        else:
+            enum = np.asarray(enum)
+            if enum.ndim != 1 or enum.size != n_elem:
+                raise ValueError('``enum`` must contain one element number '
+                                 'for each element')
+        if not n_elem:
+            return enum
+
+        def write_func(filename):
+            with open(filename, 'w') as fid:
+                _write_eblock(fid, enum, etype, mat, real, secnum, connectivity)
+
+        self._input_block(write_func)
+        return enum
+
     @property
     def grid(self):
         """VTK representation of the underlying finite element mesh.
@@ -435,6 +851,10 @@ class MeshGrpc(Mesh):
             self._grid_cache = self._parse_vtk(force_linear=True)
         return self._grid_cache
 
+    @profiled('client')
+    def _parse_vtk(self, *args, **kwargs):
+        return super()._parse_vtk(*args, **kwargs)
+
     @_grid.setter
     def _grid(self, value):
         self._grid_cache = value
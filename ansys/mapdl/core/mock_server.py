@@ -0,0 +1,727 @@
+"""Lightweight stand-in for the MAPDL gRPC server.
+
+Serves a synthetic hexahedral mesh, synthetic nodal and element
+results and canned command responses over the same gRPC interface as
+MAPDL.  Intended for benchmarking and testing the client stack
+without a licensed MAPDL installation.
+
+Examples
+--------
+>>> from ansys.mapdl.core.mock_server import launch_mock_server
+>>> from ansys.mapdl.core import Mapdl
+>>> server, servicer, port = launch_mock_server(shape=(20, 20, 20))
+>>> mapdl = Mapdl(port=port)
+>>> mapdl.mesh.n_node
+9261
+>>> server.stop(None)
+"""
+import ast
+from concurrent import futures
+import operator
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+
+import grpc
+import numpy as np
+from ansys.grpc.mapdl import mapdl_pb2 as pb_types
+from ansys.grpc.mapdl import mapdl_pb2_grpc as mapdl_grpc
+from ansys.grpc.mapdl import ansys_kernel_pb2 as anskernel
+
+from ansys.mapdl.core.common_grpc import (ANSYS_VALUE_TYPE, DEFAULT_CHUNKSIZE,
+                                          DEFAULT_FILE_CHUNK_SIZE)
+from ansys.mapdl.core.mapdl import parse_to_short_cmd
+
+NP_VALUE_TYPE = {np.dtype(value): key for key, value in ANSYS_VALUE_TYPE.items()
+                 if value is not None}
+
+# routine number of each routine command for *GET, ACTIVE, 0, ROUT
+ROUTINES = {'/PRE': 17, '/SOL': 21, '/POS': 31, 'FINI': 0}
+
+# unit system number of each /UNITS label
+UNITS = {'SI': 1, 'CGS': 2, 'BFT': 3, 'BIN': 4, 'MKS': 5, 'MPA': 6}
+
+# number of characters in each chunk of a streamed command response
+CMDOUT_CHUNK_SIZE = 16384
+
+# number of integers describing each element type
+ETYPE_DESC_SIZE = 200
+
+# arithmetic operators allowed in APDL expressions
+BINARY_OPERATORS = {ast.Add: operator.add, ast.Sub: operator.sub,
+                    ast.Mult: operator.mul, ast.Div: operator.truediv,
+                    ast.Pow: operator.pow}
+UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+def hex_mesh(shape):
+    """Structured hexahedral mesh of a unit cube.
+
+    Parameters
+    ----------
+    shape : tuple
+        Number of elements in the x, y and z direction.
+
+    Returns
+    -------
+    nodes : np.ndarray
+        ``(n, 3)`` array of node coordinates.
+
+    elem : np.ndarray
+        Elements in the MAPDL raw format.  Each element is described
+        by 10 fields followed by its 8 nodes.
+    """
+    nx, ny, nz = shape
+    x, y, z = np.meshgrid(np.linspace(0, 1, nx + 1), np.linspace(0, 1, ny + 1),
+                          np.linspace(0, 1, nz + 1), indexing='ij')
+    nodes = np.vstack((x.ravel(order='F'), y.ravel(order='F'),
+                       z.ravel(order='F'))).T
+
+    i, j, k = np.meshgrid(np.arange(nx), np.arange(ny), np.arange(nz),
+                          indexing='ij')
+    i, j, k = i.ravel(order='F'), j.ravel(order='F'), k.ravel(order='F')
+
+    def nnum(di, dj, dk):
+        return (i + di) + (j + dj)*(nx + 1) + (k + dk)*(nx + 1)*(ny + 1) + 1
+
+    n_elem = i.size
+    elem = np.empty((n_elem, 18), np.int32)
+    elem[:, :4] = 1  # mat, type, real, secnum
+    elem[:, 4:10] = 0  # esys, death, solidm, shape, elnum, baseeid
+    elem[:, 8] = np.arange(1, n_elem + 1)
+    corners = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+               (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+    for col, corner in enumerate(corners):
+        elem[:, 10 + col] = nnum(*corner)
+
+    return nodes, elem.ravel()
+
+
+def _synthetic(item, num):
+    """Deterministic synthetic result values of an item"""
+    freq = 1 + zlib.crc32(item.encode()) % 97
+    return np.sin(num*freq*1E-3)
+
+
+def _chunks(raw, chunk_size, value_type=5, delay=None):
+    """Serialize raw bytes into chunks.
+
+    The first chunk advertises the size of the entire record.
+    """
+    chunk_size = max(int(chunk_size), 1)
+    first = True
+    for i in range(0, max(len(raw), 1), chunk_size):
+        payload = raw[i:i + chunk_size]
+        if delay is not None:
+            delay(len(payload))
+        yield anskernel.Chunk(payload=payload, value_type=value_type,
+                              size=len(raw) if first else len(payload))
+        first = False
+
+
+class MockMapdlServicer(mapdl_grpc.MapdlServiceServicer):
+    """Stand-in MAPDL gRPC servicer.
+
+    Parameters
+    ----------
+    shape : tuple, optional
+        Number of hexahedral elements in the x, y and z direction of
+        the synthetic mesh.
+
+    latency : float, optional
+        Time in seconds added to every request.
+
+    bandwidth : float, optional
+        Bytes per second of streamed responses.  Unlimited by default.
+
+    directory : str, optional
+        Working directory of the server.  Defaults to a new temporary
+        directory.
+
+    responses : dict, optional
+        Canned command responses keyed by the short command, for
+        example ``'NSEL'``.  Values may be strings or callables that
+        take the command and return the response.
+
+    Attributes
+    ----------
+    commands : list
+        Every command received by the server.
+
+    interrupted_downloads : int
+        Number of the next file downloads to interrupt after their
+        first chunk, as if the connection dropped.
+    """
+
+    def __init__(self, shape=(10, 10, 10), latency=0, bandwidth=None,
+                 directory=None, responses=None):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix='mock_mapdl_')
+        self.directory = directory
+        self.jobname = 'file'
+        self.responses = {} if responses is None else dict(responses)
+        self.commands = []
+        self.interrupted_downloads = 0
+        self.parameters = {}
+        self.routine = 0
+        self.csys = 0
+        self.units = -1
+        self.math = {}  # APDLMath vectors and dense matrices
+        self.etables = {}
+        self._lock = threading.Lock()
+        self.set_mesh(*hex_mesh(shape))
+
+        # treated as a local instance when this file exists
+        open(os.path.join(directory, self.jobname + '.err'), 'a').close()
+
+    def set_mesh(self, nodes, elem):
+        """Serve a different mesh.
+
+        Parameters
+        ----------
+        nodes : np.ndarray
+            ``(n, 3)`` array of the coordinates of nodes ``1`` to ``n``.
+
+        elem : np.ndarray
+            Raw elements, each with 10 fields and 8 nodes.
+        """
+        self.nodes = np.asarray(nodes, np.float64)
+        self.elem = np.asarray(elem, np.int32)
+        self.nnum = np.arange(1, self.nodes.shape[0] + 1, dtype=np.int32)
+        self.enum = self.elem[8::18].copy()
+
+    def _wait(self, nbytes):
+        """Simulate the bandwidth of the connection"""
+        if self.bandwidth:
+            time.sleep(nbytes/self.bandwidth)
+
+    def _delay(self):
+        """Simulate the latency of the connection"""
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _stream(self, array, chunk_size, context=None):
+        array = np.ascontiguousarray(array)
+        value_type = NP_VALUE_TYPE.get(array.dtype, 0)
+        chunk_size = self._metadata_chunk_size(context, chunk_size)
+        return _chunks(array.tobytes(), chunk_size, value_type, self._wait)
+
+    @staticmethod
+    def _request_chunk_size(request):
+        # streamed mesh requests are declared with an empty request
+        return getattr(request, 'chunk_size', 0) or DEFAULT_CHUNKSIZE
+
+    @staticmethod
+    def _metadata_chunk_size(context, default):
+        if context is not None:
+            for key, value in context.invocation_metadata():
+                if key == 'chunk_size':
+                    return int(value)
+        return default or DEFAULT_CHUNKSIZE
+
+    # commands
+    def run(self, command):
+        """Evaluate a single command and return its response"""
+        command = command.strip()
+        with self._lock:
+            self.commands.append(command)
+
+        short = parse_to_short_cmd(command)
+        if short in ROUTINES:
+            self.routine = ROUTINES[short]
+
+        if short in self.responses:
+            response = self.responses[short]
+            return response(command) if callable(response) else response
+
+        if short == '*USE':
+            return self.use(command)
+
+        if short in ('*DIM', '*DMA', '*EXP', '*FRE'):
+            return self.run_array(command)
+
+        if short == '*SET':
+            fields = command.split(',') + ['', '']
+            command = f'{fields[1]}={fields[2]}'
+            if not fields[2].strip():
+                self.parameters.pop(fields[1].strip().upper(), None)
+                return ''
+
+        if short == '*STA':
+            return self.status()
+
+        if short == '/COM':
+            return (command.split(',', 1) + [''])[1]
+
+        if short == 'ETAB':
+            return self.etable(command)
+
+        if '=' in command and ',' not in command.split('=')[0]:
+            name, value = command.split('=', 1)
+            try:
+                self.parameters[name.strip().upper()] = float(value)
+            except ValueError:
+                self.parameters[name.strip().upper()] = value.strip().strip("'")
+            return ''
+
+        if short == '*GET':
+            fields = command.split(',')
+            par = fields[1].strip().upper()
+            value = self.get(','.join(fields[2:]))
+            self.parameters[par] = value
+            return f' *GET  {par}  FROM  {fields[2].strip().upper()}  VALUE= {value}'
+
+        if short == '/INQ':
+            func = command.split(',')[-1].strip().upper()
+            value = {'DIRECTORY': self.directory,
+                     'JOBNAME': self.jobname,
+                     'RSTFILE': self.jobname,
+                     'RSTEXT': 'rst'}.get(func, '')
+            return f'{func} = {value}'
+
+        if short in ('/FIL', '/CWD', 'CSYS', '/UNI'):
+            value = (command.split(',') + [''])[1].strip()
+            if short == '/FIL':
+                self.jobname = value or 'file'
+            elif short == '/CWD':
+                self.directory = value
+            elif short == 'CSYS':
+                self.csys = int(value or 0)
+            else:
+                self.units = UNITS.get(value.upper(), 0)
+
+        return ''
+
+    def status(self):
+        """``*STATUS`` listing of all parameters"""
+        lines = ['PARAMETER STATUS-', '',
+                 f'{"NAME":<34s}{"VALUE":<29s}{"TYPE  DIMENSIONS":<16s}']
+        for name, value in sorted(self.parameters.items()):
+            if name.startswith('_'):
+                continue
+            if isinstance(value, np.ndarray):
+                shape = value.shape + (1,)*(3 - value.ndim)
+                lines.append(f'{name:<34s}{"":<29s}ARRAY '
+                             + ' '.join(str(dim) for dim in shape))
+            elif isinstance(value, str):
+                lines.append(f'{name:<34s}{value:<29s}CHARACTER')
+            else:
+                lines.append(f'{name:<34s}{value:<29.12G}SCALAR')
+        return '\n'.join(lines)
+
+    def etable(self, command):
+        """Evaluate ``ETABLE``, storing synthetic element values"""
+        fields = [field.strip().upper() for field in command.split(',')]
+        fields += [''] * (4 - len(fields))
+        lab, item, comp = fields[1:4]
+        if item == 'ERAS':
+            self.etables.pop(lab, None)
+            return f' ERASE TABLE ITEM {lab}'
+        if lab == 'ERAS':
+            self.etables.clear()
+            return ' ERASE ALL ELEMENT TABLE ITEMS'
+        self.etables[lab] = _synthetic(f'{item},{comp}', self.enum)
+        return (f' STORE {lab:<8s} FROM ITEM={item:<4s} COMP={comp:<4s} '
+                'FOR ALL SELECTED ELEMENTS')
+
+    def run_array(self, command):
+        """Evaluate ``*DIM`` and the APDLMath commands copying array
+        parameters"""
+        fields = [field.strip().upper() for field in command.split(',')]
+        short = fields[0][:4]
+        if short == '*DIM':
+            shape = [int(field) if field else 1 for field in fields[3:5]]
+            shape += [1]*(2 - len(shape))
+            self.parameters[fields[1]] = np.zeros(shape)
+        elif short == '*DMA' and fields[3:5] == ['IMPORT', 'APDL']:
+            self.math[fields[1]] = np.array(self.parameters[fields[5]], np.float64)
+        elif short == '*EXP' and fields[2] == 'APDL':
+            array = self.parameters[fields[3]]
+            array[...] = self.math[fields[1]].reshape(array.shape, order='F')
+        elif short == '*FRE':
+            if fields[1] == 'ALL':
+                self.math.clear()
+            else:
+                self.math.pop(fields[1], None)
+        return ''
+
+    def run_lines(self, lines):
+        """Evaluate lines of an input file, including ``/OUT`` and
+        ``/INP``."""
+        output = []
+        out_file = None
+        macro = None  # lines of the macro file written by *CREATE
+        for line in lines:
+            short = parse_to_short_cmd(line.strip())
+            if macro is not None:
+                if line.split(',')[0].strip().upper() == '*END':
+                    with open(os.path.join(self.directory, macro[0]), 'w') as fid:
+                        fid.write('\n'.join(macro[1:]))
+                    macro = None
+                else:
+                    macro.append(line)
+                continue
+            if short == '*CRE':
+                fields = [field.strip() for field in line.split(',')] + ['']
+                macro = ['.'.join(filter(None, fields[1:3]))]
+                continue
+            if short == '/OUT':
+                fname = line.split(',')[1].strip() if ',' in line else ''
+                out_file = os.path.join(self.directory, fname) if fname else None
+                if out_file:
+                    open(out_file, 'w').close()
+                continue
+            if short == '/INP':
+                fname = line.split(',')[1].strip().strip("'")
+                with open(os.path.join(self.directory, fname)) as fid:
+                    response = self.run_lines(fid.read().splitlines())
+            else:
+                response = self.run(line)
+
+            if out_file:
+                with open(out_file, 'a') as fid:
+                    fid.write(response + '\n')
+            else:
+                output.append(response)
+        return '\n'.join(output)
+
+    def evaluate(self, expr):
+        """Value of an arithmetic APDL expression.
+
+        Only numbers, scalar parameters, array parameter items,
+        ``ABS`` and arithmetic operators are supported.  The
+        expression is parsed rather than run, as it is received from
+        any client.
+        """
+        tree = ast.parse(expr.strip().upper(), mode='eval')
+        return float(self._evaluate_node(tree.body))
+
+    def _evaluate_node(self, node):
+        """Value of a node of a parsed APDL expression"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            return BINARY_OPERATORS[type(node.op)](self._evaluate_node(node.left),
+                                                   self._evaluate_node(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            return UNARY_OPERATORS[type(node.op)](self._evaluate_node(node.operand))
+        if isinstance(node, ast.Name):
+            value = self.parameters[node.id]
+            if isinstance(value, (str, np.ndarray)):
+                raise ValueError(f'"{node.id}" is not a scalar parameter')
+            return value
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+           and not node.keywords:
+            args = [self._evaluate_node(arg) for arg in node.args]
+            if node.func.id == 'ABS' and len(args) == 1:
+                return abs(args[0])
+            value = self.parameters[node.func.id]
+            if not isinstance(value, np.ndarray):
+                raise ValueError(f'"{node.func.id}" is not an array parameter')
+            index = tuple(int(i) - 1 for i in args)
+            return value[index + (0,)*(value.ndim - len(index))]
+        raise ValueError('Unsupported expression')
+
+    def substitute(self, command):
+        """Command with the expressions in its fields evaluated"""
+        # commas within parentheses separate array indices
+        fields = re.split(r',(?![^(]*\))', command)
+        for i, field in enumerate(fields[1:], 1):
+            try:
+                fields[i] = repr(self.evaluate(field)) if field.strip() else field
+            except Exception:  # labels such as ``ALL``
+                pass
+        return ','.join(fields)
+
+    def use(self, command):
+        """Run a macro file with ``*USE``, supporting ``*DO`` loops"""
+        fields = [field.strip() for field in command.split(',')]
+        filename = os.path.join(self.directory, fields[1])
+        if not os.path.isfile(filename):
+            return ''
+        with open(filename) as fid:
+            lines = fid.read().splitlines()
+        for i, value in enumerate(fields[2:], 1):
+            self.parameters[f'ARG{i}' if i < 10 else f'AR{i}'] = float(value)
+        return self.run_macro(lines)
+
+    def run_macro(self, lines):
+        """Run the lines of a macro"""
+        output = []
+        i = 0
+        while i < len(lines):
+            line = lines[i].strip()
+            if not line.upper().startswith('*DO,'):
+                if line.startswith('*') or '=' in line:
+                    output.append(self.run(line))
+                else:
+                    output.append(self.run(self.substitute(line)))
+                i += 1
+                continue
+
+            # run the loop body until the matching *ENDDO
+            depth, end = 1, i + 1
+            while depth:
+                depth += lines[end].strip().upper().startswith('*DO,')
+                depth -= lines[end].strip().upper().startswith('*ENDDO')
+                end += 1
+            fields = line.split(',')
+            start, stop = (int(self.evaluate(field)) for field in fields[2:4])
+            for value in range(start, stop + 1):
+                self.parameters[fields[1].strip().upper()] = float(value)
+                output.append(self.run_macro(lines[i + 1:end - 1]))
+            i = end
+        return '\n'.join(output)
+
+    def SendCommand(self, request, context):
+        self._delay()
+        response = '\n'.join(self.run(command)
+                             for command in request.command.split('$'))
+        return pb_types.CmdResponse(response=response)
+
+    def SendCommandS(self, request, context):
+        self._delay()
+        response = self.run(request.command)
+        # chunks deliberately split lines as MAPDL does
+        for i in range(0, len(response), CMDOUT_CHUNK_SIZE):
+            yield pb_types.CmdOutput(cmdout=[response[i:i + CMDOUT_CHUNK_SIZE]])
+
+    def InputFileS(self, request, context):
+        self._delay()
+        with open(os.path.join(self.directory, request.filename)) as fid:
+            response = self.run_lines(fid.read().splitlines())
+        yield pb_types.CmdOutput(cmdout=response.splitlines())
+
+    def Ctrl(self, request, context):
+        self._delay()
+        if request.ctrl.upper() == 'VERSION':
+            return anskernel.CtrlResponse(response='0.4.0')
+        return anskernel.CtrlResponse()
+
+    # *GET and *VGET
+    def get(self, getcmd):
+        """Evaluate a *GET request and return its value"""
+        fields = [field.strip().upper() for field in getcmd.split(',')]
+        fields += [''] * (6 - len(fields))
+        entity, entnum, item1, it1num = fields[:4]
+
+        if entity in ['NODE', 'ELEM']:
+            num = self.nnum if entity == 'NODE' else self.enum
+            if item1 == 'COUNT':
+                return num.size
+            if item1 == 'NUM' and it1num in ['MAX', 'MAXD']:
+                return num.max() if num.size else 0
+            if item1 == 'NUM' and it1num in ['MIN', 'MIND']:
+                return num.min() if num.size else 0
+            if entity == 'NODE' and item1 == 'LOC':
+                return self.nodes[int(float(entnum)) - 1, 'XYZ'.index(it1num)]
+        elif entity == 'ETYP' and item1 == 'NUM':
+            return 1
+        elif entity == 'ETAB':
+            if item1 == 'NCOL':
+                return len(self.etables)
+            if item1 == 'LAB':
+                return list(self.etables)[int(float(entnum)) - 1]
+        elif entity == 'ACTIVE':
+            if item1 == 'ROUT':
+                return self.routine
+            if item1 == 'CSYS':
+                return self.csys
+            if item1 == 'UNITS':
+                return self.units
+            if item1 == 'SET':
+                return 1
+        elif entity == 'PARM':
+            if item1 == 'DIM':
+                return self.parameters[entnum].shape['XYZ'.index(it1num)]
+            return self.parameters.get(entnum, 0)
+        return 0
+
+    def Get(self, request, context):
+        self._delay()
+        value = self.get(request.getcmd)
+        if isinstance(value, str):
+            return pb_types.GetResponse(type=2, sval=value)
+        return pb_types.GetResponse(type=1, dval=float(value))
+
+    def vget(self, getcmd):
+        """Evaluate a *VGET request and return the array"""
+        fields = [field.strip().upper() for field in getcmd.split(',')]
+        fields += [''] * (7 - len(fields))
+        entity, _, item1, it1num = fields[:4]
+
+        if entity == 'NODE':
+            num = self.nnum
+            if item1 == 'NLIST':
+                return num.astype(np.float64)
+        elif entity == 'ELEM':
+            num = self.enum
+            if item1 == 'ELIST':
+                return num.astype(np.float64)
+        else:
+            return np.zeros(1)
+
+        if item1 in ['NSEL', 'ESEL']:
+            return np.ones(num.size)
+        if item1 == 'ETAB':
+            return self.etables.get(it1num, np.zeros(num.size))
+        return _synthetic(f'{item1},{it1num}', num)
+
+    def VGet2(self, request, context):
+        self._delay()
+        return self._stream(self.vget(request.getcmd), DEFAULT_CHUNKSIZE)
+
+    def GetParameter(self, request, context):
+        self._delay()
+        value = self.parameters.get(request.name.upper(), 0)
+        if isinstance(value, str):
+            return pb_types.ParameterResponse(sval=value, type=2)
+        if isinstance(value, np.ndarray):
+            return pb_types.ParameterResponse(val=value.ravel(order='F'), type=1)
+        return pb_types.ParameterResponse(val=[value], type=1)
+
+    # mesh
+    def Nodes(self, request, context):
+        self._delay()
+        return self._stream(self.nodes, self._request_chunk_size(request))
+
+    def LoadElements(self, request, context):
+        self._delay()
+        n_elem = self.enum.size
+        offset = n_elem + np.arange(n_elem, dtype=np.int32)*18
+        return self._stream(np.hstack((offset, self.elem)).astype(np.int32),
+                            self._request_chunk_size(request))
+
+    def LoadElementTypeDescription(self, request, context):
+        self._delay()
+        desc = np.zeros(ETYPE_DESC_SIZE, np.int32)
+        desc[:2] = [1, 185]  # type number and element routine
+        data = np.hstack(([1, 2], desc)).astype(np.int32)
+        return self._stream(data, self._request_chunk_size(request))
+
+    # APDLMath
+    def GetDataInfo(self, request, context):
+        self._delay()
+        array = self.math.get(request.name.upper())
+        if array is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f'No parameter {request.name}')
+        objtype = 1 if array.ndim == 1 else 2
+        size2 = 1 if array.ndim == 1 else array.shape[1]
+        return pb_types.DataResponse(stype=NP_VALUE_TYPE[array.dtype],
+                                     objtype=objtype, size1=array.shape[0],
+                                     size2=size2)
+
+    def GetVecData(self, request, context):
+        self._delay()
+        return self._stream(self.math[request.name.upper()], DEFAULT_CHUNKSIZE)
+
+    def GetMatData(self, request, context):
+        self._delay()
+        array = self.math[request.name.upper()]
+        return self._stream(array.ravel(order='F'), DEFAULT_CHUNKSIZE)
+
+    def SetVecData(self, request_iterator, context):
+        self._delay()
+        raw = b''
+        for request in request_iterator:
+            name, stype = request.vname, request.stype
+            raw += request.chunk.payload
+        self.math[name.upper()] = np.frombuffer(raw, ANSYS_VALUE_TYPE[stype]).copy()
+        return anskernel.EmptyResponse()
+
+    def SetMatData(self, request_iterator, context):
+        self._delay()
+        raw = b''
+        for request in request_iterator:
+            name, stype = request.mname, request.stype
+            shape = (request.nrow, request.ncol)
+            raw += request.chunk.payload
+        array = np.frombuffer(raw, ANSYS_VALUE_TYPE[stype])
+        self.math[name.upper()] = array.reshape(shape, order='F').copy()
+        return anskernel.EmptyResponse()
+
+    # files
+    def UploadFile(self, request_iterator, context):
+        self._delay()
+        length = 0
+        fid = None
+        try:
+            for request in request_iterator:
+                if fid is None:
+                    fid = open(os.path.join(self.directory, request.file_name), 'wb')
+                fid.write(request.chunk.payload)
+                length += len(request.chunk.payload)
+        finally:
+            if fid is not None:
+                fid.close()
+        return pb_types.UploadFileReply(length=length)
+
+    def DownloadFile(self, request, context):
+        self._delay()
+        filename = os.path.join(self.directory, request.name)
+        if not os.path.isfile(filename):
+            context.abort(grpc.StatusCode.NOT_FOUND, f'No file {request.name}')
+        with open(filename, 'rb') as fid:
+            raw = fid.read()
+        chunk_size = self._metadata_chunk_size(context, DEFAULT_FILE_CHUNK_SIZE)
+        with self._lock:
+            interrupt = self.interrupted_downloads > 0
+            self.interrupted_downloads -= interrupt
+        if interrupt:
+            return self._interrupted(_chunks(raw, chunk_size, 0, self._wait),
+                                     context)
+        return _chunks(raw, chunk_size, 0, self._wait)
+
+    @staticmethod
+    def _interrupted(chunks, context):
+        """Abort a stream after its first chunk"""
+        yield next(chunks)
+        context.abort(grpc.StatusCode.UNAVAILABLE, 'Connection dropped')
+
+
+def launch_mock_server(port=0, max_workers=10, **kwargs):
+    """Launch a stand-in MAPDL gRPC server in this process.
+
+    Parameters
+    ----------
+    port : int, optional
+        Port of the server.  Defaults to any free port.
+
+    max_workers : int, optional
+        Number of threads handling requests.
+
+    **kwargs : dict, optional
+        See :class:`MockMapdlServicer`.
+
+    Returns
+    -------
+    server : grpc.Server
+        Running server.  Stop it with ``server.stop(None)``.
+
+    servicer : MockMapdlServicer
+        Servicer handling the requests.
+
+    port : int
+        Port of the server.
+
+    Examples
+    --------
+    Serve a 100,000 element mesh with 1 ms latency over a 100 MB/s
+    connection.
+
+    >>> server, servicer, port = launch_mock_server(shape=(100, 100, 10),
+    ...                                             latency=1E-3,
+    ...                                             bandwidth=100E6)
+    >>> mapdl = Mapdl(port=port)
+    """
+    servicer = MockMapdlServicer(**kwargs)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    mapdl_grpc.add_MapdlServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port(f'127.0.0.1:{port}')
+    server.start()
+    return server, servicer, port
@@ -0,0 +1,180 @@
+"""Removal of redundant MAPDL commands"""
+from ansys.mapdl.core.mapdl import (READ_ONLY_COMMANDS, MESH_COMMANDS,
+                                    parse_to_short_cmd)
+from ansys.mapdl.core.state import ROUTINE_COMMANDS, STATE_RESET_COMMANDS
+
+# element attribute and meshing settings that only store their values
+ATTRIBUTE_COMMANDS = {'TYPE', 'MAT', 'REAL', 'SECN', 'ESYS', 'ESIZ'}
+
+# commands changing the selected entities
+SELECT_COMMANDS = {
+    'NSEL', 'NSLA', 'NSLE', 'NSLK', 'NSLL', 'NSLV', 'ESEL', 'ESLA', 'ESLL',
+    'ESLN', 'ESLV', 'KSEL', 'KSLL', 'KSLN', 'LSEL', 'LSLA', 'LSLK', 'ASEL',
+    'ASLL', 'ASLV', 'VSEL', 'VSLA', 'ALLS', 'CMSE',
+}
+
+# commands that neither select nor create entities
+SELECTION_NEUTRAL_COMMANDS = ATTRIBUTE_COMMANDS | {
+    '/COM', '/TIT', '/OUT', '/NOP', '/GOP', '/INQ', '*GET', '*VGE', '*STA',
+    '*LIS', '*SET', '*DIM', 'NLIS', 'ELIS', 'KLIS', 'LLIS', 'ALIS', 'VLIS',
+    'ETLI', '/PRE', '/SOL', '/POS', '/AUX', 'FINI', 'CSYS', 'CM', 'CMDE',
+}
+
+# arguments of ALLSEL selecting everything
+ALLSEL_ALL = ([], ['ALL'], ['ALL', 'ALL'])
+
+# commands with known effects on the tracked state
+KNOWN_COMMANDS = (READ_ONLY_COMMANDS | set(MESH_COMMANDS)) - STATE_RESET_COMMANDS
+
+
+def _is_assignment(command):
+    """``True`` when the command is a parameter assignment"""
+    if '=' not in command:
+        return False
+    return ',' not in command.split('=', 1)[0].split('(')[0]
+
+
+def _fields(command):
+    """Upper case fields of a command without trailing empty fields"""
+    fields = [field.strip().upper() for field in command.split(',')]
+    while len(fields) > 1 and not fields[-1]:
+        fields.pop()
+    return fields
+
+
+def _numeric_args(fields):
+    """Literal numeric arguments of a command, ``None`` when any
+    argument is not a number such as a parameter."""
+    args = []
+    for field in fields:
+        if not field:
+            args.append(None)
+            continue
+        try:
+            args.append(float(field))
+        except ValueError:
+            return None
+
+    return tuple(args)
+
+
+class CommandOptimizer():
+    """Skips commands that are provably no-ops.
+
+    Tracks element attributes, whether all entities are selected and
+    which components match the current selection from the commands
+    sent to MAPDL.  The active routine is read from the mirror of the
+    session state.  The following commands are skipped:
+
+    - Routine commands such as ``/PREP7`` or ``FINISH`` when MAPDL is
+      already in that routine.
+    - ``TYPE``, ``MAT``, ``REAL``, ``SECNUM``, ``ESYS`` and ``ESIZE``
+      repeating the values already in effect.
+    - ``ALLSEL`` when all entities are already selected.
+    - ``CM`` and ``CMSEL,S`` when the component already matches the
+      current selection, such as when restoring the selection of a
+      component created by the prior command.
+
+    Any command whose effect is not known discards the tracked state.
+    Values set by a command are only tracked once it has completed
+    without an error.
+
+    Consecutive attribute settings stored in a buffer, for example
+    within ``chain_commands``, are coalesced so that only the last
+    setting of each attribute is sent.
+
+    Parameters
+    ----------
+    session : ansys.mapdl.core.state.SessionState
+        Mirror of the session state of the MAPDL instance.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._reset_cache()
+
+    def _reset_cache(self):
+        """Forget the tracked state"""
+        self._attributes = {}
+        self._all_selected = False
+        self._components = {}  # components matching the current selection
+
+    def is_redundant(self, command):
+        """``True`` when running ``command`` would not change anything
+        in MAPDL."""
+        fields = _fields(command)
+        name = fields[0]
+        short = name[:4]
+        if name in ROUTINE_COMMANDS:
+            return len(fields) == 1 and \
+                self._session.known_active('ROUT') == ROUTINE_COMMANDS[name]
+        if short in ATTRIBUTE_COMMANDS:
+            args = _numeric_args(fields[1:])
+            return args is not None and self._attributes.get(short) == args
+        if short == 'ALLS':
+            return self._all_selected and fields[1:] in ALLSEL_ALL
+        if short == 'CM':
+            return len(fields) > 2 and \
+                self._components.get(fields[1]) == fields[2][:4]
+        if short == 'CMSE':
+            return len(fields) > 2 and fields[1] in ('', 'S') and \
+                fields[2] in self._components and \
+                [field[:4] for field in fields[3:]] in \
+                ([], [self._components[fields[2]]])
+        return False
+
+    def _invalidate(self, command):
+        """Forget the tracked state a command may modify before it is
+        sent to MAPDL"""
+        if _is_assignment(command):
+            return
+
+        fields = _fields(command)
+        short = fields[0][:4]
+        if short not in KNOWN_COMMANDS and short not in SELECT_COMMANDS:
+            self._reset_cache()
+            self._session.forget_active('ROUT')
+            return
+
+        if short not in SELECTION_NEUTRAL_COMMANDS:
+            self._components = {}
+        if short in SELECT_COMMANDS:
+            self._all_selected = False
+
+        if short in ATTRIBUTE_COMMANDS:
+            self._attributes.pop(short, None)
+        elif short in ('CM', 'CMDE') and len(fields) > 1:
+            self._components.pop(fields[1], None)
+
+    def _update(self, command):
+        """Track the values set by a command that completed without
+        an error"""
+        if _is_assignment(command):
+            return
+
+        fields = _fields(command)
+        short = fields[0][:4]
+        if short in ATTRIBUTE_COMMANDS:
+            args = _numeric_args(fields[1:])
+            if args is not None:
+                self._attributes[short] = args
+        elif short == 'ALLS':
+            self._all_selected = fields[1:] in ALLSEL_ALL
+        elif short == 'CM' and len(fields) > 2:
+            self._components[fields[1]] = fields[2][:4]
+
+    @staticmethod
+    def coalesce(commands, command):
+        """Append a command to a buffer of commands, replacing a prior
+        setting of the same attribute within the trailing run of
+        attribute settings."""
+        short = parse_to_short_cmd(command)
+        if short in ATTRIBUTE_COMMANDS:
+            for i in range(len(commands) - 1, -1, -1):
+                prior = parse_to_short_cmd(commands[i])
+                if prior not in ATTRIBUTE_COMMANDS:
+                    break
+                if prior == short:
+                    del commands[i]
+                    break
+        commands.append(command)
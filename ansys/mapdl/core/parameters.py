@@ -7,8 +7,10 @@ import numpy as np
 from ansys.mapdl.reader._reader import write_array
 
 from ansys.mapdl import core as pymapdl
-from ansys.mapdl.core.mapdl import _MapdlCore
+from ansys.mapdl.core.mapdl import (_MapdlCore, READ_ONLY_COMMANDS, MESH_COMMANDS,
+                                   MAX_COMMAND_LENGTH)
 from ansys.mapdl.core.misc import supress_logging
+from ansys.mapdl.core.check_version import meets_version
 
 ROUTINE_MAP = {0: 'Begin level',
                17: 'PREP7',
@@ -20,6 +22,37 @@ ROUTINE_MAP = {0: 'Begin level',
                62: 'AUX12',
                65: 'AUX15'}
 
+# APDLMath matrix used to transfer array parameters
+TMP_MATRIX = '__PYMAPDL_PARM__'
+
+# commands that may define or modify any parameter
+PARAMETER_RESET_COMMANDS = {'/CLE', 'RESU', 'PARR', 'CDRE', '/INP', '*USE',
+                            '*ASK', '*CRE', '*MFO'}
+
+# commands storing a scalar result in the parameter given by the field
+# at this index
+SCALAR_RESULT_COMMANDS = {'*GET': 1, '/INQ': 1, '*DO': 1, '*VSC': 1,
+                          '*DOT': 3, '*NRM': 3}
+
+# commands storing their result in the array parameter given by the
+# field at this index
+ARRAY_RESULT_COMMANDS = {'*VGE': 1, '*VFU': 1, '*VOP': 1, '*VFI': 1,
+                         '*VRE': 1, '*VIT': 1, '*MOP': 1, '*MFU': 1,
+                         '*TRE': 1, '*SRE': 1, '*EXP': 3}
+
+# commands other than star commands known not to modify parameters
+KNOWN_COMMANDS = (READ_ONLY_COMMANDS | set(MESH_COMMANDS)) - PARAMETER_RESET_COMMANDS
+
+# APDL commands that never define or modify parameters
+PARAMETER_READ_ONLY_COMMANDS = {
+    '*STA', '*LIS', '*VWR', '*MWR', '*MSG', '*CFO', '*CFW', '*CFC', '*IF',
+    '*ELS', '*END', '*EXI', '*CYC', '*GO', '*RET', '*AFU', '*VCU', '*VMA',
+    '*VFA', '*VLE', '*VAB', '*VCO', '*VST', '*VPU', '*VPL', '*ABB', '*ULI',
+    '*VEC', '*DMA', '*SMA', '*FRE', '*MUL', '*AXP', '*INI', '*PRI', '*WRI',
+    '*COM', '*MER', '*REM', '*SCA', '*LSB', '*LSE', '*LSF', '*EIG', '*FFT',
+    '*ITE', '*SOR',
+}
+
 UNITS_MAP = {-1: 'NONE',
              0: 'USER',
              1: 'SI',
@@ -62,6 +95,8 @@ class Parameters():
         if not isinstance(mapdl, _MapdlCore):
             raise TypeError('Must be implemented from MAPDL class')
         self._mapdl_weakref = weakref.ref(mapdl)
+        self._cache = None  # parameters from the last *STATUS
+        self._stale = set()  # scalars with an unknown value
 
     @property
     def _mapdl(self):
@@ -101,7 +136,7 @@ class Parameters():
         >>> mapdl.parameters.routine
         'PREP7'
         """
-        value = self._mapdl.get_value('ACTIVE', item1='ROUT')
+        value = self._mapdl._session.get_active('ROUT')
         return ROUTINE_MAP[int(value)]
 
     @property
@@ -127,7 +162,7 @@ class Parameters():
         >>> mapdl.parameters.units
         'NONE'
         """
-        value = self._mapdl.get_value("ACTIVE", item1="UNITS")
+        value = self._mapdl._session.get_active('UNITS')
         return UNITS_MAP[int(value)]
 
     @property
@@ -161,7 +196,7 @@ class Parameters():
         >>> mapdl.parameters.csys
         0
         """
-        return int(self._mapdl.get_value("ACTIVE", item1="CSYS"))
+        return int(self._mapdl._session.get_active('CSYS'))
 
     @property
     def dsys(self) -> int:
@@ -241,10 +276,169 @@ class Parameters():
         return int(self._mapdl.get_value("ACTIVE", item1="type"))
 
     @property
-    @supress_logging
     def _parm(self):
-        """Current MAPDL parameters"""
-        return interp_star_status(self._mapdl.starstatus())
+        """Current MAPDL parameters.
+
+        Populated from ``*STATUS`` once and then updated by each
+        command that defines or modifies a parameter.
+        """
+        if self._cache is None or self._stale:
+            self._load()
+        return self._cache
+
+    @supress_logging
+    def _load(self):
+        """Load all parameters from ``*STATUS``"""
+        self._cache = interp_star_status(self._mapdl.starstatus())
+        self._stale = set()
+
+    def _reset_cache(self):
+        """Reload all parameters on their next use"""
+        self._cache = None
+        self._stale = set()
+
+    def _invalidate(self, command):
+        """Forget the cached parameters a command may modify before it
+        is run.
+
+        Commands with unknown effects, including macros run by name,
+        reset the entire cache.
+        """
+        if self._cache is None:
+            return
+
+        names = self._modified(command)
+        if names is None:
+            self._reset_cache()
+            return
+        for name in names:
+            self._cache.pop(name, None)
+            self._stale.discard(name)
+
+    def _update(self, command):
+        """Update the cache with the parameters set by a command that
+        completed without an error.
+
+        Literal assignments and ``*DIM`` update the cache directly.
+        Scalars computed by MAPDL are requested on their next use.
+        """
+        if self._cache is None:
+            return
+
+        if _is_assignment(command):
+            name, value = command.split('=', 1)
+            self._assign(name, value.split('!')[0])
+            return
+
+        fields = [field.strip().upper() for field in command.split(',')]
+        short = fields[0][:4]
+        if short == '*SET':
+            if len(fields) > 2 and fields[2]:
+                self._assign(fields[1], command.split(',')[2])
+        elif short == '*DIM':
+            self._dim(fields)
+        elif short in SCALAR_RESULT_COMMANDS:
+            index = SCALAR_RESULT_COMMANDS[short]
+            name = fields[index] if len(fields) > index else ''
+            if name and not name.startswith('_') and '(' not in name:
+                self._cache[name] = {'type': 'SCALAR'}
+                self._stale.add(name)
+
+    def _modified(self, command):
+        """Names of the cached parameters a command may modify.
+
+        Returns ``None`` when the command may modify any parameter.
+        """
+        if _is_assignment(command):
+            return self._assigned(command.split('=', 1)[0])
+
+        fields = [field.strip().upper() for field in command.split(',')]
+        short = fields[0][:4]
+        name = fields[1] if len(fields) > 1 else ''
+        if short in ('*SET', '*DIM'):
+            return self._assigned(name)
+        if short == '*DEL':
+            if name in ('', 'ALL', '_PRM', 'PRM_'):
+                return None
+            return [name]
+        if short in SCALAR_RESULT_COMMANDS:
+            index = SCALAR_RESULT_COMMANDS[short]
+            name = fields[index] if len(fields) > index else ''
+            if not name and short == '/INQ':
+                return []
+            return self._assigned(name)
+        if short in ARRAY_RESULT_COMMANDS:
+            index = ARRAY_RESULT_COMMANDS[short]
+            name = fields[index].split('(')[0] if len(fields) > index else ''
+            return [] if name in self._cache else None
+        if short.startswith('*'):
+            return [] if short in PARAMETER_READ_ONLY_COMMANDS else None
+        return [] if short in KNOWN_COMMANDS else None
+
+    def _assigned(self, name):
+        """Names of the cached parameters modified by assigning to
+        ``name``, which may be an array item"""
+        name = name.strip().upper()
+        if '(' in name:  # array item
+            return [] if name.split('(')[0].strip() in self._cache else None
+        if not name:
+            return None
+        if name.startswith('_'):  # hidden parameters are not listed
+            return []
+        return [name]
+
+    def _assign(self, name, value):
+        """Update the cache with the assignment ``name = value``"""
+        name = name.strip().upper()
+        value = value.strip()
+        if '(' in name:  # array element
+            if name.split('(')[0].strip() not in self._cache:
+                self._reset_cache()
+            return
+
+        if not name or name.startswith('_'):
+            if not name:
+                self._reset_cache()
+            return
+
+        self._stale.discard(name)
+        if not value:  # deleted
+            self._cache.pop(name, None)
+            return
+        if len(value) > 1 and value[0] == value[-1] == "'":
+            self._cache[name] = {'type': 'CHARACTER', 'value': value[1:-1]}
+            return
+        try:
+            self._cache[name] = {'type': 'SCALAR', 'value': float(value)}
+        except ValueError:  # evaluated by MAPDL
+            self._cache[name] = {'type': 'SCALAR'}
+            self._stale.add(name)
+
+    def _dim(self, fields):
+        """Update the cache with a ``*DIM`` command"""
+        fields = fields + ['']*(6 - len(fields))
+        name, par_type = fields[1], fields[2] or 'ARRAY'
+        if par_type not in ('ARRAY', 'TABLE') or not name:
+            self._reset_cache()
+            return
+        try:
+            shape = tuple(int(float(dim)) if dim else 1 for dim in fields[3:6])
+        except ValueError:  # dimensions given by parameters
+            self._reset_cache()
+            return
+        self._cache[name] = {'type': par_type, 'shape': shape}
+        self._stale.discard(name)
+
+    def _get_scalar(self, name):
+        """Request a scalar with an unknown value"""
+        value = None
+        if hasattr(self._mapdl, 'scalar_param'):
+            value = self._mapdl.scalar_param(name)
+        if value is None:  # character parameters
+            self._load()
+        else:
+            self._cache[name] = {'type': 'SCALAR', 'value': value}
+            self._stale.discard(name)
 
     def __repr__(self):
         """Return the current parameters in a pretty format"""
@@ -271,17 +465,26 @@ class Parameters():
             raise TypeError('Parameter name must be a string')
         key = key.upper()
 
-        parameters = self._parm
+        if self._cache is None:
+            self._load()
+        elif key in self._stale:
+            self._get_scalar(key)
+        elif key not in self._cache:
+            # may have been defined by a macro
+            self._load()
+
+        parameters = self._cache
         if key not in parameters:
             raise IndexError('%s not a valid parameter_name' % key)
 
         parm = parameters[key]
         if parm['type'] in ['ARRAY', 'TABLE']:
+            binary = parm['type'] == 'ARRAY'
             try:
-                return self._get_parameter_array(key, parm['shape'])
+                return self._get_parameter_array(key, parm['shape'], binary)
             except ValueError:
                 # allow a second attempt
-                return self._get_parameter_array(key, parm['shape'])
+                return self._get_parameter_array(key, parm['shape'], binary)
 
         return parm['value']
 
@@ -306,30 +509,142 @@ class Parameters():
             Examples: ``"ABC" "A3X" "TOP_END"``.
 
         """
-        if not isinstance(value, (str, int, float)):
-            raise TypeError('``Parameter`` must be either a float, int, or string')
-
-        if not isinstance(name, str):
-            raise TypeError('``name`` must be a string')
-
-        if len(name) > 32:
-            raise ValueError('Length of ``name`` must be 32 characters or less')
+        _check_scalar(name, value)
 
         # delete the parameter if it exists as an array
-        parm = self._parm
-        if name in parm:
-            if parm[name]['type'] == 'ARRAY':
-                self._mapdl.starset(name, mute=True)
+        if self._cache is None:
+            self._load()
+        parm = self._cache.get(name.upper())
+        if parm is not None and parm['type'] == 'ARRAY':
+            self._mapdl.starset(name, mute=True)
 
         if isinstance(value, str):
-            if ' ' in value:
-                raise ValueError('Spaces not allowed in strings in MAPDL')
             self._mapdl.starset(name, f"'{value}'", mute=True)
         else:
             self._mapdl.starset(name, value, mute=True)
 
+    def update(self, values):
+        """Set several parameters at once.
+
+        Scalars and strings are sent as a single chained command or,
+        when they exceed the command length limit, as a single input
+        file, so the number of requests does not depend on the number
+        of parameters.  Only the cached values of the parameters
+        written are updated.  Arrays are transferred individually.
+
+        Parameters
+        ----------
+        values : dict
+            Values keyed by the parameter name.
+
+        Examples
+        --------
+        >>> mapdl.parameters.update({'WIDTH': 0.1, 'HEIGHT': 0.2,
+        ...                          'MATNAME': 'STEEL'})
+        """
+        if self._cache is None:
+            self._load()
+
+        commands = []
+        arrays = {}
+        for name, value in values.items():
+            if isinstance(value, (np.ndarray, list)):
+                arrays[name] = value
+                continue
+
+            _check_scalar(name, value)
+            parm = self._cache.get(name.upper())
+            if parm is not None and parm['type'] == 'ARRAY':
+                commands.append(f'{name}=')  # delete the array
+            if isinstance(value, str):
+                commands.append(f"{name}='{value}'")
+            else:
+                commands.append(f'{name}={float(value)!r}')
+
+        chained = '$'.join(commands)
+        if not commands:
+            pass
+        elif len(chained) > MAX_COMMAND_LENGTH and \
+             not hasattr(self._mapdl, '_input_commands'):
+            # the input file resets the entire cache
+            with self._mapdl.non_interactive:
+                for command in commands:
+                    self._mapdl.run(command)
+        else:
+            for command in commands:
+                self._mapdl._prepare_command(command)
+                self._mapdl._log_command(command)
+            if len(chained) <= MAX_COMMAND_LENGTH:
+                response = self._mapdl._run(chained)
+            else:
+                response = self._mapdl._input_commands('\n'.join(commands))
+            self._mapdl._check_response(response)
+            for command in commands:
+                self._mapdl._update_state(command)
+
+        for name, value in arrays.items():
+            self._set_parameter_array(name, value)
+
+    def get_many(self, names):
+        """Return several parameters at once.
+
+        Cached values are returned without contacting MAPDL and all
+        scalars computed by MAPDL since they were last read are
+        requested together.  The gRPC interface has no request for
+        several parameters, so one request per parameter is sent
+        before the first response is awaited.
+
+        Parameters
+        ----------
+        names : list
+            Names of the parameters.
+
+        Returns
+        -------
+        dict
+            Values keyed by the parameter name as given.
+
+        Examples
+        --------
+        >>> mapdl.parameters.get_many(['WIDTH', 'HEIGHT'])
+        {'WIDTH': 0.1, 'HEIGHT': 0.2}
+        """
+        keys = []
+        for name in names:
+            if not isinstance(name, str):
+                raise TypeError('Parameter name must be a string')
+            keys.append(name.upper())
+
+        if self._cache is None or any(key not in self._cache for key in keys):
+            self._load()
+
+        stale = [key for key in dict.fromkeys(keys) if key in self._stale]
+        if stale:
+            if hasattr(self._mapdl, '_scalar_params'):
+                values = self._mapdl._scalar_params(stale)
+            else:
+                values = [None]*len(stale)
+
+            for key, value in zip(stale, values):
+                if value is not None:
+                    self._cache[key] = {'type': 'SCALAR', 'value': value}
+                    self._stale.discard(key)
+            if self._stale.intersection(stale):  # character parameters
+                self._load()
+
+        return {name: self[name] for name in names}
+
+    def _binary_transfer(self, shape):
+        """Array parameters of at most two dimensions are transferred
+        as APDLMath matrices over gRPC"""
+        if len(shape) > 2 and any(dim > 1 for dim in shape[2:]):
+            return False
+        if not hasattr(self._mapdl, '_mat_data'):
+            return False
+        return meets_version(self._mapdl._server_version, (0, 4, 0))
+
     @supress_logging
-    def _get_parameter_array(self, parm_name, shape):
+    def _get_parameter_array(self, parm_name, shape, binary=True):
         """Return an ANSYS array parameter as a numpy.ndarray
 
         Parameters
@@ -337,11 +652,28 @@ class Parameters():
         parm_name : str
             MAPDL parameter name.
 
+        shape : tuple
+            Shape of the array parameter.
+
+        binary : bool, optional
+            Copy the array into an APDLMath matrix and download it at
+            full precision when supported.  Otherwise, the array is
+            written with ``*MWRITE`` and parsed.
+
         Returns
         -------
         array : np.ndarray
             Numpy array.
         """
+        if binary and self._binary_transfer(shape):
+            self._mapdl.run(f'*DMAT,{TMP_MATRIX},D,IMPORT,APDL,{parm_name}',
+                            mute=True)
+            try:
+                arr = self._mapdl._mat_data(TMP_MATRIX)
+            finally:
+                self._mapdl.run(f'*FREE,{TMP_MATRIX}', mute=True)
+            return arr.reshape(shape).squeeze()
+
         format_str = '(1F20.12)'
         with self._mapdl.non_interactive:
             self._mapdl.mwrite(parm_name.upper(), label='kji')  # use C ordering
@@ -355,8 +687,10 @@ class Parameters():
     def _set_parameter_array(self, name, arr):
         """Load a numpy array or python list directly to MAPDL
 
-        Writes the numpy array to disk and then reads it in within
-        MAPDL using \*VREAD.
+        Arrays of at most two dimensions are uploaded as an APDLMath
+        matrix and copied into the parameter with \*EXPORT.
+        Otherwise, writes the numpy array to disk and then reads it in
+        within MAPDL using \*VREAD.
 
         Parameters
         ----------
@@ -415,6 +749,15 @@ class Parameters():
         if arr.ndim == 3:
             kdim = arr.shape[2]
 
+        # upload as an APDLMath matrix and copy it into the parameter
+        if self._binary_transfer((idim, jdim, kdim)):
+            arr = arr.reshape(idim, jdim).astype(np.double)
+            self._mapdl.run(f'*DIM,{name},ARRAY,{idim},{jdim}', mute=True)
+            self._mapdl.math._set_mat(TMP_MATRIX, arr)
+            self._mapdl.run(f'*EXPORT,{TMP_MATRIX},APDL,{name}', mute=True)
+            self._mapdl.run(f'*FREE,{TMP_MATRIX}', mute=True)
+            return
+
         # 2021R1 and earlier has stability issues.  Directly stream
         # results for improved performance and stability, but up to a
         # size limit.
@@ -472,6 +815,31 @@ class Parameters():
             self._mapdl.upload(filename, progress_bar=False)
 
 
+def _is_assignment(command):
+    """``True`` when the command is a parameter assignment"""
+    if '=' not in command:
+        return False
+    return ',' not in command.split('=', 1)[0].split('(')[0]
+
+
+def _check_scalar(name, value):
+    """Raise when a scalar parameter cannot be set"""
+    if not isinstance(value, (str, int, float, np.integer, np.floating)):
+        raise TypeError('``Parameter`` must be either a float, int, or string')
+
+    if not isinstance(name, str):
+        raise TypeError('``name`` must be a string')
+
+    if len(name) > 32:
+        raise ValueError('Length of ``name`` must be 32 characters or less')
+
+    if isinstance(value, str) and ' ' in value:
+        raise ValueError('Spaces not allowed in strings in MAPDL')
+
+    if not isinstance(value, str) and not np.isfinite(value):
+        raise ValueError('``Parameter`` must be a finite number')
+
+
 def interp_star_status(status):
     """Interprets \*STATUS command output from MAPDL
 
@@ -1,12 +1,16 @@
 """Post-processing module using MAPDL interface"""
-import re
+import itertools
+import queue
+import threading
 import weakref
 
 import numpy as np
 
 from ansys.mapdl.core.plotting import general_plotter
 from ansys.mapdl.core.errors import MapdlRuntimeError
-from ansys.mapdl.core.misc import supress_logging
+from ansys.mapdl.core.listing import parse_listing
+from ansys.mapdl.core.misc import supress_logging, threaded_daemon
+from ansys.mapdl.core.profiler import profiled
 
 
 COMPONENT_STRESS_TYPE = ['X', 'Y', 'Z', 'XY', 'YZ', 'XZ']
@@ -43,6 +47,22 @@ def check_comp(component, allowed):
     return component
 
 
+def check_items(items):
+    """Normalize result items to ``(item, component)`` pairs and
+    their field names"""
+    pairs = []
+    for item in items:
+        if isinstance(item, str):
+            item = (item, '')
+        item, comp = item
+        pairs.append((str(item).upper().strip(), str(comp).upper().strip()))
+
+    names = ['_'.join(filter(None, pair)) for pair in pairs]
+    if len(set(names)) != len(names):
+        raise ValueError('Duplicate items in %s' % str(names))
+    return pairs, names
+
+
 class PostProcessing():
     """Post-processing using an active MAPDL session"""
 
@@ -100,11 +120,14 @@ class PostProcessing():
          75.03939292229019,
          75.20949687626468]
         """
-        list_rsp = self._mapdl.set('LIST')
-        groups = re.findall(r'([-+]?\d*\.\d+|\d+)', list_rsp)
+        list_rsp = self._mapdl.set('LIST', mute=False)
+        try:
+            sets = parse_listing(list_rsp)
+        except ValueError:  # no result sets
+            return np.array([])
 
-        # values will always be the second set
-        return np.array([float(item) for item in (groups[1::5])])
+        # values will always be the second column
+        return sets[sets.dtype.names[1]].astype(np.float64)
 
     def _reset_cache(self):
         """Reset local cache"""
@@ -119,8 +142,7 @@ class PostProcessing():
         >>> mapdl.post_processing.filename
         'file'
         """
-        response = self._mapdl.run('/INQUIRE, param, RSTFILE', mute=False)
-        return response.split('=')[-1].strip()
+        return self._mapdl._session.inquire('RSTFILE')
 
     @property
     def nsets(self) -> int:
@@ -193,7 +215,7 @@ class PostProcessing():
     def nodal_displacement(self, component='NORM') -> np.ndarray:
         """Nodal X, Y, or Z structural displacement
 
-        Equilvanent MAPDL command:
+        Equivalent MAPDL command:
         ``PRNSOL, U, X``
 
         Parameters
@@ -234,10 +256,7 @@ class PostProcessing():
         component = check_comp(component, DISP_TYPE)
 
         if component in ['NORM', 'ALL']:
-            x = self._ndof_rst('U', 'X')
-            y = self._ndof_rst('U', 'Y')
-            z = self._ndof_rst('U', 'Z')
-            disp = np.vstack((x, y, z))
+            disp = np.vstack(self._ndof_rsts([('U', 'X'), ('U', 'Y'), ('U', 'Z')]))
             if component == 'NORM':
                 return np.linalg.norm(disp, axis=0)
             return disp.T
@@ -287,6 +306,7 @@ class PostProcessing():
         return self._plot_point_scalars(disp, show_node_numbering=show_node_numbering,
                                         **kwargs)
 
+    @profiled('client')
     def _plot_point_scalars(self, scalars, show_node_numbering=False, **kwargs):
         """Plot point scalars
 
@@ -355,7 +375,7 @@ class PostProcessing():
     def nodal_rotation(self, component='ALL') -> np.ndarray:
         """Nodal X, Y, or Z structural rotation
 
-        Equilvanent MAPDL commands:
+        Equivalent MAPDL commands:
         ``PRNSOL, ROT, X``
         ``PRNSOL, ROT, Y``
         ``PRNSOL, ROT, Z``
@@ -395,9 +415,7 @@ class PostProcessing():
         component = check_comp(component, ROT_TYPE)
 
         if component == 'ALL':
-            x = self._ndof_rst('ROT', 'X')
-            y = self._ndof_rst('ROT', 'Y')
-            z = self._ndof_rst('ROT', 'Z')
+            x, y, z = self._ndof_rsts([('ROT', 'X'), ('ROT', 'Y'), ('ROT', 'Z')])
             return np.vstack((x, y, z)).T
 
         return self._ndof_rst('ROT', component)
@@ -438,16 +456,230 @@ class PostProcessing():
         return self._plot_point_scalars(disp, show_node_numbering=show_node_numbering,
                                         **kwargs)
 
+    @profiled('post', record_arg=True)
     @check_result_loaded
     def _ndof_rst(self, item, it1num=''):
         """Nodal degree of freedom result"""
         return self._mapdl.get_array('NODE', item1=item, it1num=it1num)
 
+    @profiled('post')
+    @check_result_loaded
+    def _ndof_rsts(self, items):
+        """Nodal results for a list of ``(item, it1num)`` pairs"""
+        requests = [('NODE', '', item, it1num) for item, it1num in items]
+        return self._mapdl._get_arrays(requests)
+
+    def _free_etab_labels(self, count):
+        """Element table labels not used by any existing table"""
+        ncol = int(self._mapdl.get_value('ETAB', 0, 'NCOL'))
+        used = {str(self._mapdl.get_value('ETAB', i, 'LAB')).strip().upper()
+                for i in range(1, ncol + 1)}
+        labels = ('PYE%d' % i for i in itertools.count())
+        return list(itertools.islice((label for label in labels
+                                      if label not in used), count))
+
+    @profiled('post')
+    @check_result_loaded
+    def _etab_rsts(self, items):
+        """Element results for a list of ``(item, comp)`` pairs from
+        temporary element tables"""
+        labels = self._free_etab_labels(len(items))
+        try:
+            with self._mapdl.chain_commands:
+                for label, (item, comp) in zip(labels, items):
+                    self._mapdl.etable(label, item, comp)
+            # chained commands are not checked for errors
+            self._mapdl._check_response(self._mapdl._response)
+            requests = [('ELEM', '', 'ETAB', label) for label in labels]
+            return self._mapdl._get_arrays(requests)
+        finally:
+            with self._mapdl.chain_commands:
+                for label in labels:
+                    self._mapdl.etable(label, 'ERAS')
+
+    def nodal_values(self, items) -> np.ndarray:
+        """Several nodal results of the current result set.
+
+        Each item is read with a ``*VGET`` request and all items are
+        returned together in a single structured array.
+
+        Equivalent MAPDL command:
+        ``*VGET, PARM, NODE, , ITEM, COMP``
+
+        Parameters
+        ----------
+        items : list
+            Nodal results to retrieve as ``(item, component)`` pairs
+            or item names for items without a component.  For example
+            ``[('U', 'X'), ('S', 'EQV'), 'TEMP']``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Structured array with a field for each item named
+            ``'ITEM_COMPONENT'`` or ``'ITEM'``.
+
+        Examples
+        --------
+        >>> mapdl.post1()
+        >>> mapdl.set(1, 1)
+        >>> values = mapdl.post_processing.nodal_values([('U', 'X'),
+        ...                                              ('S', 'EQV')])
+        >>> values['U_X']
+        array([1.07512979e-04, 8.59137773e-05, 5.70690047e-05, ...,
+               5.70333124e-05, 8.58600402e-05, 1.07445726e-04])
+
+        Notes
+        -----
+        This command always returns all nodal results regardless of
+        if the nodes are selected or not.  Use the ``selected_nodes``
+        mask to get the currently selected nodes.
+        """
+        pairs, names = check_items(items)
+        arrays = self._ndof_rsts(pairs)
+        values = np.empty(arrays[0].size if arrays else 0,
+                          dtype=[(name, np.float64) for name in names])
+        for name, array in zip(names, arrays):
+            values[name] = array
+        return values
+
+    def element_values(self, items) -> np.ndarray:
+        """Several element results of the current result set.
+
+        An element table is defined for each item, each table is read
+        with a ``*VGET`` request, and the tables are then erased.  The
+        tables are defined and erased with chained commands, which is
+        faster than running an ``ETABLE`` per item.
+
+        Equivalent MAPDL commands:
+        ``ETABLE, LAB, ITEM, COMP`` and ``*VGET, PARM, ELEM, , ETAB, LAB``
+
+        Parameters
+        ----------
+        items : list
+            Element results to retrieve as ``(item, component)``
+            pairs or item names for items without a component.  For
+            example ``[('S', 'EQV'), ('SENE', ''), 'VOLU']``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Structured array with a field for each item named
+            ``'ITEM_COMPONENT'`` or ``'ITEM'``, ordered as the
+            selected elements in ``mapdl.mesh.enum``.
+
+        Examples
+        --------
+        >>> mapdl.post1()
+        >>> mapdl.set(1, 1)
+        >>> values = mapdl.post_processing.element_values([('S', 'EQV'),
+        ...                                                'VOLU'])
+        >>> values['S_EQV']
+        array([3.32101266e+01, 3.24211564e+01, 3.13573928e+01, ...,
+               3.13529015e+01, 3.24179468e+01, 3.32062592e+01])
+
+        Notes
+        -----
+        Existing element tables are not modified.  Values are
+        averaged over the element as with ``ETABLE``.
+        """
+        pairs, names = check_items(items)
+        arrays = self._etab_rsts(pairs) if pairs else []
+        enum = self._mapdl.mesh.enum
+        values = np.empty(enum.size, dtype=[(name, np.float64) for name in names])
+        for name, array in zip(names, arrays):
+            values[name] = array[enum - 1]
+        return values
+
+    def iter_sets(self, items, sets=None, prefetch=2):
+        """Iterate over the nodal results of several result sets.
+
+        The next result sets are read in a background thread while
+        the current one is processed.  At most ``prefetch`` result
+        sets are held in memory at a time.
+
+        Parameters
+        ----------
+        items : list
+            Nodal results to retrieve.  See :func:`nodal_values`.
+
+        sets : list, optional
+            Cumulative result set numbers to iterate over.  Defaults
+            to all result sets.
+
+        prefetch : int, optional
+            Number of result sets to read ahead.  Defaults to 2.
+
+        Yields
+        ------
+        nset : int
+            Cumulative number of the result set.
+
+        values : numpy.ndarray
+            Structured array of the nodal results.  See
+            :func:`nodal_values`.
+
+        Examples
+        --------
+        Maximum equivalent stress of each result set
+
+        >>> mapdl.post1()
+        >>> for nset, values in mapdl.post_processing.iter_sets([('S', 'EQV')]):
+        ...     print(nset, values['S_EQV'].max())
+
+        Notes
+        -----
+        Other MAPDL commands should not be run until the iteration
+        completes, as the active result set changes in the background.
+        """
+        if prefetch < 1:
+            raise ValueError('``prefetch`` must be at least 1')
+        if sets is None:
+            sets = range(1, self.nsets + 1)
+
+        results = queue.Queue(prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            # give up once the consumer has stopped iterating
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        @threaded_daemon
+        def read_sets():
+            try:
+                for nset in sets:
+                    self._mapdl.set(nset=nset, mute=True)
+                    if not put((nset, self.nodal_values(items))):
+                        return
+            except Exception as e:
+                put(e)
+                return
+            put(None)
+
+        thread = read_sets()
+        try:
+            while True:
+                item = results.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
     @property
     def nodal_temperature(self) -> np.ndarray:
         """The nodal temperature of the current result.
 
-        Equilvanent MAPDL command:
+        Equivalent MAPDL command:
         ``PRNSOL, TEMP``
 
         Examples
@@ -503,7 +735,7 @@ class PostProcessing():
     def nodal_pressure(self) -> np.ndarray:
         """The nodal pressure of the current result.
 
-        Equilvanent MAPDL command:
+        Equivalent MAPDL command:
         ``PRNSOL, PRES``
 
         Examples
@@ -559,7 +791,7 @@ class PostProcessing():
     def nodal_voltage(self) -> np.ndarray:
         """The nodal voltage of the current result.
 
-        Equilvanent MAPDL command:
+        Equivalent MAPDL command:
         ``PRNSOL, PRES``
 
         Examples
@@ -614,7 +846,7 @@ class PostProcessing():
     def nodal_component_stress(self, component) -> np.ndarray:
         """Nodal component stress.
 
-        Equilvanent MAPDL commands:
+        Equivalent MAPDL commands:
         \*VGET, PARM, NODE, , S, X
         PRNSOL, S, COMP
 
@@ -683,7 +915,7 @@ class PostProcessing():
     def nodal_principal_stress(self, component) -> np.ndarray:
         """Nodal principal stress.
 
-        Equilvanent MAPDL commands:
+        Equivalent MAPDL commands:
         \*VGET, PARM, NODE, , S, 1
         PRNSOL, S, PRIN
 
@@ -753,7 +985,7 @@ class PostProcessing():
     def nodal_stress_intensity(self) -> np.ndarray:
         """The nodal stress intensity of the current result.
 
-        Equilvanent MAPDL command:
+        Equivalent MAPDL command:
         ``PRNSOL, S, PRIN``
 
         Examples
@@ -816,7 +1048,7 @@ class PostProcessing():
     def nodal_eqv_stress(self) -> np.ndarray:
         """The nodal equivalent stress of the current result.
 
-        Equilvanent MAPDL command:
+        Equivalent MAPDL command:
         ``PRNSOL, S, PRIN``
 
         Examples
@@ -875,7 +1107,7 @@ class PostProcessing():
 
         """
         scalars = self.nodal_eqv_stress
-        kwargs.setdefault('stitle', 'Nodal Equilvanent\nStress')
+        kwargs.setdefault('stitle', 'Nodal Equivalent\nStress')
         return self._plot_point_scalars(scalars,
                                         show_node_numbering=show_node_numbering,
                                         **kwargs)
@@ -885,7 +1117,7 @@ class PostProcessing():
 
         Includes elastic, plastic, and creep strain.
 
-        Equilvanent MAPDL commands:
+        Equivalent MAPDL commands:
         \*VGET, PARM, NODE, , EPTO, X
 
         Parameters
@@ -959,7 +1191,7 @@ class PostProcessing():
 
         Includes elastic, plastic, and creep strain.
 
-        Equilvanent MAPDL commands:
+        Equivalent MAPDL commands:
         \*VGET, PARM, NODE, , EPTO, 1
 
         Parameters
@@ -1031,7 +1263,7 @@ class PostProcessing():
     def nodal_total_strain_intensity(self) -> np.ndarray:
         """The total nodal strain intensity of the current result.
 
-        Equilvanent MAPDL command:
+        Equivalent MAPDL command:
         ``PRNSOL, EPTO, PRIN``
 
         Examples
@@ -1096,7 +1328,7 @@ class PostProcessing():
     def nodal_total_eqv_strain(self) -> np.ndarray:
         """The total nodal equivalent strain of the current result.
 
-        Equilvanent MAPDL command:
+        Equivalent MAPDL command:
         ``PRNSOL, EPTO, PRIN``
 
         Examples
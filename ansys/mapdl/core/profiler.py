@@ -0,0 +1,114 @@
+"""Timeline profiling of a MAPDL session"""
+from contextlib import contextmanager
+from functools import wraps
+import json
+import os
+import threading
+import time
+
+
+def profiled(category, record_arg=False):
+    """Record calls of a method in the active profiler of the MAPDL
+    instance.
+
+    Works on MAPDL instances and on any object with a ``_mapdl``
+    attribute, such as the mesh and post-processing interfaces.
+
+    Parameters
+    ----------
+    category : str
+        Category of the span in the trace.  For example ``'command'``.
+
+    record_arg : bool, optional
+        Record the first positional argument, for example the APDL
+        command, with the span.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            mapdl = getattr(self, '_mapdl', self)
+            profiler = getattr(mapdl, '_profiler', None)
+            if profiler is None:
+                return func(self, *args, **kwargs)
+
+            span_args = None
+            if record_arg and args:
+                span_args = {'arg': str(args[0])}
+            with profiler.span(func.__name__, category, span_args):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class Profiler():
+    """Records a timeline of spans and writes it as a Chrome trace.
+
+    The trace can be opened with ``chrome://tracing`` or
+    https://ui.perfetto.dev.
+
+    Examples
+    --------
+    >>> profiler = Profiler()
+    >>> with profiler.span('mesh', 'client'):
+    ...     pass
+    >>> profiler.save('trace.json')
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._pid = os.getpid()
+        self._events = []
+
+    @property
+    def events(self):
+        """Chrome trace events recorded so far"""
+        return list(self._events)
+
+    def add(self, name, category, start, duration, args=None):
+        """Add a complete span.
+
+        Parameters
+        ----------
+        name : str
+            Name of the span.
+
+        category : str
+            Category of the span.
+
+        start : float
+            Start of the span as given by ``time.perf_counter``.
+
+        duration : float
+            Duration of the span in seconds.
+
+        args : dict, optional
+            Additional data shown with the span.
+        """
+        event = {'name': name,
+                 'cat': category,
+                 'ph': 'X',
+                 'ts': (start - self._start)*1E6,
+                 'dur': duration*1E6,
+                 'pid': self._pid,
+                 'tid': threading.get_ident()}
+        if args:
+            event['args'] = args
+        self._events.append(event)  # atomic
+
+    @contextmanager
+    def span(self, name, category, args=None):
+        """Record the duration of a block of code as a span"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, time.perf_counter() - start, args)
+
+    def to_dict(self):
+        """Return the trace as a Chrome trace dictionary"""
+        return {'traceEvents': self.events, 'displayTimeUnit': 'ms'}
+
+    def save(self, filename):
+        """Write the trace as a Chrome trace JSON file"""
+        with open(filename, 'w') as fid:
+            json.dump(self.to_dict(), fid)
@@ -0,0 +1,501 @@
+"""Record and replay the gRPC requests of a MAPDL session.
+
+A session recorded with ``mapdl.record`` can be replayed with
+``ReplayMapdl`` without a MAPDL server or license.  Replaying
+isolates the overhead of the client from MAPDL, for example when
+profiling a script.
+
+Recordings are a binary file with a JSON header describing the
+session followed by one entry for each request::
+
+    kind (uint8) | rpc | request | n responses (uint32)
+    | (message type | message) * n | error code | error details
+
+where every variable length field is prefixed by its length as a
+``uint32``.  Streamed requests, such as file uploads, are recorded
+with an empty request so that their responses can be replayed, and
+their content is neither stored nor checked when replaying.
+"""
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import Future
+import json
+import queue
+import struct
+import threading
+
+import grpc
+from ansys.grpc.mapdl import mapdl_pb2 as pb_types
+from ansys.grpc.mapdl import ansys_kernel_pb2 as anskernel
+
+from ansys.mapdl.core.errors import ReplayError
+from ansys.mapdl.core.mapdl_grpc import MapdlGrpc
+
+MAGIC = b'PYMAPDL-RECORDING'
+VERSION = 1
+
+UNARY = 0
+STREAM = 1
+
+Record = namedtuple('Record', ['kind', 'rpc', 'request', 'responses', 'error'])
+
+_UINT8 = struct.Struct('<B')
+_UINT32 = struct.Struct('<I')
+
+
+def _message_types():
+    """Message classes of the MAPDL gRPC interface keyed by their full
+    name"""
+    types = {}
+    for module in [pb_types, anskernel]:
+        for name in module.DESCRIPTOR.message_types_by_name:
+            cls = getattr(module, name)
+            types[cls.DESCRIPTOR.full_name] = cls
+    return types
+
+
+def _write_field(fid, data):
+    fid.write(_UINT32.pack(len(data)))
+    fid.write(data)
+
+
+def _read_field(fid):
+    raw = fid.read(_UINT32.size)
+    if len(raw) < _UINT32.size:
+        raise EOFError
+    size, = _UINT32.unpack(raw)
+    data = fid.read(size)
+    if len(data) < size:
+        raise ReplayError('Truncated recording')
+    return data
+
+
+def _error_fields(error):
+    """Status code and details of a gRPC error"""
+    if error is None:
+        return b'', b''
+    try:
+        code = error.code().name
+        details = error.details() or ''
+    except Exception:
+        code, details = grpc.StatusCode.UNKNOWN.name, str(error)
+    return code.encode(), details.encode()
+
+
+class Recorder():
+    """Writes gRPC requests and their responses to a recording.
+
+    Parameters
+    ----------
+    filename : str
+        File to write the recording to.
+
+    metadata : dict, optional
+        JSON serializable description of the session.
+
+    ignore_threads : list, optional
+        Requests from these threads are not recorded.  For example,
+        the heartbeat of a remote session.
+    """
+
+    def __init__(self, filename, metadata=None, ignore_threads=()):
+        self.ignore_threads = set(ignore_threads)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._fid = open(filename, 'wb')
+        header = dict(metadata or {}, version=VERSION)
+        self._fid.write(MAGIC)
+        _write_field(self._fid, json.dumps(header).encode())
+
+    @property
+    def closed(self):
+        """Recording has been closed"""
+        return self._fid.closed
+
+    def write(self, kind, rpc, request, responses, error=None):
+        """Write a single request and its responses.
+
+        Parameters
+        ----------
+        kind : int
+            ``UNARY`` or ``STREAM``.
+
+        rpc : str
+            Name of the RPC.
+
+        request : bytes
+            Serialized request.
+
+        responses : list
+            Response messages.
+
+        error : grpc.RpcError, optional
+            Error raised by the request.
+        """
+        code, details = _error_fields(error)
+        with self._lock:
+            if self._fid.closed:
+                return
+            fid = self._fid
+            fid.write(_UINT8.pack(kind))
+            _write_field(fid, rpc.encode())
+            _write_field(fid, request)
+            fid.write(_UINT32.pack(len(responses)))
+            for message in responses:
+                _write_field(fid, message.DESCRIPTOR.full_name.encode())
+                _write_field(fid, message.SerializeToString())
+            _write_field(fid, code)
+            _write_field(fid, details)
+            self.count += 1
+
+    def wrap(self, stub):
+        """Return a stub recording all requests"""
+        return RecordingStub(stub, self)
+
+    def close(self):
+        """Close the recording"""
+        with self._lock:
+            self._fid.close()
+
+
+class RecordingStub():
+    """Wraps a gRPC stub and records every request"""
+
+    def __init__(self, stub, recorder):
+        self._stub = stub
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return RecordingRpc(getattr(self._stub, name), name, self._recorder)
+
+
+class RecordingRpc():
+    """Wraps a single gRPC method and records every request"""
+
+    def __init__(self, method, name, recorder):
+        self._method = method
+        self._name = name
+        self._recorder = recorder
+
+    def _ignored(self):
+        return threading.current_thread() in self._recorder.ignore_threads
+
+    def __call__(self, request, *args, **kwargs):
+        if self._ignored():
+            return self._method(request, *args, **kwargs)
+
+        # the content of streamed requests is not recorded
+        raw = request.SerializeToString() if hasattr(request, 'SerializeToString') else b''
+        try:
+            response = self._method(request, *args, **kwargs)
+        except grpc.RpcError as error:
+            self._recorder.write(UNARY, self._name, raw, [], error)
+            raise
+
+        if hasattr(response, 'SerializeToString'):
+            self._recorder.write(UNARY, self._name, raw, [response])
+            return response
+
+        def finish(responses, error):
+            self._recorder.write(STREAM, self._name, raw, responses, error)
+
+        return RecordingStream(response, finish)
+
+    def future(self, request, *args, **kwargs):
+        future = self._method.future(request, *args, **kwargs)
+        if self._ignored():
+            return future
+
+        raw = request.SerializeToString()
+
+        def record(future):
+            error = future.exception()
+            responses = [] if error is not None else [future.result()]
+            self._recorder.write(UNARY, self._name, raw, responses, error)
+
+        future.add_done_callback(record)
+        return future
+
+
+class RecordingStream():
+    """Wraps a streamed gRPC response and records it once complete"""
+
+    def __init__(self, stream, finish):
+        self._stream = stream
+        self._finish = finish
+        self._responses = []
+        self._finished = False
+
+    def _complete(self, error=None):
+        if not self._finished:
+            self._finished = True
+            self._finish(self._responses, error)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            message = next(self._stream)
+        except StopIteration:
+            self._complete()
+            raise
+        except grpc.RpcError as error:
+            self._complete(error)
+            raise
+        self._responses.append(message)
+        return message
+
+    next = __next__
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def __del__(self):
+        try:
+            self._complete()
+        except Exception:
+            pass
+
+
+def read_recording(filename):
+    """Read a recording.
+
+    Parameters
+    ----------
+    filename : str
+        Recording written by ``mapdl.record``.
+
+    Returns
+    -------
+    dict
+        Description of the recorded session.
+
+    list
+        ``Record`` of each request in the order the responses were
+        received.
+    """
+    types = _message_types()
+    records = []
+    with open(filename, 'rb') as fid:
+        if fid.read(len(MAGIC)) != MAGIC:
+            raise ReplayError(f'"{filename}" is not a MAPDL recording')
+        metadata = json.loads(_read_field(fid).decode())
+        if metadata.get('version', 0) > VERSION:
+            raise ReplayError('Recording was written by a newer version '
+                              'of ansys-mapdl-core')
+
+        while True:
+            raw = fid.read(_UINT8.size)
+            if not raw:
+                break
+            kind, = _UINT8.unpack(raw)
+            rpc = _read_field(fid).decode()
+            request = _read_field(fid)
+            n_responses, = _UINT32.unpack(fid.read(_UINT32.size))
+            responses = []
+            for _ in range(n_responses):
+                cls = types[_read_field(fid).decode()]
+                responses.append(cls.FromString(_read_field(fid)))
+            code = _read_field(fid).decode()
+            details = _read_field(fid).decode()
+            error = ReplayedRpcError(code, details) if code else None
+            records.append(Record(kind, rpc, request, responses, error))
+
+    return metadata, records
+
+
+class ReplayedRpcError(grpc.RpcError):
+    """gRPC error raised by a recorded request"""
+
+    def __init__(self, code, details=''):
+        super().__init__(details)
+        self._code = getattr(grpc.StatusCode, code, grpc.StatusCode.UNKNOWN)
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+class ReplayStub():
+    """Responds to requests with the responses of a recording.
+
+    Each RPC returns its recorded responses in the order they were
+    recorded.
+
+    Parameters
+    ----------
+    records : list
+        ``Record`` of each request.
+
+    strict : bool, optional
+        Raise a ``ReplayError`` when a request differs from the
+        recorded request.  Streamed requests are not checked.
+    """
+
+    def __init__(self, records, strict=False):
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._records = defaultdict(deque)
+        for record in records:
+            self._records[record.rpc].append(record)
+
+    @property
+    def remaining(self):
+        """Number of recorded requests that have not been replayed"""
+        with self._lock:
+            return sum(len(records) for records in self._records.values())
+
+    def _next(self, rpc, request):
+        with self._lock:
+            records = self._records.get(rpc)
+            if not records:
+                raise ReplayError(f'No recorded response remaining for "{rpc}"')
+            record = records.popleft()
+
+        if self.strict and hasattr(request, 'SerializeToString'):
+            if request.SerializeToString() != record.request:
+                raise ReplayError(f'Request to "{rpc}" differs from the '
+                                  f'recording:\n{request}')
+        return record
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return ReplayRpc(self, name)
+
+
+class ReplayRpc():
+    """Replays a single gRPC method"""
+
+    def __init__(self, stub, name):
+        self._stub = stub
+        self._name = name
+
+    def __call__(self, request, *args, **kwargs):
+        if not hasattr(request, 'SerializeToString'):
+            for _ in request:  # consume streamed requests
+                pass
+
+        record = self._stub._next(self._name, request)
+        if record.kind == STREAM:
+            return ReplayStream(record)
+        if record.error is not None:
+            raise record.error
+        return record.responses[0]
+
+    def future(self, request, *args, **kwargs):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(self(request, *args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+
+class ReplayStream():
+    """Replays a streamed response"""
+
+    def __init__(self, record):
+        self._responses = deque(record.responses)
+        self._error = record.error
+
+    def is_active(self):
+        return True
+
+    def done(self):
+        return not self._responses
+
+    def cancel(self):
+        self._responses.clear()
+        self._error = None
+        return True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._responses:
+            return self._responses.popleft()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        raise StopIteration
+
+    next = __next__
+
+
+class ReplayMapdl(MapdlGrpc):
+    """Replays a session recorded with ``mapdl.record`` without a
+    MAPDL server.
+
+    Requests are answered with the recorded responses, so the
+    replayed script must issue the same requests as the recorded one.
+
+    Parameters
+    ----------
+    filename : str
+        Recording written by ``mapdl.record``.
+
+    strict : bool, optional
+        Raise a ``ReplayError`` when a request differs from the
+        recorded request rather than only when a request was not
+        recorded.  Default ``False``.
+
+    loglevel : str, optional
+        Sets which messages are printed to the console.
+
+    **kwargs : dict, optional
+        Additional keyword arguments passed to ``MapdlGrpc``.
+
+    Examples
+    --------
+    Record a session.
+
+    >>> with mapdl.record('session.rec'):
+    ...     mapdl.prep7()
+    ...     nodes = mapdl.mesh.nodes
+
+    Replay it and profile the client.
+
+    >>> from ansys.mapdl.core.replay import ReplayMapdl
+    >>> mapdl = ReplayMapdl('session.rec')
+    >>> with mapdl.profile('replay.json'):
+    ...     mapdl.prep7()
+    ...     nodes = mapdl.mesh.nodes
+    """
+
+    def __init__(self, filename, strict=False, loglevel='WARNING', **kwargs):
+        self._recording, records = read_recording(filename)
+        self._replay_stub = ReplayStub(records, strict)
+        self._replay_filename = filename
+        kwargs.setdefault('local', self._recording.get('local', False))
+        kwargs.setdefault('jobname', self._recording.get('jobname', 'file'))
+        super().__init__(loglevel=loglevel, set_no_abort=False, **kwargs)
+
+    def _open_channel(self, port, timeout):
+        """Respond to requests from the recording"""
+        self._server = None
+        self._channel_str = self._replay_filename
+        self._channel = None
+        self._stub = self._replay_stub
+        self._get_stubs = queue.Queue()
+        self._get_stubs.put(self._grpc_stub)
+        self._get_channels = []
+        return True
+
+    @property
+    def remaining(self):
+        """Number of recorded requests that have not been replayed"""
+        return self._replay_stub.remaining
+
+    @property
+    def is_alive(self):
+        return not self._exited
+
+    def exit(self, save=False):
+        """Stop replaying"""
+        self._exited = True
@@ -0,0 +1,144 @@
+"""Client side mirror of the MAPDL session state"""
+import weakref
+
+# routine number of *GET, ACTIVE, 0, ROUT entered by each command
+ROUTINE_COMMANDS = {'/PREP7': 17, '/PRE': 17, '/SOLU': 21, '/SOL': 21,
+                    '/POST1': 31, '/POST26': 36, '/AUX2': 52, '/AUX3': 53,
+                    '/AUX12': 62, '/AUX15': 65, 'FINISH': 0, 'FINI': 0}
+
+# unit system number of *GET, ACTIVE, 0, UNITS for each /UNITS label
+UNITS_CODES = {'USER': 0, 'SI': 1, 'CGS': 2, 'BFT': 3, 'BIN': 4, 'MKS': 5,
+               'MPA': 6, 'UMKS': 7}
+
+# commands that activate a coordinate system other than with CSYS
+CSYS_COMMANDS = {'LOCA', 'CLOC', 'CS', 'CSKP', 'CSWP', 'CSDE'}
+
+# /INQUIRE items modified by each command
+INQUIRE_COMMANDS = {'/FIL': ('JOBNAME', 'RSTFILE', 'RSTEXT'),
+                    '/CWD': ('DIRECTORY', 'RSTDIR'),
+                    '/ASS': ('RSTDIR', 'RSTFILE', 'RSTEXT'),
+                    'FILE': ('RSTDIR', 'RSTFILE', 'RSTEXT')}
+
+# commands that may modify any part of the session state
+STATE_RESET_COMMANDS = {'/CLE', 'RESU', 'CDRE', '/INP', '*USE'}
+
+
+def _command_fields(command):
+    """Upper case fields of a command without its comment"""
+    return [field.strip().upper() for field in command.split('!')[0].split(',')]
+
+
+class SessionState():
+    """Mirror of the MAPDL session state tracked from the commands
+    sent to MAPDL.
+
+    Values such as the jobname, working directory, active routine and
+    coordinate system are requested from MAPDL on their first use and
+    kept until a command modifies them.  Values set by a command, such
+    as the routine entered by ``/PREP7``, are mirrored once the command
+    has completed without an error.  All values are requested again
+    after ``verify_every`` commands to catch changes made by commands
+    that are not tracked, such as user macros.
+
+    Parameters
+    ----------
+    mapdl : ansys.mapdl.core.mapdl._MapdlCore
+        MAPDL instance.
+
+    verify_every : int, optional
+        Number of commands after which all values are requested again.
+        ``None`` disables the periodic verification.
+
+    Examples
+    --------
+    >>> mapdl._session.inquire('JOBNAME')
+    'file'
+    >>> mapdl._session.get_active('ROUT')
+    17
+    """
+
+    def __init__(self, mapdl, verify_every=100):
+        self._mapdl_weakref = weakref.ref(mapdl)
+        self.verify_every = verify_every
+        self._values = {}
+        self._n_commands = 0
+
+    @property
+    def _mapdl(self):
+        """Return the weakly referenced instance of MAPDL"""
+        return self._mapdl_weakref()
+
+    def _get(self, key, query):
+        """Mirrored value of ``key``, requested with ``query`` when not
+        known"""
+        if key not in self._values:
+            self._values[key] = query()
+        return self._values[key]
+
+    def inquire(self, func):
+        """Mirrored result of ``/INQUIRE,,func``"""
+        func = func.upper()
+        return self._get(('INQUIRE', func), lambda: self._mapdl.inquire(func))
+
+    def get_active(self, item):
+        """Mirrored result of ``*GET,,ACTIVE,0,item``"""
+        item = item.upper()
+        return self._get(('ACTIVE', item),
+                         lambda: self._mapdl.get_value('ACTIVE', item1=item))
+
+    def known_active(self, item):
+        """Mirrored result of ``*GET,,ACTIVE,0,item`` or ``None``
+        when not known, without querying MAPDL"""
+        return self._values.get(('ACTIVE', item.upper()))
+
+    def forget_active(self, item):
+        """Forget the mirrored result of ``*GET,,ACTIVE,0,item``"""
+        self._values.pop(('ACTIVE', item.upper()), None)
+
+    def _reset_cache(self):
+        """Forget all mirrored values"""
+        self._values = {}
+        self._n_commands = 0
+
+    def _invalidate(self, command):
+        """Forget the mirrored values a command may modify before it
+        is sent to MAPDL"""
+        self._n_commands += 1
+        if self.verify_every is not None and self._n_commands > self.verify_every:
+            self._reset_cache()
+            return
+
+        if not self._values:
+            return
+
+        fields = _command_fields(command)
+        name = fields[0]
+        short = name[:4]
+        if name in ROUTINE_COMMANDS or short in ('/PRE', '/SOL', '/POS', '/AUX', 'FINI'):
+            self._values.pop(('ACTIVE', 'ROUT'), None)
+        elif short == 'CSYS' or short in CSYS_COMMANDS:
+            self._values.pop(('ACTIVE', 'CSYS'), None)
+        elif short == '/UNI':
+            self._values.pop(('ACTIVE', 'UNITS'), None)
+        elif short in INQUIRE_COMMANDS:
+            for func in INQUIRE_COMMANDS[short]:
+                self._values.pop(('INQUIRE', func), None)
+        elif short in STATE_RESET_COMMANDS:
+            self._reset_cache()
+
+    def _update(self, command):
+        """Mirror the values set by a command that completed without
+        an error"""
+        fields = _command_fields(command)
+        name = fields[0]
+        short = name[:4]
+        if name in ROUTINE_COMMANDS:
+            self._values[('ACTIVE', 'ROUT')] = ROUTINE_COMMANDS[name]
+        elif short == 'CSYS':
+            value = fields[1] if len(fields) > 1 else ''
+            if value.isdigit() or not value:
+                self._values[('ACTIVE', 'CSYS')] = int(value or 0)
+        elif short == '/UNI':
+            label = fields[1] if len(fields) > 1 else ''
+            if label in UNITS_CODES:
+                self._values[('ACTIVE', 'UNITS')] = UNITS_CODES[label]
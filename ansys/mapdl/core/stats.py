@@ -0,0 +1,310 @@
+"""Client side instrumentation of gRPC requests"""
+import threading
+import time
+
+from ansys.mapdl.core.mapdl import parse_to_short_cmd
+
+# upper bounds of the latency histogram bins in seconds
+LATENCY_BINS = (1E-4, 3E-4, 1E-3, 3E-3, 1E-2, 3E-2, 0.1, 0.3, 1.0, 3.0, 10.0,
+                float('inf'))
+
+
+def _size(message):
+    """Serialized size of a gRPC message in bytes"""
+    try:
+        return message.ByteSize()
+    except AttributeError:
+        return 0
+
+
+class Metric():
+    """Number of calls, bytes transferred and latency of a single RPC
+    or APDL command."""
+
+    __slots__ = ('count', 'errors', 'total_time', 'max_time', 'bytes_sent',
+                 'bytes_received', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.histogram = [0]*len(LATENCY_BINS)
+
+    def _add(self, elapsed, sent, received, error):
+        self.count += 1
+        self.errors += error
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.bytes_sent += sent
+        self.bytes_received += received
+        for i, bound in enumerate(LATENCY_BINS):
+            if elapsed <= bound:
+                self.histogram[i] += 1
+                break
+
+    @property
+    def mean_time(self):
+        """Mean time of a call in seconds"""
+        if not self.count:
+            return 0.0
+        return self.total_time/self.count
+
+    def to_dict(self):
+        """Return this metric as a dictionary"""
+        out = {key: getattr(self, key) for key in self.__slots__}
+        out['histogram'] = dict(zip(LATENCY_BINS, self.histogram))
+        return out
+
+    def __repr__(self):
+        return (f'Metric(count={self.count}, errors={self.errors}, '
+                f'total_time={self.total_time:.6f}, '
+                f'bytes_sent={self.bytes_sent}, '
+                f'bytes_received={self.bytes_received})')
+
+
+class Stats():
+    """Collects the number of calls, bytes transferred and latency of
+    every gRPC request, both by RPC and by APDL command.
+
+    Collection is disabled by default and costs a single attribute
+    lookup per request when disabled.
+
+    Examples
+    --------
+    >>> mapdl.stats.enable()
+    >>> mapdl.prep7()
+    >>> mapdl.mesh.nodes
+    >>> mapdl.stats
+    RPC                          Count    Total (s)     Sent (B)   Received (B)
+    Nodes                            1     0.002313            4          24045
+    SendCommand                      2     0.001873           48            112
+    ...
+
+    >>> mapdl.stats.rpcs['Nodes'].bytes_received
+    24045
+
+    >>> mapdl.stats.reset()
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._tracer = None  # profiler recording each request
+        self._lock = threading.Lock()
+        self._rpcs = {}
+        self._commands = {}
+
+    def enable(self):
+        """Start collecting statistics"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop collecting statistics"""
+        self.enabled = False
+
+    def reset(self):
+        """Clear all collected statistics"""
+        with self._lock:
+            self._rpcs = {}
+            self._commands = {}
+
+    @property
+    def rpcs(self):
+        """Metrics of each RPC keyed by the RPC name"""
+        with self._lock:
+            return dict(self._rpcs)
+
+    @property
+    def commands(self):
+        """Metrics of each APDL command keyed by the short command
+        name.  For example ``'NSEL'``."""
+        with self._lock:
+            return dict(self._commands)
+
+    def to_dict(self):
+        """Return all statistics as a dictionary"""
+        with self._lock:
+            return {'rpcs': {key: value.to_dict() for key, value in self._rpcs.items()},
+                    'commands': {key: value.to_dict()
+                                 for key, value in self._commands.items()}}
+
+    def record(self, rpc, elapsed, sent=0, received=0, command=None,
+               error=False):
+        """Record a single request.
+
+        Parameters
+        ----------
+        rpc : str
+            Name of the RPC.
+
+        elapsed : float
+            Time in seconds until the entire response was received.
+
+        sent : int, optional
+            Bytes sent.
+
+        received : int, optional
+            Bytes received.
+
+        command : str, optional
+            APDL command sent with this request.
+
+        error : bool, optional
+            The request failed.
+        """
+        tracer = self._tracer
+        if tracer is not None:
+            tracer.add(rpc, 'rpc', time.perf_counter() - elapsed, elapsed,
+                       {'command': command} if command else None)
+
+        with self._lock:
+            self._rpcs.setdefault(rpc, Metric())._add(elapsed, sent, received, error)
+            if command:
+                key = parse_to_short_cmd(command.strip())
+                if key:
+                    self._commands.setdefault(key, Metric())._add(elapsed, sent,
+                                                                  received, error)
+
+    def wrap(self, stub):
+        """Return a stub recording all requests in these statistics"""
+        return InstrumentedStub(stub, self)
+
+    def __repr__(self):
+        lines = []
+        for title, metrics in [('RPC', self.rpcs), ('Command', self.commands)]:
+            width = max([24] + [len(name) + 2 for name in metrics])
+            lines.append(f'{title:<{width}s}{"Count":>10s}{"Total (s)":>13s}'
+                         f'{"Sent (B)":>13s}{"Received (B)":>15s}')
+            for name, metric in sorted(metrics.items(),
+                                       key=lambda item: -item[1].total_time):
+                lines.append(f'{name:<{width}s}{metric.count:>10d}'
+                             f'{metric.total_time:>13.6f}'
+                             f'{metric.bytes_sent:>13d}'
+                             f'{metric.bytes_received:>15d}')
+            lines.append('')
+        return '\n'.join(lines).strip()
+
+
+class InstrumentedStub():
+    """Wraps a gRPC stub and records every request"""
+
+    def __init__(self, stub, stats):
+        self._stub = stub
+        self._stats = stats
+        self._rpcs = {}
+
+    def __getattr__(self, name):
+        rpc = self._rpcs.get(name)
+        if rpc is None:
+            rpc = InstrumentedRpc(getattr(self._stub, name), name, self._stats)
+            self._rpcs[name] = rpc
+        return rpc
+
+
+class InstrumentedRpc():
+    """Wraps a single gRPC method and records every request"""
+
+    def __init__(self, method, name, stats):
+        self._method = method
+        self._name = name
+        self._stats = stats
+
+    def _record(self, start, sent, received, request, error=False):
+        command = getattr(request, 'command', None)
+        if not isinstance(command, str):
+            command = None
+        self._stats.record(self._name, time.perf_counter() - start,
+                           sent, received, command, error)
+
+    def _wrap_request(self, request):
+        """Return the request and a list holding the bytes sent.
+
+        Streamed requests are counted as they are consumed.
+        """
+        if hasattr(request, 'ByteSize'):
+            return request, [request.ByteSize()]
+
+        sent = [0]
+
+        def count(messages):
+            for message in messages:
+                sent[0] += _size(message)
+                yield message
+
+        return count(request), sent
+
+    def __call__(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        request, sent = self._wrap_request(request)
+        try:
+            response = self._method(request, *args, **kwargs)
+        except Exception:
+            self._record(start, sent[0], 0, request, True)
+            raise
+
+        if hasattr(response, 'ByteSize'):
+            self._record(start, sent[0], response.ByteSize(), request)
+            return response
+
+        # streamed response, recorded once the stream completes
+        def finish(received, error):
+            self._record(start, sent[0], received, request, error)
+
+        return InstrumentedStream(response, finish)
+
+    def future(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        request, sent = self._wrap_request(request)
+        future = self._method.future(request, *args, **kwargs)
+
+        def record(future):
+            if future.exception() is None:
+                self._record(start, sent[0], _size(future.result()), request)
+            else:
+                self._record(start, sent[0], 0, request, True)
+
+        future.add_done_callback(record)
+        return future
+
+
+class InstrumentedStream():
+    """Wraps a streamed gRPC response and records it once complete"""
+
+    def __init__(self, stream, finish):
+        self._stream = stream
+        self._finish = finish
+        self._received = 0
+        self._finished = False
+
+    def _complete(self, error=False):
+        if not self._finished:
+            self._finished = True
+            self._finish(self._received, error)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = next(self._stream)
+        except StopIteration:
+            self._complete()
+            raise
+        except Exception:
+            self._complete(True)
+            raise
+        self._received += _size(chunk)
+        return chunk
+
+    next = __next__
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def __del__(self):
+        try:
+            self._complete()
+        except Exception:
+            pass
@@ -0,0 +1,36 @@
+"""Fixtures of the client benchmarks.
+
+The benchmarks run against the stand-in MAPDL gRPC server, so they
+measure the overhead of the client rather than MAPDL itself.
+"""
+import pytest
+
+from ansys.mapdl.core.mapdl_grpc import MapdlGrpc
+from ansys.mapdl.core.mock_server import launch_mock_server
+
+
+@pytest.fixture(scope='session')
+def server():
+    server, servicer, port = launch_mock_server(shape=(10, 10, 10))
+    yield servicer, port
+    server.stop(None)
+
+
+@pytest.fixture(scope='session')
+def servicer(server):
+    return server[0]
+
+
+@pytest.fixture(scope='session')
+def mapdl(server):
+    _, port = server
+    mapdl = MapdlGrpc(port=port, timeout=5)
+    yield mapdl
+    mapdl.exit()
+
+
+@pytest.fixture(autouse=True)
+def clear_commands(servicer):
+    """Keep the command log of the server from growing unbounded"""
+    yield
+    del servicer.commands[:]
@@ -0,0 +1,106 @@
+"""Command throughput of ``run``, ``chain_commands``, ``run_iter`` and
+``non_interactive``"""
+import numpy as np
+import pytest
+
+N_COMMANDS = 200
+
+
+def test_run(benchmark, mapdl):
+    def run():
+        for i in range(N_COMMANDS):
+            mapdl.run(f'N,{i + 1},{i},0,0')
+
+    benchmark(run)
+
+
+def test_chain_commands(benchmark, mapdl):
+    def run():
+        with mapdl.chain_commands:
+            for i in range(N_COMMANDS):
+                mapdl.run(f'N,{i + 1},{i},0,0')
+
+    benchmark(run)
+
+
+def test_non_interactive(benchmark, mapdl):
+    def run():
+        with mapdl.non_interactive:
+            for i in range(N_COMMANDS):
+                mapdl.run(f'N,{i + 1},{i},0,0')
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize('latency', [0.001])
+def test_run_latency(benchmark, mapdl, servicer, latency):
+    servicer.latency = latency
+    try:
+        benchmark(mapdl.run, '/PREP7')
+    finally:
+        servicer.latency = 0
+
+
+@pytest.mark.parametrize('skip_redundant', [False, True])
+def test_redundant_commands(benchmark, mapdl, skip_redundant):
+    def run():
+        for i in range(N_COMMANDS//4):
+            mapdl.prep7()
+            mapdl.type(1)
+            mapdl.mat(1)
+            mapdl.run(f'N,{i + 1},{i},0,0')
+
+    mapdl.skip_redundant = skip_redundant
+    try:
+        benchmark(run)
+    finally:
+        mapdl.skip_redundant = False
+
+
+@pytest.mark.parametrize('use_macro', [False, True])
+def test_macro_loop(benchmark, mapdl, use_macro):
+    x = np.linspace(0, 1, N_COMMANDS)
+
+    def keypoints(x):
+        for i, xi in enumerate(x):
+            mapdl.k(i + 1, xi, 0, 0)
+
+    @mapdl.macro
+    def keypoints_macro(x):
+        for xi in x:
+            mapdl.k(xi.index + 1, xi, 0, 0)
+
+    benchmark(keypoints_macro if use_macro else keypoints, x)
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_long_listing(benchmark, mapdl, servicer, stream):
+    servicer.responses['NLIS'] = '\n'.join('%8d %12.5f %12.5f %12.5f' % (i, i, 0, 0)
+                                           for i in range(1, 50001))
+
+    def run():
+        if stream:
+            return sum(1 for line in mapdl.run_iter('NLIST'))
+        return len(mapdl.run('NLIST').splitlines())
+
+    try:
+        assert benchmark(run) == 50000
+    finally:
+        del servicer.responses['NLIS']
+
+
+@pytest.mark.parametrize('submit', [False, True])
+def test_submit_latency(benchmark, mapdl, servicer, submit):
+    servicer.latency = 0.02
+
+    def run():
+        if submit:
+            futures = [mapdl.submit(f'K,{i + 1},{i},0,0') for i in range(30)]
+            return futures[-1].result()
+        for i in range(30):
+            mapdl.run(f'K,{i + 1},{i},0,0')
+
+    try:
+        benchmark.pedantic(run, rounds=3)
+    finally:
+        servicer.latency = 0
@@ -0,0 +1,43 @@
+"""Channel compression of the requests sent to MAPDL.
+
+Compression applies only to requests, such as ``SetVecData`` and
+``UploadFile``.  Responses, including ``Nodes``, ``LoadElements``,
+``VGet2`` and ``DownloadFile``, are compressed only when the server
+is configured to do so.  The stand-in server runs on the local host,
+so these measure the CPU cost of compression; ``compressed_bytes``
+gives the size that would cross a slow link.
+"""
+import gzip
+
+import numpy as np
+import pytest
+
+from ansys.mapdl.core.mapdl_grpc import MapdlGrpc
+
+
+@pytest.fixture(scope='module', params=[None, 'gzip'])
+def compressed_mapdl(request, server):
+    _, port = server
+    mapdl = MapdlGrpc(port=port, timeout=5, compression=request.param)
+    yield mapdl
+    mapdl.exit()
+
+
+def test_set_vec_compression(benchmark, compressed_mapdl, servicer):
+    # mesh coordinates compress far better than random values
+    arr = servicer.nodes.ravel()
+    benchmark.extra_info['bytes'] = arr.nbytes
+    benchmark.extra_info['compressed_bytes'] = len(gzip.compress(arr.tobytes()))
+    benchmark(compressed_mapdl.math._set_vec, 'BENCHVEC', arr)
+
+
+def test_upload_compression(benchmark, compressed_mapdl, tmpdir):
+    filename = str(tmpdir.join('bench_deck.inp'))
+    with open(filename, 'w') as fid:
+        for i in range(1, 50001):
+            fid.write(f'N,{i},{i*0.001:.6f},{i*0.002:.6f},0.0\n')
+    with open(filename, 'rb') as fid:
+        raw = fid.read()
+    benchmark.extra_info['bytes'] = len(raw)
+    benchmark.extra_info['compressed_bytes'] = len(gzip.compress(raw))
+    benchmark(compressed_mapdl.upload, filename, progress_bar=False)
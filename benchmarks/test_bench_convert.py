@@ -0,0 +1,28 @@
+"""Translation of large input decks with ``convert_script``"""
+import pytest
+
+from ansys.mapdl.core.convert import convert_script
+
+
+def write_deck(filename, n_nodes):
+    """Write a synthetic input deck"""
+    with open(filename, 'w') as fid:
+        fid.write('/PREP7\n')
+        fid.write('! nodes\n')
+        fid.write('ET,1,SOLID185\n')
+        for i in range(1, n_nodes + 1):
+            fid.write(f'N,{i},{i*0.1},{i*0.2},{i*0.3}\n')
+        fid.write('*DO,I,1,10\n')
+        fid.write('  NSEL,S,NODE,,I\n')
+        fid.write('*ENDDO\n')
+        for i in range(1, n_nodes, 8):
+            fid.write(f'E,{i},{i + 1},{i + 2},{i + 3},{i + 4},{i + 5},{i + 6},{i + 7}\n')
+        fid.write('/SOLU\nSOLVE\nFINISH\n')
+
+
+@pytest.mark.parametrize('n_nodes', [1000, 20000])
+def test_convert_script(benchmark, tmpdir, n_nodes):
+    filename_in = str(tmpdir.join('deck.dat'))
+    filename_out = str(tmpdir.join('deck.py'))
+    write_deck(filename_in, n_nodes)
+    benchmark(convert_script, filename_in, filename_out)
@@ -0,0 +1,34 @@
+"""Parsing throughput of MAPDL tabular listings"""
+import numpy as np
+import pytest
+
+from ansys.mapdl.core.listing import parse_listing
+
+HEADER = '    NODE       UX           UY           UZ           USUM'
+
+
+def prnsol(n_nodes):
+    values = np.random.standard_normal((n_nodes, 4))
+    lines = [HEADER] + ['%8d %12.5E %12.5E %12.5E %12.5E' % (i + 1, *row)
+                        for i, row in enumerate(values)]
+    return '\n'.join(lines)
+
+
+@pytest.mark.parametrize('n_nodes', [10**3, 10**5])
+def test_parse_listing(benchmark, n_nodes):
+    text = prnsol(n_nodes)
+    benchmark.extra_info['bytes'] = len(text)
+    table = benchmark(parse_listing, text)
+    assert table.size == n_nodes
+
+
+def test_parse_listing_by_line(benchmark):
+    """Reference of parsing the same listing line by line"""
+    text = prnsol(10**5)
+    benchmark.extra_info['bytes'] = len(text)
+
+    def parse():
+        return np.array([[float(field) for field in line.split()]
+                         for line in text.splitlines()[1:]])
+
+    assert benchmark(parse).shape == (10**5, 5)
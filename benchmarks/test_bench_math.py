@@ -0,0 +1,33 @@
+"""Transfer of APDLMath vectors and matrices"""
+import numpy as np
+import pytest
+
+SIZES = [10**4, 10**6]
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_set_vec(benchmark, mapdl, size):
+    arr = np.random.random(size)
+    benchmark.extra_info['bytes'] = arr.nbytes
+    benchmark(mapdl.math._set_vec, 'BENCHVEC', arr)
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_get_vec(benchmark, mapdl, size):
+    arr = np.random.random(size)
+    vec = mapdl.math.set_vec(arr)
+    benchmark.extra_info['bytes'] = arr.nbytes
+    out = benchmark(vec.asarray)
+    assert np.allclose(out, arr)
+
+
+def test_set_mat(benchmark, mapdl):
+    arr = np.random.random((500, 500))
+    benchmark(mapdl.math._set_mat, 'BENCHMAT', arr)
+
+
+def test_get_mat(benchmark, mapdl):
+    arr = np.random.random((500, 500))
+    mat = mapdl.math.matrix(arr)
+    out = benchmark(mat.asarray)
+    assert np.allclose(out, arr)
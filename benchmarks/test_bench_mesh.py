@@ -0,0 +1,24 @@
+"""Load time of the mesh versus the size of the model"""
+import pytest
+
+from ansys.mapdl.core.mock_server import hex_mesh
+
+SHAPES = [(10, 10, 10), (20, 20, 20), (40, 40, 40)]
+
+
+@pytest.fixture(params=SHAPES, ids=lambda shape: 'x'.join(map(str, shape)))
+def model(request, mapdl, servicer):
+    servicer.set_mesh(*hex_mesh(request.param))
+    yield mapdl
+    servicer.set_mesh(*hex_mesh((10, 10, 10)))
+    mapdl.mesh._reset_cache()
+
+
+def test_nodes(benchmark, model):
+    benchmark.pedantic(lambda: model.mesh.nodes,
+                       setup=model.mesh._reset_cache, rounds=5)
+
+
+def test_grid(benchmark, model):
+    benchmark.pedantic(lambda: model.mesh.grid,
+                       setup=model.mesh._reset_cache, rounds=5)
@@ -0,0 +1,69 @@
+"""Get and set of array parameters"""
+import numpy as np
+import pytest
+
+FORMAT = '(1F20.12)'
+
+
+@pytest.mark.parametrize('size', [100, 10000, 1000000])
+def test_set_array(benchmark, mapdl, size):
+    arr = np.random.random(size)
+    benchmark(mapdl.parameters._set_parameter_array, 'ARR', arr)
+
+
+@pytest.mark.parametrize('size', [100, 10000, 1000000])
+def test_get_array(benchmark, mapdl, size):
+    mapdl.parameters._set_parameter_array('ARR', np.random.random(size))
+    arr = benchmark(mapdl.parameters._get_parameter_array, 'ARR', (size, 1, 1))
+    assert arr.size == size
+
+
+@pytest.mark.parametrize('size', [100, 10000])
+def test_get_array_text(benchmark, mapdl, servicer, size):
+    # the server writes the array with the requested format
+    values = '\n'.join(f'{value:20.12f}' for value in np.random.random(size))
+    key = FORMAT[:4]
+    servicer.responses[key] = f'{FORMAT}\n{values}'
+    try:
+        arr = benchmark(mapdl.parameters._get_parameter_array, 'ARR', (size,),
+                        binary=False)
+    finally:
+        del servicer.responses[key]
+    assert arr.size == size
+
+
+def test_set_scalars(benchmark, mapdl):
+    def run():
+        for i in range(200):
+            mapdl.parameters[f'DV_{i}'] = i*0.1
+
+    benchmark(run)
+
+
+def test_update_scalars(benchmark, mapdl):
+    values = {f'DV_{i}': i*0.1 for i in range(200)}
+    benchmark(mapdl.parameters.update, values)
+
+
+@pytest.mark.parametrize('n_values', [10, 200])
+def test_update_scalars_latency(benchmark, mapdl, servicer, n_values):
+    values = {f'DV_{i}': i*0.1 for i in range(n_values)}
+    servicer.latency = 0.005
+    try:
+        benchmark.pedantic(mapdl.parameters.update, (values,), rounds=5)
+    finally:
+        servicer.latency = 0
+
+
+def test_get_many_scalars(benchmark, mapdl):
+    names = [f'DV_{i}' for i in range(200)]
+    mapdl.parameters.update({name: 1.0 for name in names})
+
+    def setup():
+        # values computed by MAPDL must be requested
+        with mapdl.chain_commands:
+            for name in names:
+                mapdl.run(f'*GET,{name},NODE,0,COUNT')
+
+    benchmark.pedantic(mapdl.parameters.get_many, (names,), setup=setup,
+                       rounds=10)
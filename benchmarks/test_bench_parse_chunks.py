@@ -0,0 +1,46 @@
+"""Deserialization throughput of gRPC chunks"""
+import numpy as np
+import pytest
+
+from ansys.grpc.mapdl import ansys_kernel_pb2 as anskernel
+from ansys.mapdl.core.common_grpc import DEFAULT_CHUNKSIZE, parse_chunks
+from ansys.mapdl.core.mock_server import _chunks
+
+
+class RecordedStream():
+    """Replays recorded chunks like an active gRPC stream"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def is_active(self):
+        return True
+
+    def done(self):
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._chunks)
+
+    next = __next__
+
+
+@pytest.mark.parametrize('size', [10**4, 10**6])
+def test_parse_chunks(benchmark, size):
+    raw = np.random.random(size).tobytes()
+    chunks = list(_chunks(raw, DEFAULT_CHUNKSIZE))
+    benchmark.extra_info['bytes'] = len(raw)
+    out = benchmark(lambda: parse_chunks(RecordedStream(chunks), np.double))
+    assert out.size == size
+
+
+def test_parse_chunks_unsized(benchmark):
+    """Chunks that do not advertise the size of the record"""
+    raw = np.random.random(10**6).tobytes()
+    chunks = [anskernel.Chunk(payload=raw[i:i + DEFAULT_CHUNKSIZE])
+              for i in range(0, len(raw), DEFAULT_CHUNKSIZE)]
+    out = benchmark(lambda: parse_chunks(RecordedStream(chunks), np.double))
+    assert out.size == 10**6
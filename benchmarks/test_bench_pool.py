@@ -0,0 +1,48 @@
+"""Overhead of ``LocalMapdlPool.map``"""
+import pytest
+
+from ansys.mapdl.core.mapdl_grpc import MapdlGrpc
+from ansys.mapdl.core.mock_server import launch_mock_server
+from ansys.mapdl.core.pool import LocalMapdlPool
+
+N_INSTANCES = 4
+
+
+@pytest.fixture(scope='module')
+def pool():
+    """Pool of instances connected to stand-in servers.
+
+    Launching a pool requires MAPDL, so the pool is assembled from
+    existing connections instead.
+    """
+    servers, instances = [], []
+    for _ in range(N_INSTANCES):
+        server, _, port = launch_mock_server(shape=(2, 2, 2))
+        servers.append(server)
+        instances.append(MapdlGrpc(port=port, timeout=5))
+
+    pool = LocalMapdlPool.__new__(LocalMapdlPool)
+    pool._instances = instances
+    pool._active = True
+    yield pool
+
+    pool.exit(block=True)
+    for server in servers:
+        server.stop(None)
+
+
+def func(mapdl, i):
+    return mapdl.run(f'/TITLE,{i}')
+
+
+def test_map(benchmark, pool):
+    iterable = list(range(4*N_INSTANCES))
+    results = benchmark(pool.map, func, iterable, progress_bar=False,
+                        close_when_finished=False)
+    assert len(results) == len(iterable)
+
+
+def test_run_batch(benchmark, pool):
+    """Baseline of the same commands sent sequentially to one instance"""
+    mapdl = pool[0]
+    benchmark(lambda: [func(mapdl, i) for i in range(4*N_INSTANCES)])
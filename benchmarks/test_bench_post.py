@@ -0,0 +1,27 @@
+"""Element results of several items at once versus an element table
+and ``*VGET`` per item"""
+import pytest
+
+ITEMS = [('S', 'EQV'), ('EPEL', 'EQV'), ('SENE', ''), ('VOLU', ''),
+         ('SMISC', '1'), ('NMISC', '1')]
+
+
+@pytest.fixture
+def slow_server(mapdl, servicer):
+    servicer.latency = 0.001
+    yield mapdl
+    servicer.latency = 0
+
+
+def test_element_values(benchmark, slow_server):
+    benchmark(slow_server.post_processing.element_values, ITEMS)
+
+
+def test_element_values_by_item(benchmark, slow_server):
+    def run():
+        for item, comp in ITEMS:
+            slow_server.etable('TMP', item, comp)
+            slow_server.get_array('ELEM', item1='ETAB', it1num='TMP')
+        slow_server.etable('TMP', 'ERAS')
+
+    benchmark(run)
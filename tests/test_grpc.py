@@ -1,9 +1,15 @@
 """gRPC service specific tests"""
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pytest
 
 from ansys.mapdl.core import examples
+from ansys.mapdl.core.common_grpc import parse_chunks
+from ansys.mapdl.core.errors import MapdlInvalidRoutineError
+from ansys.mapdl.core.mapdl_grpc import MapdlGrpc
+from ansys.mapdl.core.stats import Stats
 
 PATH = os.path.dirname(os.path.abspath(__file__))
 
@@ -32,6 +38,26 @@ def test_clear_multiple(mapdl):
         mapdl.run('/CLEAR')
 
 
+def test_invalid_compression():
+    with pytest.raises(ValueError):
+        MapdlGrpc(compression='zstd')
+
+
+def test_invalid_n_channels():
+    with pytest.raises(ValueError):
+        MapdlGrpc(n_channels=0)
+
+
+def test_get_value_threaded(mapdl):
+    mapdl.prep7()
+    mapdl.n(1, 1, 2, 3)
+    expected = mapdl.get_value('NODE', 1, 'LOC', 'Y')
+    with ThreadPoolExecutor(8) as executor:
+        values = list(executor.map(lambda _: mapdl.get_value('NODE', 1, 'LOC', 'Y'),
+                                   range(100)))
+    assert values == [expected]*100
+
+
 def test_invalid_get(mapdl):
     with pytest.raises(ValueError):
         mapdl.get_value("ACTIVE", item1="SET", it1num='invalid')
@@ -72,6 +98,24 @@ def test_upload_large(mapdl):
     assert os.path.basename(file_name) in mapdl.list_files()
 
 
+def test_upload_download_files(mapdl, tmpdir):
+    file_names = []
+    for i in range(3):
+        file_name = str(tmpdir.join(f'tmp_transfer{i}.inp'))
+        with open(file_name, 'w') as fid:
+            fid.write(f'/COM, file {i}\n'*1000)
+        file_names.append(file_name)
+
+    basenames = mapdl.upload_files(file_names)
+    assert all(basename in mapdl.list_files() for basename in basenames)
+
+    download_dir = tmpdir.mkdir('download')
+    downloaded = mapdl.download_files(basenames, str(download_dir), verify=True)
+    for file_name, downloaded_name in zip(file_names, downloaded):
+        with open(file_name) as fid_a, open(downloaded_name) as fid_b:
+            assert fid_a.read() == fid_b.read()
+
+
 def test_upload_fail(mapdl):
     with pytest.raises(FileNotFoundError):
         mapdl.upload('thisisnotafile')
@@ -113,3 +157,162 @@ def test_read_input_file(mapdl, file_name):
     mapdl.clear()
     response = mapdl.input(test_file)
     assert '*****  ANSYS SOLUTION ROUTINE  *****' in response
+
+
+def test_submit(mapdl):
+    mapdl.finish()
+    mapdl.clear()
+    mapdl.prep7()
+    futures = [mapdl.submit(f'K, {i}, {i}, 0, 0') for i in range(1, 51)]
+    assert 'KEYPOINT' in futures[-1].result()
+
+    # synchronous requests wait on all submitted commands
+    assert mapdl.get_value('KP', 0, 'COUNT') == 50
+    assert all(future.done() for future in futures)
+
+
+def test_submit_error(mapdl):
+    future = mapdl.submit('NOT_A_COMMAND')
+    with pytest.raises(MapdlInvalidRoutineError):
+        future.result()
+
+
+def test_lazy_batching(mapdl, cleared):
+    mapdl.lazy_batching = True
+    try:
+        # commands whose output is parsed are never buffered
+        assert mapdl.n(1, 0, 0, 0) == 1
+        assert mapdl.ngen(100, 1, 1, '', '', 1) == ''
+        assert mapdl._lazy_commands
+        assert mapdl.mesh.n_node == 100
+        assert not mapdl._lazy_commands
+
+        # output is still returned when requested
+        assert 'LIST ALL SELECTED NODES' in mapdl.nlist()
+    finally:
+        mapdl.lazy_batching = False
+
+
+def test_lazy_batching_error(mapdl, cleared):
+    mapdl.lazy_batching = True
+    try:
+        mapdl.run('NOT_A_COMMAND', mute=True)
+        with pytest.raises(MapdlInvalidRoutineError):
+            mapdl.get_value('NODE', 0, 'COUNT')
+    finally:
+        mapdl.lazy_batching = False
+
+
+class FakeChunk():
+    def __init__(self, payload, size=0):
+        self.payload = payload
+        self.size = size
+        self.value_type = 0
+
+    def ByteSize(self):
+        return len(self.payload)
+
+
+class FakeStream():
+    """Mimics a streaming gRPC response"""
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    def is_active(self):
+        return True
+
+    def next(self):
+        return self._chunks.pop(0)
+
+    def done(self):
+        return not self._chunks
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._chunks:
+            raise StopIteration
+        return self.next()
+
+
+@pytest.mark.parametrize('advertise_size', [True, False])
+def test_parse_chunks(advertise_size):
+    array = np.arange(10000, dtype=np.double)
+    raw = array.tobytes()
+    chunks = [FakeChunk(raw[i:i + 4096]) for i in range(0, len(raw), 4096)]
+    if advertise_size:
+        chunks[0].size = len(raw)
+
+    assert np.array_equal(parse_chunks(FakeStream(chunks), np.double), array)
+
+
+def test_parse_chunks_out():
+    array = np.arange(10000, dtype=np.int32)
+    raw = array.tobytes()
+    chunks = [FakeChunk(raw[i:i + 4096]) for i in range(0, len(raw), 4096)]
+
+    out = np.zeros(20000, np.int32)
+    parsed = parse_chunks(FakeStream(chunks), out=out)
+    assert np.shares_memory(parsed, out)
+    assert np.array_equal(parsed, array)
+
+    with pytest.raises(ValueError):
+        parse_chunks(FakeStream(chunks), out=np.zeros(10, np.int32))
+
+    # a non-contiguous output would be copied rather than written
+    with pytest.raises(ValueError, match='contiguous'):
+        parse_chunks(FakeStream(chunks), out=np.zeros(40000, np.int32)[::2])
+
+
+@pytest.mark.parametrize('first_size', ['payload', 'partial'])
+def test_parse_chunks_size(first_size):
+    # MAPDL sets the size of each chunk to the length of its payload
+    array = np.arange(10000, dtype=np.double)
+    raw = array.tobytes()
+    chunks = [FakeChunk(raw[i:i + 4096]) for i in range(0, len(raw), 4096)]
+    for chunk in chunks:
+        chunk.size = len(chunk.payload)
+    if first_size == 'partial':  # neither the payload nor the record
+        chunks[0].size = 3*4096
+
+    assert np.array_equal(parse_chunks(FakeStream(chunks), np.double), array)
+
+
+def test_stats_stream():
+    class FakeStub():
+        def VGet2(self, request):
+            return FakeStream([FakeChunk(b'0'*100), FakeChunk(b'0'*50)])
+
+    stats = Stats()
+    stub = stats.wrap(FakeStub())
+    assert len(list(stub.VGet2(FakeChunk(b'NODE,,NLIST')))) == 2
+
+    metric = stats.rpcs['VGet2']
+    assert metric.count == 1
+    assert metric.bytes_sent == 11
+    assert metric.bytes_received == 150
+    assert sum(metric.histogram) == 1
+
+    stats.reset()
+    assert not stats.rpcs
+
+
+def test_stats(mapdl):
+    mapdl.stats.reset()
+    mapdl.stats.enable()
+    try:
+        mapdl.prep7()
+        mapdl.get_value('ACTIVE', 0, 'ROUT')
+    finally:
+        mapdl.stats.disable()
+
+    assert mapdl.stats.rpcs['SendCommand'].count >= 1
+    assert mapdl.stats.rpcs['Get'].count == 1
+    assert mapdl.stats.commands['/PRE'].count == 1
+
+    # nothing is recorded when disabled
+    mapdl.prep7()
+    assert mapdl.stats.commands['/PRE'].count == 1
+    mapdl.stats.reset()
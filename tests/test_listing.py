@@ -0,0 +1,139 @@
+"""Tests for parsing MAPDL tabular listings"""
+import numpy as np
+import pytest
+
+from ansys.mapdl.core.listing import parse_listing
+
+NLIST = """
+ LIST ALL SELECTED NODES.   DSYS=      0
+ SORT TABLE ON  NODE  NODE  NODE
+
+    NODE        X                   Y                   Z                 THXY     THYZ     THZX
+        1   0.0000000000000     0.0000000000000     0.0000000000000          0.00     0.00     0.00
+        2   1.0000000000000     0.0000000000000    -0.2500000000000E-01      0.00     0.00     0.00
+
+ ***** MAPDL VERIFICATION RUN ONLY *****
+   DO NOT USE RESULTS FOR PRODUCTION
+
+ LIST ALL SELECTED NODES.   DSYS=      0
+ SORT TABLE ON  NODE  NODE  NODE
+
+    NODE        X                   Y                   Z                 THXY     THYZ     THZX
+        3   2.0000000000000     0.5000000000000     0.0000000000000          0.00     0.00    45.00
+"""
+
+PRNSOL = """
+ PRINT U    NODAL SOLUTION PER NODE
+
+  ***** POST1 NODAL DEGREE OF FREEDOM LISTING *****
+
+  LOAD STEP=     1  SUBSTEP=     1
+   TIME=    1.0000      LOAD CASE=   0
+
+  THE FOLLOWING DEGREE OF FREEDOM RESULTS ARE IN THE GLOBAL COORDINATE SYSTEM
+
+    NODE       UX           UY           UZ           USUM
+        1   0.0000       0.0000       0.0000       0.0000
+        2  0.12345E-03 -0.54321E-04   0.0000      0.13487E-03
+       10  0.10000E-25  0.20000E+30 -0.30000E-01  0.20000E+30
+
+ MAXIMUM ABSOLUTE VALUES
+ NODE          2           2          10          10
+ VALUE   0.12345E-03 -0.54321E-04 -0.30000E-01  0.20000E+30
+"""
+
+ELIST = """
+ LIST ALL SELECTED ELEMENTS.  (LIST NODES)
+
+    ELEM MAT TYP REL ESY SEC        NODES
+
+       1   1   1   1   0   1      1     2     4     3     5     6     8     7
+                                  9    10    11    12    13    14    15    16
+                                 17    18    19    20
+       2   1   2   1   0   1     21    22    23    24    25    26    27    28
+"""
+
+SET_LIST = """
+ *****  INDEX OF DATA SETS ON RESULTS FILE  *****
+
+   SET   TIME/FREQ    LOAD STEP   SUBSTEP  CUMULATIVE
+     1  75.000             1         1         1
+     2  75.001             1         2         2
+     3  75.0012            2         1         3
+"""
+
+PRETAB = """
+ PRINT ELEMENT TABLE ITEMS PER ELEMENT
+
+   *****  POST1 ELEMENT TABLE LISTING *****
+
+    STAT     CURRENT     CURRENT
+    ELEM     VOLU        SENE
+       1  0.10000E-01  0.50000
+       2  0.20000E-01  0.60000
+
+    STAT     CURRENT
+    ELEM     EPELX
+       1   3.0000
+       2   4.0000
+
+ MINIMUM VALUES
+ ELEM           1           1
+ VALUE   0.10000E-01  0.50000
+"""
+
+
+def test_nlist():
+    nodes = parse_listing(NLIST)
+    assert nodes.dtype.names == ('NODE', 'X', 'Y', 'Z', 'THXY', 'THYZ', 'THZX')
+    assert nodes['NODE'].dtype == np.int64
+    assert nodes['NODE'].tolist() == [1, 2, 3]
+    assert nodes['Z'].tolist() == [0, -0.025, 0]
+    assert nodes['THZX'].tolist() == [0, 0, 45]
+
+
+def test_prnsol():
+    disp = parse_listing(PRNSOL)
+    assert disp['NODE'].tolist() == [1, 2, 10]
+    assert disp['UX'].tolist() == [0, 0.12345E-03, 0.1E-25]
+    assert disp['UY'].tolist() == [0, -0.54321E-04, 0.2E+30]
+    assert disp['USUM'].tolist() == [0, 0.13487E-03, 0.2E+30]
+
+
+def test_elist_wrapped_rows():
+    elem = parse_listing(ELIST)
+    assert elem['ELEM'].tolist() == [1, 2]
+    assert elem['TYP'].tolist() == [1, 2]
+    assert elem['NODES'].shape == (2, 20)
+    assert elem['NODES'][0].tolist() == [1, 2, 4, 3, 5, 6, 8, 7] + \
+        list(range(9, 21))
+    assert elem['NODES'][1].tolist() == list(range(21, 29)) + [0]*12
+
+
+def test_set_list():
+    sets = parse_listing(SET_LIST)
+    assert sets.dtype.names == ('SET', 'TIME/FREQ', 'LOAD STEP', 'SUBSTEP',
+                                'CUMULATIVE')
+    assert sets['TIME/FREQ'].tolist() == [75.0, 75.001, 75.0012]
+    assert sets['LOAD STEP'].tolist() == [1, 1, 2]
+
+
+def test_pretab_wrapped_columns():
+    table = parse_listing(PRETAB)
+    assert table.dtype.names == ('ELEM', 'VOLU', 'SENE', 'EPELX')
+    assert table['VOLU'].tolist() == [0.01, 0.02]
+    assert table['EPELX'].tolist() == [3.0, 4.0]
+
+
+@pytest.mark.parametrize('fmt', ['%.5E', '%14.6E', '%.13e', '%10.4f', '%g'])
+def test_matches_float(fmt):
+    values = np.random.standard_normal(500) * 10.0**np.random.randint(-40, 40, 500)
+    lines = ['%8d  %s' % (i + 1, (fmt % value).rjust(20))
+             for i, value in enumerate(values)]
+    table = parse_listing('    NODE   VALUE\n' + '\n'.join(lines))
+    assert table['VALUE'].tolist() == [float(fmt % value) for value in values]
+
+
+def test_no_table():
+    with pytest.raises(ValueError):
+        parse_listing(' *** NOTE ***\n No nodes are selected.\n')
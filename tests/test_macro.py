@@ -0,0 +1,33 @@
+"""Tests for tracing python functions into APDL macros"""
+import pytest
+
+from ansys.mapdl.core.macro import Symbol, LoopIndex
+
+
+def test_symbol_expressions():
+    x, y = Symbol('X'), Symbol('Y')
+    assert str(x + 1) == 'X+1'
+    assert str(2*(x + y)) == '2*(X+Y)'
+    assert str(x - (y - 1)) == 'X-(Y-1)'
+    assert str(x/(y*2)) == 'X/(Y*2)'
+    assert str(-x*y) == '(-X)*Y'
+    assert str(x*-1.5) == 'X*(-1.5)'
+    assert str((x + 1)**2) == '(X+1)**2'
+    assert f'K,1,{x},{abs(y)}' == 'K,1,X,ABS(Y)'
+
+
+def test_loop_index():
+    index = LoopIndex('_I')
+    assert str(index) == '_I-1'
+    assert str(index + 1) == '_I'
+    assert str(1 + index) == '_I'
+    assert str(index + 3) == '_I+2'
+    assert str(index*2) == '(_I-1)*2'
+
+
+def test_symbol_in_condition():
+    with pytest.raises(TypeError):
+        if Symbol('X'):
+            pass
+    with pytest.raises(TypeError):
+        range(Symbol('N'))
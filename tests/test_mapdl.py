@@ -1,6 +1,7 @@
 """Test MAPDL interface"""
 import time
 import os
+import json
 
 import pytest
 import numpy as np
@@ -12,6 +13,7 @@ from ansys.mapdl.reader import examples
 
 from ansys.mapdl.core.misc import random_string
 from ansys.mapdl.core.errors import MapdlRuntimeError
+from ansys.mapdl.core.mapdl import mesh_effects
 from ansys.mapdl import core as pymapdl
 
 skip_no_xserver = pytest.mark.skipif(not system_supports_plotting(),
@@ -355,6 +357,95 @@ def test_nodes(tmpdir, cleared, mapdl):
     assert not mapdl.mesh.nnum.size
 
 
+def test_add_nodes_elements(mapdl, cleared):
+    # two stacked hexahedral elements
+    x, y, z = np.meshgrid([0, 1], [0, 1], [0, 1, 2], indexing='ij')
+    xyz = np.vstack((x.ravel(), y.ravel(), z.ravel())).T
+    nnum = np.arange(1, 13)
+    mapdl.mesh.add_nodes(nnum, xyz)
+    assert np.allclose(mapdl.mesh.nnum, nnum)
+    assert np.allclose(mapdl.mesh.nodes, xyz)
+
+    mapdl.et(1, 'SOLID185')
+    idx = np.arange(12).reshape(2, 2, 3)
+    conn = [nnum[[idx[0, 0, i], idx[1, 0, i], idx[1, 1, i], idx[0, 1, i],
+                  idx[0, 0, i + 1], idx[1, 0, i + 1], idx[1, 1, i + 1],
+                  idx[0, 1, i + 1]]] for i in range(2)]
+    enum = mapdl.mesh.add_elements(1, conn)
+    assert np.allclose(enum, [1, 2])
+    assert mapdl.mesh.n_elem == 2
+    assert np.allclose(mapdl.mesh.enum, enum)
+
+
+@pytest.mark.parametrize('command,effects', [
+    ('/COM, comment', set()),
+    ('ARG1 = 2', set()),
+    ('*GET, par, NODE, 0, COUNT', set()),
+    ('NSEL, S, LOC, X, 0', {'nodes'}),
+    ('ESEL, ALL', {'elements'}),
+    ('ET, 1, 186', {'etypes'}),
+    ('VMESH, ALL', {'nodes', 'elements'}),
+    ('/CLEAR', {'nodes', 'elements', 'etypes'}),
+    ('*VPUT, arr, NODE, 1, LOC, X', None),
+    ('NOT_A_COMMAND', None),
+])
+def test_mesh_effects(command, effects):
+    assert mesh_effects(command) == effects
+
+
+def test_mesh_cache_invalidation(mapdl, make_block):
+    nodes = mapdl.mesh.nodes
+    mapdl.run('/COM, does not modify the mesh')
+    mapdl.get_value('NODE', 0, 'COUNT')
+    assert mapdl.mesh.nodes is nodes
+
+    # commands with an unknown effect reset the cache
+    mapdl.run('NUMSTR, NODE, 1000')
+    assert mapdl.mesh.nodes is not nodes
+    assert np.allclose(mapdl.mesh.nodes, nodes)
+
+    mapdl.nsel('S', 'NODE', '', 1)
+    assert mapdl.mesh.nodes.shape == (1, 3)
+    mapdl.allsel()
+
+
+def test_mesh_delta_sync(mapdl, make_block):
+    n_elem = mapdl.mesh.n_elem
+    elem = mapdl.mesh._elem
+    mapdl.esel('S', 'ELEM', '', 1, n_elem // 2)
+    assert mapdl.mesh.n_elem == n_elem // 2
+    mapdl.allsel()
+    assert np.array_equal(mapdl.mesh._elem, elem)
+
+    # only the new block is loaded
+    mapdl.block(10, 11, 10, 11, 10, 11)
+    mapdl.vmesh('ALL')
+    assert np.allclose(mapdl.mesh.nodes, mapdl.mesh._load_nodes())
+    assert mapdl.mesh.n_elem > n_elem
+
+
+def test_profile(mapdl, make_block, tmpdir):
+    filename = str(tmpdir.join('trace.json'))
+    mapdl.stats.reset()
+    with mapdl.profile(filename) as profiler:
+        mapdl.prep7()
+        mapdl.mesh._reset_cache()
+        mapdl.mesh.grid
+    assert mapdl._profiler is None
+
+    # statistics are unaffected by profiling
+    assert not mapdl.stats.enabled
+    assert not mapdl.stats.rpcs
+
+    with open(filename) as fid:
+        events = json.load(fid)['traceEvents']
+    assert len(events) == len(profiler.events)
+
+    names = {event['name'] for event in events}
+    for name in ['run', '_update_cache', '_parse_vtk', 'SendCommand']:
+        assert name in names
+
+
 def test_enum(mapdl, make_block):
     assert mapdl.mesh.n_elem
     assert np.allclose(mapdl.mesh.enum, range(1, mapdl.mesh.n_elem + 1))
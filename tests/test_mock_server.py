@@ -0,0 +1,608 @@
+"""Tests for the stand-in MAPDL gRPC server"""
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ansys.mapdl.core.errors import MapdlRuntimeError, ReplayError
+from ansys.mapdl.core.mapdl_grpc import MapdlGrpc
+from ansys.mapdl.core.mock_server import launch_mock_server, hex_mesh
+from ansys.mapdl.core.replay import ReplayMapdl, read_recording
+
+
+@pytest.fixture(scope='module')
+def server():
+    server, servicer, port = launch_mock_server(shape=(6, 5, 4))
+    yield servicer, port
+    server.stop(None)
+
+
+@pytest.fixture(scope='module')
+def mock_mapdl(server):
+    _, port = server
+    mapdl = MapdlGrpc(port=port, timeout=5)
+    yield mapdl
+    mapdl.exit()
+
+
+def test_hex_mesh():
+    nodes, elem = hex_mesh((2, 3, 4))
+    assert nodes.shape == (3*4*5, 3)
+    assert elem.size == 2*3*4*18
+    assert elem[8::18].tolist() == list(range(1, 25))
+    assert elem[10::18].min() == 1
+
+
+def test_evaluate(server):
+    servicer, _ = server
+    servicer.parameters['EV_X'] = 2.0
+    servicer.parameters['EV_ARR'] = np.arange(6.0).reshape(3, 2)
+    try:
+        assert servicer.evaluate('ev_x*3 - ABS(-1)') == 5
+        assert servicer.evaluate('EV_ARR(2,2)**2') == 9
+        with pytest.raises(ValueError):
+            servicer.evaluate('().__class__.__base__.__subclasses__()')
+        with pytest.raises(ValueError):
+            servicer.evaluate('EV_X.__class__')
+    finally:
+        del servicer.parameters['EV_X']
+        del servicer.parameters['EV_ARR']
+
+
+def test_connect(server, mock_mapdl):
+    servicer, _ = server
+    assert mock_mapdl.directory == servicer.directory
+    assert mock_mapdl._local
+
+
+def test_mesh(server, mock_mapdl):
+    servicer, _ = server
+    mock_mapdl.mesh._reset_cache()
+    assert mock_mapdl.mesh.n_node == 7*6*5
+    assert mock_mapdl.mesh.n_elem == 6*5*4
+    assert np.allclose(mock_mapdl.mesh.nodes, servicer.nodes)
+    assert mock_mapdl.mesh.grid.n_cells == 6*5*4
+
+
+def test_mesh_cache(server, mock_mapdl):
+    servicer, _ = server
+    nodes = mock_mapdl.mesh.nodes
+    mock_mapdl.run('/COM, does not modify the mesh')
+    assert mock_mapdl.mesh.nodes is nodes
+
+    # commands with an unknown effect may move nodes
+    moved = servicer.nodes + 1
+    servicer.set_mesh(moved, servicer.elem)
+    try:
+        mock_mapdl.run('*VPUT, ARR, NODE, 1, LOC, X')
+        assert np.allclose(mock_mapdl.mesh.nodes, moved)
+    finally:
+        servicer.set_mesh(*hex_mesh((6, 5, 4)))
+        mock_mapdl.mesh._reset_cache()
+
+
+def test_mesh_delta_components(server, mock_mapdl, tmpdir):
+    servicer, _ = server
+    mock_mapdl.mesh._reset_cache()
+    mock_mapdl.mesh.nodes  # fill the node store
+    nodes, elem = hex_mesh((6, 5, 4))
+    servicer.set_mesh(np.vstack((nodes, nodes[:1] + 10)), elem)
+    filename = str(tmpdir.join('log.inp'))
+    mock_mapdl.open_apdl_log(filename)
+    start = len(servicer.commands)
+
+    # commands changing the selection are run on the calling thread
+    threads = []
+    run_internal = mock_mapdl.mesh._run_internal
+
+    def record_thread(command):
+        threads.append(threading.current_thread())
+        run_internal(command)
+
+    mock_mapdl.mesh._run_internal = record_thread
+    try:
+        mock_mapdl.nsel('ALL')
+        assert mock_mapdl.mesh.nodes.shape == (7*6*5 + 1, 3)
+    finally:
+        del mock_mapdl.mesh._run_internal
+        mock_mapdl._close_apdl_log()
+        servicer.set_mesh(nodes, elem)
+        mock_mapdl.mesh._reset_cache()
+
+    assert threads
+    assert all(thread is threading.main_thread() for thread in threads)
+    sent = servicer.commands[start:]
+    assert sent.index('CMDELE,__DELTA_NODE__') > sent.index('CMSEL,S,__DELTA_NODE__,NODE')
+    with open(filename) as fid:
+        assert '__DELTA' not in fid.read()
+
+
+def test_get_value(mock_mapdl):
+    assert mock_mapdl.get_value('NODE', 0, 'COUNT') == 7*6*5
+    assert mock_mapdl.get_value('NODE', 2, 'LOC', 'X') == pytest.approx(1/6)
+
+
+def test_command_response(server, mock_mapdl):
+    servicer, _ = server
+    servicer.responses['NSEL'] = 'SELECT ALL NODES'
+    try:
+        assert mock_mapdl.run('NSEL, ALL') == 'SELECT ALL NODES'
+    finally:
+        del servicer.responses['NSEL']
+    assert servicer.commands[-1] == 'NSEL, ALL'
+
+
+def test_time_values(server, mock_mapdl):
+    servicer, _ = server
+    servicer.responses['SET'] = '\n'.join([
+        ' *****  INDEX OF DATA SETS ON RESULTS FILE  *****', '',
+        '   SET   TIME/FREQ    LOAD STEP   SUBSTEP  CUMULATIVE'] + [
+        '%6d  %-12.5G%6d    %6d    %6d' % (i, 75 + i/1000, 1, i, i)
+        for i in range(1, 101)])
+    try:
+        assert np.allclose(mock_mapdl.post_processing.time_values,
+                           75 + np.arange(1, 101)/1000)
+    finally:
+        del servicer.responses['SET']
+
+
+def test_run_iter(server, mock_mapdl):
+    servicer, _ = server
+    lines = ['%8d %12.5f %12.5f %12.5f' % (i, i/3, i/7, i/9)
+             for i in range(1, 5001)]
+    servicer.responses['NLIS'] = '\n'.join(lines)
+    servicer.responses['PRNS'] = '\n'.join(lines[:100] + [
+        ' *** ERROR ***                           CP =       0.000',
+        ' No nodal solution available.', ''] + lines[100:])
+    try:
+        assert list(mock_mapdl.run_iter('NLIST')) == lines
+        assert servicer.commands[-1] == 'NLIST'
+
+        # stopping early leaves the session usable
+        for i, line in enumerate(mock_mapdl.run_iter('NLIST')):
+            if i == 10:
+                break
+        assert mock_mapdl.get_value('NODE', 0, 'COUNT') == 7*6*5
+
+        received = []
+        with pytest.raises(MapdlRuntimeError):
+            for line in mock_mapdl.run_iter('PRNSOL,U,X'):
+                received.append(line)
+        assert received[:100] == lines[:100]
+        assert len(received) < 110
+    finally:
+        del servicer.responses['NLIS']
+        del servicer.responses['PRNS']
+
+    with mock_mapdl.non_interactive:
+        assert list(mock_mapdl.run_iter('NLIST')) == []
+
+
+def test_nodal_values(mock_mapdl):
+    values = mock_mapdl.post_processing.nodal_values([('U', 'X'), ('S', 'EQV')])
+    assert values.size == 7*6*5
+    assert not np.allclose(values['U_X'], values['S_EQV'])
+
+
+def test_element_values(server, mock_mapdl):
+    servicer, _ = server
+    mock_mapdl.etable('PYE0', 'SENE')  # existing user table
+    user_table = servicer.etables['PYE0']
+    start = len(servicer.commands)
+    values = mock_mapdl.post_processing.element_values([('S', 'EQV'), 'VOLU'])
+    assert values.dtype.names == ('S_EQV', 'VOLU')
+    assert values.size == mock_mapdl.mesh.enum.size == 6*5*4
+    assert np.array_equal(values['S_EQV'],
+                          mock_mapdl.get_array('ELEM', item1='S', it1num='EQV'))
+    assert not np.allclose(values['S_EQV'], values['VOLU'])
+
+    etables = [cmd for cmd in servicer.commands[start:] if cmd.startswith('ETAB')]
+    assert len(etables) == 4
+    assert list(servicer.etables) == ['PYE0']  # temporary tables are erased
+    assert servicer.etables['PYE0'] is user_table
+    mock_mapdl.etable('PYE0', 'ERAS')
+
+    with pytest.raises(ValueError):
+        mock_mapdl.post_processing.element_values(['VOLU', ('volu', '')])
+
+    # tables are erased when a definition fails
+    def etable(command):
+        if 'BAD' in command.upper():
+            return ' *** ERROR ***   CP =  0.000\n Unknown item.'
+        return servicer.etable(command)
+
+    servicer.responses['ETAB'] = etable
+    try:
+        with pytest.raises(MapdlRuntimeError):
+            mock_mapdl.post_processing.element_values(['VOLU', 'BAD'])
+        assert not servicer.etables
+    finally:
+        del servicer.responses['ETAB']
+
+
+@pytest.mark.parametrize('shape', [(5,), (4, 3)])
+def test_parameter_array(server, mock_mapdl, shape):
+    servicer, _ = server
+    arr = np.random.random(shape)
+    mock_mapdl.parameters._set_parameter_array('ARR', arr)
+    assert np.array_equal(servicer.parameters['ARR'], arr.reshape(shape[0], -1))
+
+    out = mock_mapdl.parameters._get_parameter_array('ARR', shape + (1,)*(3 - len(shape)))
+    assert np.array_equal(out, arr)  # full precision
+    assert not servicer.math
+
+
+def test_parameter_cache(server, mock_mapdl):
+    servicer, _ = server
+    mock_mapdl.run('*USE,macro')  # parameters may have changed
+    start = len(servicer.commands)
+
+    for i in range(10):
+        mock_mapdl.parameters['PAR_A'] = i
+        mock_mapdl.parameters['PAR_S'] = f'str{i}'
+        assert mock_mapdl.parameters['PAR_A'] == i
+        assert mock_mapdl.parameters['PAR_S'] == f'str{i}'
+    mock_mapdl.run('*DIM,PAR_ARR,ARRAY,4,2')
+    assert mock_mapdl.parameters._parm['PAR_ARR']['shape'] == (4, 2, 1)
+    mock_mapdl.run('*GET,PAR_N,NODE,0,COUNT')
+    assert mock_mapdl.parameters['PAR_N'] == 7*6*5
+
+    mock_mapdl.run('*SET,PAR_A')
+    with pytest.raises(IndexError):
+        mock_mapdl.parameters['PAR_A']
+
+    commands = servicer.commands[start:]
+    assert len([cmd for cmd in commands if cmd.startswith('*STATUS')]) == 2
+
+    # defined behind the back of the cache
+    servicer.parameters['PAR_B'] = 2.0
+    assert mock_mapdl.parameters['PAR_B'] == 2
+
+    # failed assignments leave the value in MAPDL
+    servicer.responses['*SET'] = ' *** ERROR ***   CP =  0.000\n Failed.'
+    try:
+        with pytest.raises(MapdlRuntimeError):
+            mock_mapdl.parameters['PAR_B'] = 3
+    finally:
+        del servicer.responses['*SET']
+    assert mock_mapdl.parameters['PAR_B'] == 2
+
+    # macros run by name may modify any parameter
+    servicer.parameters['PAR_B'] = 4.0
+    mock_mapdl.run('MYMACRO')
+    assert mock_mapdl.parameters['PAR_B'] == 4
+
+
+@pytest.mark.parametrize('n_values', [3, 200])
+def test_parameters_update(server, mock_mapdl, n_values):
+    servicer, _ = server
+    values = {f'DV_{i}': i/3 for i in range(n_values)}
+    values['DV_NAME'] = 'STEEL'
+
+    mock_mapdl.parameters['DV_KEEP'] = 2
+    start = len(servicer.commands)
+    mock_mapdl.stats.reset()
+    mock_mapdl.stats.enable()
+    try:
+        mock_mapdl.parameters.update(values)
+    finally:
+        mock_mapdl.stats.disable()
+    assert servicer.parameters['DV_NAME'] == 'STEEL'
+    assert servicer.parameters[f'DV_{n_values - 1}'] == (n_values - 1)/3
+
+    # the number of requests does not depend on the number of values
+    assert sum(metric.count for metric in mock_mapdl.stats.rpcs.values()) <= 2
+
+    # only the parameters written are updated in the cache
+    assert mock_mapdl.parameters['DV_KEEP'] == 2
+    assert 'DV_KEEP' not in mock_mapdl.parameters._stale
+
+    # computed values are requested together
+    mock_mapdl.run('*GET,DV_0,NODE,0,COUNT')
+    out = mock_mapdl.parameters.get_many(list(values))
+    assert out == dict(values, DV_0=7*6*5)
+    assert not any(cmd.startswith('*STATUS') for cmd in servicer.commands[start:])
+
+    with pytest.raises(ValueError):
+        mock_mapdl.parameters.update({'DV_NAME': 'WITH SPACE'})
+    with pytest.raises(ValueError):
+        mock_mapdl.parameters.update({'DV_0': float('nan')})
+
+
+def test_session_state(server, mock_mapdl, tmpdir):
+    servicer, _ = server
+    mock_mapdl._reset_cache()
+    mock_mapdl.stats.reset()
+    mock_mapdl.stats.enable()
+    start = len(servicer.commands)
+    try:
+        for _ in range(5):
+            assert mock_mapdl.jobname == 'file'
+            assert mock_mapdl.directory == servicer.directory
+            assert mock_mapdl.parameters.routine == 'Begin level'
+            assert mock_mapdl.parameters.csys == 0
+            assert mock_mapdl.post_processing.filename == 'file'
+        inquires = [cmd for cmd in servicer.commands[start:]
+                    if cmd.startswith('/INQ')]
+        assert len(inquires) == 3
+        assert mock_mapdl.stats.rpcs['Get'].count == 2
+
+        # tracked from the commands changing the state
+        mock_mapdl.prep7()
+        mock_mapdl.csys(1)
+        mock_mapdl.units('SI')
+        assert mock_mapdl.parameters.routine == 'PREP7'
+        assert mock_mapdl.parameters.csys == 1
+        assert mock_mapdl.parameters.units == 'SI'
+        assert mock_mapdl.stats.rpcs['Get'].count == 2
+
+        mock_mapdl.jobname = 'other'
+        mock_mapdl.run(f'/CWD,{tmpdir}')
+        assert mock_mapdl.jobname == 'other'
+        assert mock_mapdl.directory == str(tmpdir)
+        assert mock_mapdl.parameters.routine == 'Begin level'
+    finally:
+        mock_mapdl.stats.disable()
+        mock_mapdl.run('CSYS,0')
+        mock_mapdl.run(f'/CWD,{servicer.directory}')
+        mock_mapdl.run('/FILNAME,file')
+
+
+def test_skip_redundant(server, mock_mapdl):
+    servicer, _ = server
+    mock_mapdl.skip_redundant = True
+    try:
+        start = len(servicer.commands)
+        for _ in range(3):
+            mock_mapdl.prep7()
+            mock_mapdl.type(1)
+            mock_mapdl.mat(2)
+            mock_mapdl.allsel()
+            mock_mapdl.cm('__NODE__', 'NODE')
+            mock_mapdl.cmsel('S', '__NODE__', 'NODE')
+        mock_mapdl.finish()
+        mock_mapdl.finish()
+        sent = [cmd.split(',')[0].upper() for cmd in servicer.commands[start:]]
+        assert sent == ['/PREP7', 'TYPE', 'MAT', 'ALLSEL', 'CM', 'FINISH']
+
+        # also skipped when iterating over the response
+        assert list(mock_mapdl.run_iter('FINISH')) == []
+        assert len(servicer.commands) - start == len(sent)
+
+        # selection changes and unknown commands are sent
+        start = len(servicer.commands)
+        mock_mapdl.nsel('S', 'LOC', 'X', 0)
+        mock_mapdl.cmsel('S', '__NODE__', 'NODE')
+        mock_mapdl.allsel()
+        mock_mapdl.run('MYMACRO')
+        mock_mapdl.finish()
+        assert len(servicer.commands) - start == 5
+
+        # consecutive attribute settings are coalesced
+        start = len(servicer.commands)
+        with mock_mapdl.chain_commands:
+            mock_mapdl.type(1)
+            mock_mapdl.mat(1)
+            mock_mapdl.type(2)
+            mock_mapdl.esize(0.1)
+            mock_mapdl.esize(0.2)
+        assert servicer.commands[start:] == ['MAT,1', 'TYPE,2', 'ESIZE,0.2,']
+
+        # failed commands do not change the tracked state
+        mock_mapdl.finish()
+        servicer.responses['/PRE'] = ' *** ERROR ***   CP =  0.000\n Failed.'
+        with pytest.raises(MapdlRuntimeError):
+            mock_mapdl.prep7()
+        del servicer.responses['/PRE']
+        start = len(servicer.commands)
+        mock_mapdl.prep7()
+        assert len(servicer.commands) - start == 1
+    finally:
+        servicer.responses.pop('/PRE', None)
+        mock_mapdl.skip_redundant = False
+
+
+def test_macro(server, mock_mapdl):
+    servicer, _ = server
+
+    @mock_mapdl.macro
+    def keypoints(x, y, z):
+        for xi, yi in zip(x, y):
+            mock_mapdl.k(xi.index + 1, xi, yi*2, z)
+
+    for n_items in [10, 1000]:
+        x, y = np.random.random(n_items), np.random.random(n_items)
+        mock_mapdl.stats.reset()
+        mock_mapdl.stats.enable()
+        start = len(servicer.commands)
+        try:
+            keypoints(x, y, 3.0)
+        finally:
+            mock_mapdl.stats.disable()
+
+        assert mock_mapdl.stats.rpcs['SendCommand'].count < 10
+        kps = [cmd.split(',') for cmd in servicer.commands[start:]
+               if cmd.startswith('K,')]
+        assert np.allclose(np.array(kps)[:, 1:].astype(float),
+                           np.vstack((np.arange(1, n_items + 1), x, 2*y,
+                                      np.full(n_items, 3.0))).T)
+    assert len(keypoints.commands) == 1
+
+    with pytest.raises(ValueError):
+        keypoints(np.ones(3), np.ones(4), 1.0)
+
+
+def test_upload_download(mock_mapdl, tmpdir):
+    filename = str(tmpdir.join('data.txt'))
+    with open(filename, 'w') as fid:
+        fid.write('data'*1000)
+
+    mock_mapdl.upload(filename, progress_bar=False)
+    assert 'data.txt' in os.listdir(mock_mapdl.directory)
+
+    out_file = str(tmpdir.join('out.txt'))
+    mock_mapdl.download('data.txt', out_file, progress_bar=False)
+    with open(out_file) as fid:
+        assert fid.read() == 'data'*1000
+
+
+def test_download_files_retry(server, mock_mapdl, tmpdir):
+    servicer, _ = server
+    targets = ['part%d.dat' % i for i in range(4)]
+    for i, target in enumerate(targets):
+        with open(os.path.join(servicer.directory, target), 'wb') as fid:
+            fid.write(bytes([i])*(1 << 20))
+
+    servicer.interrupted_downloads = 2
+    start = len(servicer.commands)
+    filenames = mock_mapdl.download_files(targets, str(tmpdir))
+    assert servicer.interrupted_downloads == 0
+    assert len(servicer.commands) == start  # no commands from the workers
+    for i, filename in enumerate(filenames):
+        with open(filename, 'rb') as fid:
+            assert fid.read() == bytes([i])*(1 << 20)
+    assert not [name for name in os.listdir(str(tmpdir)) if name.endswith('.part')]
+
+
+def test_latency(server, mock_mapdl):
+    servicer, _ = server
+    servicer.latency = 0.05
+    try:
+        tstart = time.time()
+        mock_mapdl.get_value('NODE', 0, 'COUNT')
+        assert time.time() - tstart >= 0.05
+    finally:
+        servicer.latency = 0
+
+
+def test_submit_order(server, mock_mapdl):
+    servicer, _ = server
+    servicer.latency = 0.001
+    start = len(servicer.commands)
+    try:
+        commands = [f'K,{i},{i},0,0' for i in range(1, 41)]
+        futures = [mock_mapdl.submit(command) for command in commands]
+        mock_mapdl.get_value('NODE', 0, 'COUNT')  # waits on all commands
+        assert all(future.done() for future in futures)
+        sent = [cmd for cmd in servicer.commands[start:]
+                if not cmd.startswith('/COM')]
+        assert sent[:len(commands)] == commands
+    finally:
+        servicer.latency = 0
+
+
+def test_submit_chained(server, mock_mapdl):
+    servicer, _ = server
+    servicer.latency = 0.005
+    servicer.responses['K'] = lambda command: \
+        ' KEYPOINT %6d' % int(command.split(',')[1])
+    servicer.responses['KSEL'] = ' *** ERROR ***   CP =  0.000\n Failed.'
+    mock_mapdl.stats.reset()
+    mock_mapdl.stats.enable()
+    try:
+        futures = [mock_mapdl.submit(f'K,{i},{i},0,0') for i in range(1, 31)]
+        failed = mock_mapdl.submit('KSEL,S,KP,,1')
+        last = mock_mapdl.submit('K,31,31,0,0')
+        for i, future in enumerate(futures):
+            assert future.result() == 'KEYPOINT %6d' % (i + 1)
+        with pytest.raises(MapdlRuntimeError):
+            failed.result()
+        assert last.result() == 'KEYPOINT     31'
+
+        # commands submitted while MAPDL is busy are chained
+        assert mock_mapdl.stats.rpcs['SendCommand'].count < 10
+    finally:
+        mock_mapdl.stats.disable()
+        servicer.latency = 0
+        del servicer.responses['K']
+        del servicer.responses['KSEL']
+
+
+def test_lazy_batching(server, mock_mapdl):
+    servicer, _ = server
+    servicer.responses['N'] = lambda command: \
+        ' NODE %8d  KCS=      0  X,Y,Z=  0.0  0.0  0.0' % int(command.split(',')[1])
+    mock_mapdl.lazy_batching = True
+    try:
+        assert mock_mapdl.n(5, 0, 0, 0) == 5
+        assert mock_mapdl.fill(1, 5) == ''
+        assert mock_mapdl._lazy_commands
+        mock_mapdl.get_value('NODE', 0, 'COUNT')
+        assert not mock_mapdl._lazy_commands
+        assert servicer.commands[-1].startswith('FILL')
+    finally:
+        mock_mapdl.lazy_batching = False
+        del servicer.responses['N']
+
+
+def test_profile_stats(mock_mapdl):
+    mock_mapdl.stats.reset()
+    mock_mapdl.stats.enable()
+    try:
+        mock_mapdl.get_value('NODE', 0, 'COUNT')
+        with mock_mapdl.profile() as profiler:
+            mock_mapdl.get_value('NODE', 0, 'COUNT')
+        assert 'Get' in {event['name'] for event in profiler.events}
+        assert mock_mapdl.stats.rpcs['Get'].count == 2
+    finally:
+        mock_mapdl.stats.disable()
+
+    # profiling neither enables nor updates the statistics
+    with mock_mapdl.profile():
+        mock_mapdl.get_value('NODE', 0, 'COUNT')
+    assert not mock_mapdl.stats.enabled
+    assert mock_mapdl.stats.rpcs['Get'].count == 2
+
+
+def test_record_replay(mock_mapdl, tmpdir):
+    filename = str(tmpdir.join('session.rec'))
+    mock_mapdl.mesh._reset_cache()
+    with mock_mapdl.record(filename) as recorder:
+        n_node = mock_mapdl.get_value('NODE', 0, 'COUNT')
+        nodes = mock_mapdl.mesh.nodes
+        values = mock_mapdl.post_processing.nodal_values([('U', 'X')])
+        mock_mapdl.submit('/PREP7').result()
+    assert recorder.count
+    assert recorder.closed
+
+    replay = ReplayMapdl(filename, strict=True)
+    assert replay.get_value('NODE', 0, 'COUNT') == n_node
+    assert np.allclose(replay.mesh.nodes, nodes)
+    assert np.allclose(replay.post_processing.nodal_values([('U', 'X')])['U_X'],
+                       values['U_X'])
+    replay.submit('/PREP7').result()
+    assert replay.remaining == 0
+
+    with pytest.raises(ReplayError):
+        replay.run('/SOLU')
+
+
+def test_replay_strict(mock_mapdl, tmpdir):
+    filename = str(tmpdir.join('session.rec'))
+    with mock_mapdl.record(filename):
+        mock_mapdl.run('/PREP7')
+
+    with pytest.raises(ReplayError):
+        ReplayMapdl(filename, strict=True).run('/SOLU')
+    assert ReplayMapdl(filename).run('/SOLU') == ''
+
+
+def test_record_upload(mock_mapdl, tmpdir):
+    local_file = str(tmpdir.join('upload.inp'))
+    with open(local_file, 'w') as fid:
+        fid.write('/PREP7\n')
+
+    filename = str(tmpdir.join('session.rec'))
+    with mock_mapdl.record(filename):
+        mock_mapdl.upload(local_file, progress_bar=False)
+
+    upload = [record for record in read_recording(filename)[1]
+              if record.rpc == 'UploadFile']
+    assert len(upload) == 1
+    assert upload[0].request == b''
+
+    # the streamed request is consumed without being checked
+    replay = ReplayMapdl(filename, strict=True)
+    assert replay.upload(local_file, progress_bar=False) == 'upload.inp'
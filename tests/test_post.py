@@ -140,6 +140,27 @@ def test_disp_norm_all(mapdl, static_solve):
     assert np.allclose(disp.T, mapdl.post_processing.nodal_displacement('ALL'))
 
 
+def test_nodal_values(mapdl, static_solve):
+    values = mapdl.post_processing.nodal_values([('U', 'X'), ('s', 'eqv'), 'NSEL'])
+    assert values.dtype.names == ('U_X', 'S_EQV', 'NSEL')
+    assert np.allclose(values['U_X'], mapdl.post_processing.nodal_displacement('X'))
+    assert np.allclose(values['S_EQV'], mapdl.post_processing.nodal_eqv_stress())
+
+    with pytest.raises(ValueError):
+        mapdl.post_processing.nodal_values([('U', 'X'), ('U', 'X')])
+
+
+def test_iter_sets(mapdl, static_solve):
+    mapdl.post1()
+    items = [('U', 'X'), ('S', 'EQV')]
+    results = list(mapdl.post_processing.iter_sets(items, prefetch=1))
+    assert [nset for nset, _ in results] == list(range(1, mapdl.post_processing.nsets + 1))
+
+    mapdl.set(1, 1)
+    values = mapdl.post_processing.nodal_values(items)
+    assert np.allclose(results[0][1]['S_EQV'], values['S_EQV'])
+
+
 @pytest.mark.parametrize('comp', ['X', 'Y', 'z', 'norm'])  # lowercase intentional
 def test_disp_plot(mapdl, static_solve, comp):
     cpos = mapdl.post_processing.plot_nodal_displacement(comp, smooth_shading=True)